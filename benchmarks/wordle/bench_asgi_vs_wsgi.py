@@ -0,0 +1,196 @@
+"""
+Load comparison of the JSON game API served over WSGI and over ASGI.
+
+Starts each front end as a real local server in its own process:
+    wsgi: create_app() on Werkzeug's threaded server (one thread per connection)
+    asgi: create_asgi_app() on uvicorn (one event loop)
+then drives it with asyncio clients playing whole games (over keep-alive
+connections where the server allows them). Each server is measured twice:
+with only the active players, and again while `--slow` extra clients hold
+connections open halfway through sending their request headers. Reports
+requests/s, latency percentiles, and the server's threads and resident
+memory.
+
+Run from the repository root (needs uvicorn):
+    python -m benchmarks.wordle.bench_asgi_vs_wsgi [--players 50] [--slow 2000] [--duration 5]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+HOST = "127.0.0.1"
+WORDS = ["crane", "slate", "trace", "crate", "stare", "raise", "arise", "least", "steal", "react"]
+
+
+def serve(kind, port):
+    """Runs one front end in this process until killed."""
+    import logging
+    logging.disable(logging.CRITICAL)
+    if kind == "wsgi":
+        from werkzeug.serving import make_server
+        from src.wordle.app import create_app
+        make_server(HOST, port, create_app(), threaded=True).serve_forever()
+    else:
+        import uvicorn
+        from src.wordle.asgi import create_asgi_app
+        uvicorn.run(create_asgi_app(), host=HOST, port=port, log_level="critical",
+                    timeout_keep_alive=300, backlog=4096)
+
+
+class Connection:
+    """A keep-alive HTTP/1.1 connection that carries a session cookie."""
+
+    def __init__(self, port):
+        self.port = port
+        self.cookie = None
+        self.reader = self.writer = None
+
+    async def open(self):
+        self.reader, self.writer = await asyncio.open_connection(HOST, self.port)
+
+    async def request(self, method, path, body=None):
+        if self.writer is None:
+            await self.open()
+        data = json.dumps(body).encode() if body is not None else b""
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {HOST}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(data)}\r\n")
+        if self.cookie:
+            head += f"Cookie: {self.cookie}\r\n"
+        self.writer.write(head.encode() + b"\r\n" + data)
+        status_and_headers = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        status = int(status_and_headers[0].split()[1])
+        headers = {}
+        for line in status_and_headers[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        payload = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        if "set-cookie" in headers:
+            self.cookie = headers["set-cookie"].split(";")[0]
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status, payload
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+async def play(port, players, duration):
+    """Plays games until `duration` runs out; returns per-request latencies in seconds."""
+    latencies = []
+    deadline = time.perf_counter() + duration
+
+    async def player(seed):
+        rng = random.Random(seed)
+        connection = Connection(port)
+        while time.perf_counter() < deadline:
+            requests = [("POST", "/api/game", {})] + [("POST", "/api/guess", {"guess": rng.choice(WORDS)})] * 6
+            for method, path, body in requests:
+                start = time.perf_counter()
+                status, payload = await connection.request(method, path, body)
+                latencies.append(time.perf_counter() - start)
+                if status != 200 or json.loads(payload).get("game_over"):
+                    break
+        connection.close()
+
+    await asyncio.gather(*(player(seed) for seed in range(players)))
+    return latencies
+
+
+async def open_slow(port, count):
+    """Opens `count` connections that send part of a request's headers and then stall."""
+    connections = []
+    for _ in range(count):
+        connection = Connection(port)
+        await connection.open()
+        connection.writer.write(f"GET /api/game HTTP/1.1\r\nHost: {HOST}\r\n".encode())
+        connections.append(connection)
+    await asyncio.sleep(1) # Let the server accept them all
+    return connections
+
+
+def process_stats(pid):
+    """(threads, resident MB) of a process, from /proc (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            fields = dict(line.split(":", 1) for line in status)
+    except OSError:
+        return None, None
+    return int(fields["Threads"]), int(fields["VmRSS"].split()[0]) / 1024
+
+
+def wait_for_port(port, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with socket.socket() as probe:
+            if probe.connect_ex((HOST, port)) == 0:
+                return
+        time.sleep(0.1)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind((HOST, 0))
+        return probe.getsockname()[1]
+
+
+def report(kind, phase, latencies, duration, pid):
+    latencies = sorted(latencies)
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    threads, rss = process_stats(pid)
+    print(f"{kind:>5} {phase:>12} {len(latencies) / duration:>9.0f} {pick(0.5):>8.2f} {pick(0.95):>8.2f} "
+          f"{pick(0.99):>8.2f} {threads or 0:>8} {rss or 0:>8.1f}")
+
+
+async def bench(kind, args):
+    port = free_port()
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, WORDLE_GAME_DB=os.path.join(tmp, "games.sqlite3"))
+        server = subprocess.Popen([sys.executable, "-m", "benchmarks.wordle.bench_asgi_vs_wsgi",
+                                   "--serve", kind, "--port", str(port)],
+                                  env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            wait_for_port(port)
+            await play(port, 5, 0.5) # Warm up
+            report(kind, "active", await play(port, args.players, args.duration), args.duration, server.pid)
+            slow = await open_slow(port, args.slow)
+            report(kind, f"+{args.slow} slow", await play(port, args.players, args.duration),
+                   args.duration, server.pid)
+            for connection in slow:
+                connection.close()
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--players", type=int, default=50, help="Concurrent active players")
+    parser.add_argument("--slow", type=int, default=2000, help="Stalled connections in the second phase")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per phase")
+    parser.add_argument("--serve", choices=["wsgi", "asgi"], help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    print(f"{'':>5} {'phase':>12} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'threads':>8} {'RSS MB':>8}")
+    for kind in ("wsgi", "asgi"):
+        asyncio.run(bench(kind, args))
+
+
+if __name__ == "__main__":
+    main()
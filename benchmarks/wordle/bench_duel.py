@@ -0,0 +1,201 @@
+"""
+Load test for duel mode: thousands of concurrent rooms on one event loop.
+
+Drives the ASGI app's /ws/duel endpoint in this process, the way an ASGI
+server would (each connection is a task fed through receive/send), so it
+measures the hub, the fan-out and the Evaluator without a network stack.
+Every room fills up, races until someone wins or all are out of guesses,
+and its players disconnect; rooms are started in waves until `--rooms`
+are open at once, and all of them play at the same time.
+
+A share of clients (`--slow`) stop reading after the start of the race, to
+show backpressure: their backlog is replaced by snapshots and they are
+eventually dropped, while their opponents keep getting pushes on time.
+
+Reports rooms and players at peak, guesses/s, push latency (a guess being
+sent to the server handing its feedback to the first opponent's socket) at
+p50/p95/p99, resyncs, and the process's resident memory. Backpressure only
+kicks in for rooms busy enough to fill a client's queue, e.g. --players 8.
+
+Run from the repository root:
+    python -m benchmarks.wordle.bench_duel [--rooms 2000] [--players 2] [--slow 0.05] [--think 1.0]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+
+from benchmarks.wordle.bench_asgi_vs_wsgi import process_stats
+from benchmarks.wordle.bench_load import percentiles
+from src.wordle.app import create_app, load_engine
+from src.wordle.asgi import create_asgi_app
+from src.wordle.duel import MAX_GUESSES
+from src.wordle.game_store import GameStore
+from src.wordle.metrics import REGISTRY
+from src.wordle.stats_store import StatsStore
+
+
+class Stats:
+    def __init__(self):
+        self.guesses = 0
+        self.push_latencies = []
+        self.sent_at = {} # (room, player id, guesses made) -> when the guess was sent
+        self.finished_rooms = 0
+        self.dropped = 0
+        self.open_rooms = 0
+        self.peak_rooms = 0
+        self.peak_players = 0
+
+
+class Client:
+    """One WebSocket connection to the ASGI app, driven in-process."""
+
+    def __init__(self, app, query, stats, slow=False):
+        self.stats = stats
+        self.room = None
+        self.incoming = asyncio.Queue()
+        self.messages = asyncio.Queue()
+        self.slow = slow
+        self.stalled = asyncio.Event() # Never set: a slow client's reads block forever
+        self.reading = True
+        scope = {'type': 'websocket', 'path': '/ws/duel', 'query_string': query.encode(), 'headers': []}
+        self.incoming.put_nowait({'type': 'websocket.connect'})
+        self.task = asyncio.create_task(app(scope, self.incoming.get, self._on_send))
+
+    async def _on_send(self, message):
+        if not self.reading:
+            await self.stalled.wait()
+        if message['type'] == 'websocket.send' and message['text'].startswith('{"type":"progress"'):
+            # Timed as the server hands the push to the socket, not when play() gets to it
+            progress = json.loads(message['text'])
+            key = (self.room, progress['player'], MAX_GUESSES - progress['attempts_left'])
+            sent = self.stats.sent_at.pop(key, None)
+            if sent is not None:
+                self.stats.push_latencies.append(time.perf_counter() - sent)
+        await self.messages.put(message)
+
+    async def receive(self):
+        message = await self.messages.get()
+        if message['type'] == 'websocket.send':
+            return json.loads(message['text'])
+        return message
+
+    def send(self, message):
+        self.incoming.put_nowait({'type': 'websocket.receive', 'text': json.dumps(message)})
+
+
+async def play(client, words, rng, stats, room_ready, think):
+    """Plays one racer; returns once it has won or run out of guesses, or the race is over."""
+    me = room = None
+    started = False
+    while True:
+        message = await client.receive()
+        kind = message.get('type')
+        if kind == 'websocket.close':
+            stats.dropped += message['code'] == 1013 # Fell too far behind
+            return
+        if kind == 'room':
+            me, room = message['you'], message['room']
+            client.room = room
+            if not room_ready.done():
+                room_ready.set_result(room)
+            started = message['started']
+        elif kind == 'start':
+            started = True
+        elif kind == 'finished':
+            return
+        if kind in ('start', 'result', 'rejected', 'room') and started:
+            if client.slow:
+                client.reading = False
+                await client.stalled.wait()
+            if kind == 'result' and (message['won'] or message['attempts_left'] == 0):
+                return # Done; a stalled opponent may keep the race itself open
+            await asyncio.sleep(rng.uniform(0.5, 1.5) * think) # Thinking
+            guess_number = MAX_GUESSES - (message.get('attempts_left', MAX_GUESSES)) + 1
+            stats.sent_at[(room, me, guess_number)] = time.perf_counter()
+            stats.guesses += 1
+            client.send({'type': 'guess', 'guess': rng.choice(words)})
+
+
+async def run_room(app, words, args, rng, stats):
+    room_ready = asyncio.get_running_loop().create_future()
+    clients = []
+    tasks = []
+    for i in range(args.players):
+        query = f"name=bot&size={args.players}" if i == 0 else f"name=bot&room={await room_ready}"
+        client = Client(app, query, stats, slow=rng.random() < args.slow)
+        assert (await client.receive())['type'] == 'websocket.accept'
+        clients.append(client)
+        tasks.append(asyncio.create_task(play(client, words, rng, stats, room_ready, args.think)))
+    stats.open_rooms += 1
+    stats.peak_rooms = max(stats.peak_rooms, stats.open_rooms)
+    stats.peak_players = max(stats.peak_players, sum(len(r.players) for r in app.duels.rooms.values()))
+    fast = [task for task, client in zip(tasks, clients) if not client.slow]
+    await asyncio.gather(*fast)
+    stats.finished_rooms += 1
+    stats.open_rooms -= 1
+    for task, client in zip(tasks, clients):
+        task.cancel()
+        client.incoming.put_nowait({'type': 'websocket.disconnect'})
+        client.task.cancel()
+    await asyncio.gather(*tasks, *(client.task for client in clients), return_exceptions=True)
+
+
+def resyncs():
+    text = REGISTRY.render()
+    line = next(line for line in text.splitlines() if line.startswith("wordle_duel_resyncs_total "))
+    return int(float(line.split()[1]))
+
+
+async def main_async(args):
+    engine = load_engine()
+    store = GameStore(":memory:", flush_interval=0)
+    stats_store = StatsStore(":memory:", flush_interval=0)
+    app = create_asgi_app(create_app({'TESTING': True}, engine=engine, game_store=store, stats_store=stats_store))
+    words = list(engine.words)
+    rng = random.Random(args.seed)
+    stats = Stats()
+    resyncs_before = resyncs()
+
+    start = time.perf_counter()
+    rooms = []
+    for wave in range(0, args.rooms, args.wave):
+        rooms += [asyncio.create_task(run_room(app, words, args, rng, stats))
+                  for _ in range(min(args.wave, args.rooms - wave))]
+        await asyncio.sleep(0) # Let the wave connect before starting the next
+    await asyncio.gather(*rooms)
+    elapsed = time.perf_counter() - start
+
+    _, rss = process_stats("self")
+    latency = percentiles(stats.push_latencies) if stats.push_latencies else None
+    print(f"rooms: {stats.finished_rooms} ({stats.peak_rooms} open at once, "
+          f"{stats.peak_players} players), {args.players} players each")
+    print(f"guesses: {stats.guesses} in {elapsed:.2f} s ({stats.guesses / elapsed:.0f}/s)")
+    if latency:
+        print(f"push latency ms: p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  "
+              f"({latency['count']} pushes)")
+    print(f"slow clients: {stats.dropped} dropped, {resyncs() - resyncs_before} resyncs")
+    if rss is not None:
+        print(f"resident memory: {rss:.0f} MB")
+    store.close()
+    stats_store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rooms", type=int, default=2000, help="Rooms to run (all concurrently)")
+    parser.add_argument("--players", type=int, default=2, help="Players per room")
+    parser.add_argument("--slow", type=float, default=0.05, help="Share of clients that stop reading")
+    parser.add_argument("--think", type=float, default=1.0, help="Mean seconds between a player's guesses")
+    parser.add_argument("--wave", type=int, default=200, help="Rooms connected per event loop turn")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
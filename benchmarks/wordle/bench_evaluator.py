@@ -0,0 +1,43 @@
+"""
+Benchmark for Evaluator.evaluate_batch.
+
+Scores one guess against every word in the dictionary, once with the
+per-pair evaluate_guess loop and once with a single evaluate_batch call.
+
+Run from the repository root:
+    python -m benchmarks.wordle.bench_evaluator
+"""
+
+import timeit
+
+from src.wordle.evaluator import Evaluator
+from src.wordle.word_manager import WordManager
+
+GUESSES = ["crane", "eerie", "sassy"]
+
+
+def main():
+    evaluator = Evaluator()
+    words = list(WordManager().word_list)
+    targets = Evaluator.encode_words(words)
+    encoded_guesses = Evaluator.encode_words(GUESSES)
+
+    def loop():
+        for guess in GUESSES:
+            for target in words:
+                evaluator.evaluate_guess(target, guess)
+
+    def batch():
+        for encoded_guess in encoded_guesses:
+            evaluator.evaluate_batch(targets, encoded_guess)
+
+    loop_s = min(timeit.repeat(loop, number=1, repeat=3)) / len(GUESSES)
+    batch_s = min(timeit.repeat(batch, number=10, repeat=3)) / (10 * len(GUESSES))
+    print(f"{len(words)} targets per guess")
+    print(f"evaluate_guess loop: {loop_s * 1e3:8.2f} ms/guess")
+    print(f"evaluate_batch:      {batch_s * 1e3:8.2f} ms/guess")
+    print(f"speedup:             {loop_s / batch_s:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
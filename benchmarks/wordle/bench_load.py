@@ -0,0 +1,343 @@
+"""
+Load test for the web game (app.py), in-process or over HTTP.
+
+Simulated players replay the flow a browser goes through with game.js:
+load the page (which starts a game), send a few invalid guesses, ask for a
+hint, then guess words still consistent with the feedback until the game
+is won or lost, and reload the page. Players run in parallel threads until
+the duration is up.
+
+    inproc  drives create_app() through Flask's test client in this process
+            (no network; measures the app itself)
+    http    drives real local servers: `--workers` processes of Werkzeug's
+            threaded server sharing one game store, or an already-running
+            server given with --url
+
+Reports throughput, p50/p95/p99 latency overall and per route, games won
+and lost, and resident memory per worker process. --save writes the
+results as JSON; --compare checks them against a saved run and exits with
+status 1 if throughput or any p95 latency regressed beyond --tolerance.
+
+Run from the repository root:
+    python -m benchmarks.wordle.bench_load inproc [--players 8] [--duration 10]
+    python -m benchmarks.wordle.bench_load http [--workers 2] [--players 32]
+    python -m benchmarks.wordle.bench_load http --url http://127.0.0.1:5001
+    python -m benchmarks.wordle.bench_load inproc --save base.json
+    python -m benchmarks.wordle.bench_load inproc --compare base.json
+"""
+
+import argparse
+import datetime
+import http.client
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import urlsplit
+
+from benchmarks.wordle.bench_asgi_vs_wsgi import HOST, free_port, process_stats, wait_for_port
+from src.wordle.candidates import CandidateIndex, CandidateSet
+from src.wordle.word_manager import WordManager
+
+DIFFICULTIES = ["easy", "medium", "medium", "hard"] # Weighted towards the default
+OPENERS = ["slate", "crane", "trace", "raise", "stare"]
+INVALID_GUESSES = ["zzzzz", "abc", "qwxyz", "12345", "toolong"]
+
+
+class InProcessClient:
+    """Requests through Flask's test client (which keeps the session cookie)."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, body=None):
+        response = self.client.open(path, method=method, json=body)
+        return response.status_code, response.get_data()
+
+
+class HttpClient:
+    """Requests over a persistent HTTP connection, keeping the session cookie."""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        self.cookie = None
+
+    def request(self, method, path, body=None):
+        headers = {"Content-Type": "application/json"}
+        if self.cookie:
+            headers["Cookie"] = self.cookie
+        data = json.dumps(body) if body is not None else None
+        try:
+            self.connection.request(method, path, data, headers)
+            response = self.connection.getresponse()
+        except (ConnectionError, http.client.HTTPException):
+            self.connection.close() # The server dropped a kept-alive connection; retry on a new one
+            self.connection.request(method, path, data, headers)
+            response = self.connection.getresponse()
+        payload = response.read()
+        cookie = response.getheader("Set-Cookie")
+        if cookie:
+            self.cookie = cookie.split(";")[0]
+        return response.status, payload
+
+
+class Player:
+    """Plays whole games through one client, recording each request's latency by route."""
+
+    def __init__(self, client, index, seed):
+        self.client = client
+        self.index = index
+        self.rng = random.Random(seed)
+        self.latencies = {} # "METHOD /path" -> [seconds]
+        self.errors = 0
+        self.won = self.lost = 0
+
+    def _call(self, method, path, body=None):
+        start = time.perf_counter()
+        status, payload = self.client.request(method, path, body)
+        self.latencies.setdefault(f"{method} {path.split('?')[0]}", []).append(time.perf_counter() - start)
+        if status >= 400:
+            self.errors += 1
+            return None
+        return payload
+
+    def _json(self, method, path, body=None):
+        payload = self._call(method, path, body)
+        return json.loads(payload) if payload is not None else None
+
+    def play_game(self):
+        rng = self.rng
+        if self._call("GET", f"/?difficulty={rng.choice(DIFFICULTIES)}") is None:
+            return
+        for guess in rng.sample(INVALID_GUESSES, rng.randint(1, 3)):
+            self._json("POST", "/api/guess", {"guess": guess})
+
+        candidates = CandidateSet(self.index)
+        hint = self._json("POST", "/api/hint")
+        if hint and hint["position"] is not None:
+            candidates.bits &= self.index.letter_at(hint["position"], hint["letter"].lower())
+
+        guess = rng.choice(OPENERS)
+        while True:
+            result = self._json("POST", "/api/guess", {"guess": guess})
+            if not result or not result["valid"]:
+                return
+            if result["game_over"]:
+                if result["win"]:
+                    self.won += 1
+                else:
+                    self.lost += 1
+                break
+            candidates.apply(guess, result["feedback"])
+            words = candidates.words()
+            if not words:
+                return
+            guess = rng.choice(words)
+        self._call("GET", "/?from_redirect=1")
+
+    def run(self, deadline):
+        while time.perf_counter() < deadline:
+            self.play_game()
+
+
+def run_players(clients, index, duration, seed=0):
+    """Runs one Player per client in its own thread for `duration` seconds; returns the players."""
+    players = [Player(client, index, seed + i) for i, client in enumerate(clients)]
+    deadline = time.perf_counter() + duration
+    threads = [threading.Thread(target=player.run, args=(deadline,)) for player in players]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return players
+
+
+def percentiles(latencies):
+    """p50/p95/p99/mean in milliseconds (nearest rank)."""
+    latencies = sorted(latencies)
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    return {
+        "count": len(latencies),
+        "p50": round(pick(0.50), 3),
+        "p95": round(pick(0.95), 3),
+        "p99": round(pick(0.99), 3),
+        "mean": round(sum(latencies) / len(latencies) * 1000, 3),
+    }
+
+
+def summarize(args, players, elapsed, memory):
+    routes = {}
+    for player in players:
+        for route, latencies in player.latencies.items():
+            routes.setdefault(route, []).extend(latencies)
+    every = [latency for latencies in routes.values() for latency in latencies]
+    if not every:
+        raise SystemExit("No requests completed.")
+    return {
+        "mode": args.mode,
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "players": args.players,
+        "workers": args.workers if args.mode == "http" and not args.url else 1,
+        "duration": round(elapsed, 3),
+        "requests": len(every),
+        "errors": sum(player.errors for player in players),
+        "games": {"won": sum(p.won for p in players), "lost": sum(p.lost for p in players)},
+        "throughput_rps": round(len(every) / elapsed, 1),
+        "latency_ms": {
+            "all": percentiles(every),
+            "routes": {route: percentiles(latencies) for route, latencies in sorted(routes.items())},
+        },
+        "memory_mb": memory,
+    }
+
+
+def print_results(results):
+    print(f"{results['mode']}: {results['players']} players, {results['workers']} worker(s), "
+          f"{results['duration']:.1f} s")
+    print(f"{results['requests']} requests ({results['errors']} errors), "
+          f"{results['throughput_rps']:.0f} req/s; games won {results['games']['won']}, "
+          f"lost {results['games']['lost']}")
+    print(f"{'route':<18} {'count':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'mean ms':>8}")
+    rows = [("all", results["latency_ms"]["all"])] + list(results["latency_ms"]["routes"].items())
+    for route, stats in rows:
+        print(f"{route:<18} {stats['count']:>7} {stats['p50']:>8.2f} {stats['p95']:>8.2f} "
+              f"{stats['p99']:>8.2f} {stats['mean']:>8.2f}")
+    for worker, rss in results["memory_mb"].items():
+        print(f"{worker}: {rss:.1f} MB resident")
+
+
+def compare(results, baseline, tolerance):
+    """Prints the change from a baseline run; returns the list of regressions found."""
+    regressions = []
+    old, new = baseline["throughput_rps"], results["throughput_rps"]
+    print(f"\nvs baseline from {baseline['timestamp']} (tolerance {tolerance:.0%}):")
+    print(f"{'throughput':<18} {old:>9.0f} -> {new:>9.0f} req/s ({(new - old) / old:+.1%})")
+    if new < old * (1 - tolerance):
+        regressions.append(f"throughput {old:.0f} -> {new:.0f} req/s")
+    baseline_routes = dict(baseline["latency_ms"]["routes"], all=baseline["latency_ms"]["all"])
+    current_routes = dict(results["latency_ms"]["routes"], all=results["latency_ms"]["all"])
+    for route, stats in current_routes.items():
+        before = baseline_routes.get(route)
+        if before is None:
+            continue
+        change = (stats["p95"] - before["p95"]) / before["p95"] if before["p95"] else 0.0
+        print(f"{route + ' p95':<18} {before['p95']:>9.2f} -> {stats['p95']:>9.2f} ms ({change:+.1%})")
+        if change > tolerance:
+            regressions.append(f"{route} p95 {before['p95']:.2f} -> {stats['p95']:.2f} ms")
+    return regressions
+
+
+def quiet_logging():
+    """Keeps the app's logging (and its cost) but sends the records nowhere."""
+    from src.wordle.log_pipeline import configure_logging
+    configure_logging(stream=open(os.devnull, "w"))
+
+
+def serve(port):
+    """Runs one server worker in this process until killed."""
+    from werkzeug.serving import make_server
+    from src.wordle.app import create_app
+    quiet_logging()
+    make_server(HOST, port, create_app(), threaded=True).serve_forever()
+
+
+def run_inproc(args, index):
+    from src.wordle.app import create_app
+    quiet_logging()
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app({"WORDLE_GAME_DB": os.path.join(tmp, "games.sqlite3")})
+        run_players([InProcessClient(app) for _ in range(min(4, args.players))], index, args.warmup)
+        start = time.perf_counter()
+        players = run_players([InProcessClient(app) for _ in range(args.players)], index, args.duration)
+        elapsed = time.perf_counter() - start
+        _, rss = process_stats(os.getpid())
+        app.extensions["wordle"]["game_store"].close()
+        app.extensions["wordle"]["stats"].close() # Before the temporary database goes away
+    return players, elapsed, {"worker-0": rss} if rss else {}
+
+
+def run_http(args, index):
+    if args.url:
+        clients = lambda count: [HttpClient(args.url) for _ in range(count)]
+        run_players(clients(min(4, args.players)), index, args.warmup)
+        start = time.perf_counter()
+        players = run_players(clients(args.players), index, args.duration)
+        return players, time.perf_counter() - start, {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, WORDLE_GAME_DB=os.path.join(tmp, "games.sqlite3"),
+                   WORDLE_SHARED_GAME_STORE="1" if args.workers > 1 else "0")
+        ports = [free_port() for _ in range(args.workers)]
+        servers = [subprocess.Popen([sys.executable, "-m", "benchmarks.wordle.bench_load", "--serve",
+                                     "--port", str(port)], env=env)
+                   for port in ports]
+        try:
+            for port in ports:
+                wait_for_port(port)
+            # Each player sticks to one worker, like a load balancer with keep-alive
+            clients = lambda count: [HttpClient(f"http://{HOST}:{ports[i % len(ports)]}") for i in range(count)]
+            run_players(clients(min(4, args.players)), index, args.warmup)
+            start = time.perf_counter()
+            players = run_players(clients(args.players), index, args.duration)
+            elapsed = time.perf_counter() - start
+            memory = {}
+            for i, server in enumerate(servers):
+                _, rss = process_stats(server.pid)
+                if rss:
+                    memory[f"worker-{i}"] = rss
+        finally:
+            for server in servers:
+                server.terminate()
+                server.wait()
+    return players, elapsed, memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("mode", nargs="?", choices=["inproc", "http"], default="inproc")
+    parser.add_argument("--players", type=int, default=8, help="Concurrent players (threads)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to measure")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Seconds to play before measuring")
+    parser.add_argument("--workers", type=int, default=2, help="Server processes to start (http mode)")
+    parser.add_argument("--url", help="Test an already-running server instead (http mode)")
+    parser.add_argument("--save", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Compare with results saved by an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed throughput drop / p95 rise before --compare fails (default: 0.25)")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.port)
+        return
+
+    manager = WordManager("data/words.txt") # The same dictionary the server loads
+    index = CandidateIndex(manager.word_list)
+    run = run_inproc if args.mode == "inproc" else run_http
+    players, elapsed, memory = run(args, index)
+    results = summarize(args, players, elapsed, memory)
+    print_results(results)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved results to {args.save}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+        print("\nNo regressions.")
+
+
+if __name__ == "__main__":
+    main()
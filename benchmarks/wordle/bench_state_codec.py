@@ -0,0 +1,63 @@
+"""
+Benchmark for the web game-state codec.
+
+Compares the packed binary form from state_codec with the JSON the store
+used before, for games with 0-6 guesses: bytes per state and encode/decode
+time.
+
+Run from the repository root:
+    python -m benchmarks.wordle.bench_state_codec
+"""
+
+import json
+import random
+import string
+import timeit
+
+from src.wordle.state_codec import decode_state, encode_state
+
+ROUNDS = 20_000
+
+
+def make_state(guess_count, seed=0):
+    """A mid-game state with `guess_count` random guesses, shaped like app.index() stores it."""
+    rng = random.Random(seed)
+    word = lambda: "".join(rng.choices(string.ascii_uppercase, k=5))
+    return {
+        'target_word': word(),
+        'guesses': [word() for _ in range(guess_count)],
+        'feedback': [rng.randrange(243) for _ in range(guess_count)],
+        'attempts_left': 6 - guess_count,
+        'message': 'next_guess',
+        'game_over': False,
+        'win': False,
+        'difficulty': 'medium',
+        'allowed_hints': 1,
+        'hints_used': 0,
+    }
+
+
+def to_json(state):
+    return json.dumps(state, separators=(",", ":"))
+
+
+def bench(state, encode, decode):
+    """Returns (size in bytes, encode µs, decode µs)."""
+    encoded = encode(state)
+    encode_us = timeit.timeit(lambda: encode(state), number=ROUNDS) / ROUNDS * 1e6
+    decode_us = timeit.timeit(lambda: decode(encoded), number=ROUNDS) / ROUNDS * 1e6
+    return len(encoded), encode_us, decode_us
+
+
+def main():
+    print(f"{'guesses':>7} {'json B':>7} {'codec B':>8} {'json enc+dec µs':>16} {'codec enc+dec µs':>17}")
+    for guess_count in range(7):
+        state = make_state(guess_count)
+        json_size, json_enc, json_dec = bench(state, to_json, json.loads)
+        codec_size, codec_enc, codec_dec = bench(state, encode_state, decode_state)
+        print(f"{guess_count:>7} {json_size:>7} {codec_size:>8} "
+              f"{json_enc + json_dec:>16.2f} {codec_enc + codec_dec:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark for WordManager.is_valid_word.
+
+Shows that per-guess validation cost stays flat as the dictionary grows,
+compared with the old linear list-membership scan.
+
+Run from the repository root:
+    python -m benchmarks.wordle.bench_word_manager
+"""
+
+import random
+import string
+import timeit
+
+from src.wordle.word_manager import WordManager
+
+SIZES = [5_000, 50_000, 250_000, 1_000_000]
+LOOKUPS = 2_000
+
+
+def make_words(count, seed=0):
+    """Generates `count` distinct random 5-letter words."""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choices(string.ascii_lowercase, k=5)))
+    return sorted(words)
+
+
+def make_manager(words):
+    """Builds a WordManager around an in-memory word list (no file I/O)."""
+    manager = WordManager.__new__(WordManager)
+    manager.word_list = words
+    return manager
+
+
+def bench_size(count):
+    """Returns (indexed_ns, list_scan_ns) per lookup for a dictionary of `count` words."""
+    words = make_words(count)
+    manager = make_manager(words)
+    rng = random.Random(1)
+    # Half hits, half (mostly) misses, uppercase like app.handle_guess sends
+    probes = [w.upper() for w in rng.sample(words, LOOKUPS // 2)]
+    probes += ["".join(rng.choices(string.ascii_uppercase, k=5)) for _ in range(LOOKUPS // 2)]
+
+    indexed = timeit.timeit(lambda: [manager.is_valid_word(p) for p in probes], number=5)
+    indexed_ns = indexed / (5 * len(probes)) * 1e9
+
+    # The old implementation: `word.lower() in list`. Only a small sample,
+    # since a full run against 1M words takes minutes.
+    sample = probes[:50]
+    scan = timeit.timeit(lambda: [p.lower() in words for p in sample], number=1)
+    scan_ns = scan / len(sample) * 1e9
+    return indexed_ns, scan_ns
+
+
+def main():
+    print(f"{'words':>10} {'indexed ns/lookup':>18} {'list scan ns/lookup':>20}")
+    for count in SIZES:
+        indexed_ns, scan_ns = bench_size(count)
+        print(f"{count:>10} {indexed_ns:>18.0f} {scan_ns:>20.0f}")
+
+
+if __name__ == "__main__":
+    main()
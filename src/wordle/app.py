@@ -1,55 +1,247 @@
-from flask import Flask, render_template, session, redirect, url_for, flash, request
+from flask import Blueprint, Flask, Response, current_app, make_response, g, render_template, session, redirect, url_for, flash, request, jsonify
+from flask.sessions import SecureCookieSessionInterface
+import functools
+import hashlib
 import os
+import time
 import logging # Added for logging errors
 
 # Import game logic components using relative imports
 from .word_manager import WordManager
-from .evaluator import Evaluator # Added Evaluator
-# from .game_logic import GameState # Keep commented for now
-
-# Configure logging
-logging.basicConfig(level=logging.INFO)
-
-app = Flask(__name__)
-# Secret key is needed for session management
-# Use a fixed key for development to prevent session loss on reload
-# IMPORTANT: Use a secure, environment-variable-based key in production!
-app.secret_key = 'dev-secret-only-key' # Replace os.urandom(24)
-
-# --- Define difficulty levels ---
-DIFFICULTY_SETTINGS = {
-    'easy': {'guesses': 8, 'hints': 2},
-    'medium': {'guesses': 6, 'hints': 1},
-    'hard': {'guesses': 6, 'hints': 0},
-    'pro': {'guesses': 5, 'hints': 0}
-}
-# Default difficulty
-DEFAULT_DIFFICULTY = 'medium'
+from .feedback import as_pattern
+from . import game_api
+from . import metrics
+from .assets import DIST_DIR, Assets, compress_response
+from .fragments import FragmentCache
+from .log_pipeline import configure_logging, parse_sample_rates
+from .profiling import install_profiler
+from .game_store import GameStore
+from .stats_store import StatsStore
+from .game_engine import GameEngine, DIFFICULTY_SETTINGS, DEFAULT_DIFFICULTY
+from .word_filter import DEFAULT_FALSE_POSITIVE_RATE, PublishedWordFilter
+from .state_codec import MESSAGES, encode_state, decode_state, default_message, describe_message
+
+DEFAULT_GAME_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'games.sqlite3')
+DEFAULT_PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'profiles')
+
+bp = Blueprint('wordle', __name__)
+
+def _templates_digest():
+    """Digest of every template, so page ETags change whenever the templates do."""
+    digest = hashlib.blake2b(digest_size=8)
+    template_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+    for root, dirs, files in sorted(os.walk(template_dir)):
+        for name in sorted(files):
+            with open(os.path.join(root, name), 'rb') as f:
+                digest.update(f.read())
+    return digest.digest()
+
+PAGE_VERSION = _templates_digest()
+
+# --- Metrics (served on /metrics) ---
+REQUEST_SECONDS = metrics.REGISTRY.histogram(
+    'wordle_http_request_duration_seconds', "Request latency by route.", ['route', 'method', 'status'])
+STATE_BYTES = metrics.REGISTRY.histogram(
+    'wordle_game_state_bytes', "Size of each stored game state.", buckets=metrics.SIZE_BUCKETS).labels()
+SESSION_COOKIE_BYTES = metrics.REGISTRY.histogram(
+    'wordle_session_cookie_bytes', "Size of each session cookie sent.", buckets=metrics.SIZE_BUCKETS).labels()
+ACTIVE_GAME_WINDOW = 30 * 60 # Games touched in the last 30 minutes count as active
 # ------------------------------------
 
-# --- Word Manager Initialization ---
-word_manager = None
-# The path should be relative to the word_manager.py file location
-word_list_path = "data/words.txt"
-try:
-    # Pass the relative path expected by WordManager
-    word_manager = WordManager(word_list_path)
-    # Or rely on the default: word_manager = WordManager()
-    logging.info(f"WordManager loaded successfully with {len(word_manager.get_full_word_list())} words.")
-except FileNotFoundError:
-    # The WordManager's internal error handling will print details
-    logging.error(f"Error initializing WordManager. Check previous logs for file path issues.")
-except Exception as e:
-    logging.error(f"Error loading WordManager: {e}")
-# ------------------------------------
-
-# --- Evaluator Initialization ---
-evaluator = Evaluator() # Instantiate the evaluator
-# ------------------------------------
-
-@app.route('/')
+def encode_game_state(game_state):
+    """encode_state(), recording the stored size."""
+    record = encode_state(game_state)
+    STATE_BYTES.observe(len(record))
+    return record
+
+def register_store_gauges(game_store):
+    """Reports the store's game counts on /metrics (the most recently created app's store wins)."""
+    metrics.REGISTRY.gauge('wordle_games_active', "Stored games updated in the last 30 minutes.",
+                           lambda: game_store.count(updated_within=ACTIVE_GAME_WINDOW))
+    metrics.REGISTRY.gauge('wordle_games_cached', "Games held in this process's memory.",
+                           game_store.cached_count)
+    metrics.REGISTRY.gauge('wordle_games_pending_writes', "Changed games waiting to be written.",
+                           game_store.pending_count)
+
+
+def load_engine(word_list_path="data/words.txt"):
+    """Loads the shared dictionary into a GameEngine, or returns None if it cannot be loaded."""
+    try:
+        # The path should be relative to the word_manager.py file location
+        engine = GameEngine(WordManager(word_list_path))
+        logging.info(f"WordManager loaded successfully with {engine.word_count} words.")
+        return engine
+    except Exception as e:
+        # The WordManager's internal error handling will print details
+        logging.error(f"Error loading WordManager: {e}")
+        return None
+
+
+def create_app(config=None, engine=None, game_store=None, stats_store=None):
+    """Builds the web app around one shared, read-only GameEngine.
+
+    Everything expensive (dictionary, candidate bitsets, store connection) is
+    created here, once per app, so a server can build the app before forking
+    its workers and then run many threads per worker: requests only read the
+    engine and keep their game state in the store.
+
+    Args:
+        config (dict): Flask config overrides. WORDLE_GAME_DB (default: env
+            WORDLE_GAME_DB or data/games.sqlite3) and WORDLE_SHARED_GAME_STORE
+            (env of the same name; set it when several processes serve the
+            same players) configure the default store. WORDLE_LOG_SAMPLE_RATES
+            (env of the same name, e.g. "guess=0.1") keeps only that share of
+            each event's log records. WORDLE_PROFILE_TOKEN and
+            WORDLE_PROFILE_SAMPLE_RATE (envs of the same names) turn on
+            per-request profiling into WORDLE_PROFILE_DIR; see profiling.py.
+            WORDLE_ASSET_DIR (env of the same name) is where
+            `python -m src.wordle.assets` put the built static files.
+            WORDLE_WORD_FILTER_FP_RATE sets the false positive rate of the
+            dictionary filter sent to browsers (see word_filter.py).
+            WORDLE_BATCH_MAX_MOVES (env of the same name) caps the games or
+            moves in one bot API request. WORDLE_STATS_DB (env of the same
+            name) is where finished games and player statistics go; by
+            default the game store's database.
+        engine (GameEngine): Use this engine instead of loading data/words.txt.
+        game_store (GameStore): Use this store instead of creating one.
+        stats_store (StatsStore): Use this statistics store instead of creating one.
+    """
+    app = Flask(__name__)
+    # Secret key is needed for session management
+    # Use a fixed key for development to prevent session loss on reload
+    # IMPORTANT: Use a secure, environment-variable-based key in production!
+    app.secret_key = os.environ.get('WORDLE_SECRET_KEY', 'dev-secret-only-key')
+    app.config['WORDLE_GAME_DB'] = os.environ.get('WORDLE_GAME_DB', DEFAULT_GAME_DB)
+    app.config['WORDLE_SHARED_GAME_STORE'] = os.environ.get('WORDLE_SHARED_GAME_STORE', '') not in ('', '0')
+    app.config['WORDLE_LOG_SAMPLE_RATES'] = parse_sample_rates(os.environ.get('WORDLE_LOG_SAMPLE_RATES'))
+    app.config['WORDLE_PROFILE_TOKEN'] = os.environ.get('WORDLE_PROFILE_TOKEN')
+    app.config['WORDLE_PROFILE_SAMPLE_RATE'] = float(os.environ.get('WORDLE_PROFILE_SAMPLE_RATE', 0))
+    app.config['WORDLE_PROFILE_DIR'] = os.environ.get('WORDLE_PROFILE_DIR', DEFAULT_PROFILE_DIR)
+    app.config['WORDLE_ASSET_DIR'] = os.environ.get('WORDLE_ASSET_DIR', DIST_DIR)
+    app.config['WORDLE_WORD_FILTER_FP_RATE'] = float(os.environ.get('WORDLE_WORD_FILTER_FP_RATE',
+                                                                    DEFAULT_FALSE_POSITIVE_RATE))
+    app.config['WORDLE_BATCH_MAX_MOVES'] = int(os.environ.get('WORDLE_BATCH_MAX_MOVES',
+                                                             game_api.MAX_BATCH_MOVES))
+    if 'WORDLE_STATS_DB' in os.environ:
+        app.config['WORDLE_STATS_DB'] = os.environ['WORDLE_STATS_DB']
+    app.config.update(config or {})
+    # JSON log records, written by a background thread
+    configure_logging(sample_rates=app.config['WORDLE_LOG_SAMPLE_RATES'])
+
+    if game_store is None:
+        # Game states live server-side; the session cookie only carries the game id.
+        # States are stored in the compact binary form from state_codec.
+        game_store = GameStore(app.config['WORDLE_GAME_DB'], encode=encode_game_state, decode=decode_state,
+                               shared=app.config['WORDLE_SHARED_GAME_STORE'])
+    register_store_gauges(game_store)
+    if stats_store is None:
+        stats_store = StatsStore(app.config.get('WORDLE_STATS_DB') or game_store.db_path,
+                                 shared=app.config['WORDLE_SHARED_GAME_STORE'])
+    metrics.REGISTRY.gauge('wordle_stats_pending_writes', "Finished games waiting to be written.",
+                           stats_store.pending_count)
+    if engine is None:
+        engine = load_engine()
+    app.extensions['wordle'] = {
+        'engine': engine,
+        'game_store': game_store,
+        # Finished games, player statistics and the leaderboard
+        'stats': stats_store,
+        # Dictionary filter for rejecting most non-words in the browser
+        'word_filter': build_word_filter(engine, app.config['WORDLE_WORD_FILTER_FP_RATE']),
+        # Rendered board rows and static page parts, shared by all requests
+        'fragments': FragmentCache(app.jinja_env).install(app),
+        # Fingerprinted static files, if they have been built
+        'assets': Assets(app.config['WORDLE_ASSET_DIR']).install(app),
+    }
+    app.register_blueprint(bp)
+    app.session_interface = MeasuredSessionInterface()
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
+    app.after_request(compress_response) # Runs before _record_request, so its time is counted
+    install_profiler(app) # Only if profiling is configured
+    return app
+
+
+@functools.lru_cache(maxsize=4) # Built once per engine, however many apps share it
+def build_word_filter(engine, false_positive_rate):
+    """Builds the browser's dictionary filter, logging its build time and size; None without an engine."""
+    if engine is None:
+        return None
+    published = PublishedWordFilter(engine.words, false_positive_rate)
+    logging.info("Built word filter %s: %d bytes in %.1f ms", published.version, published.size,
+                 published.build_seconds * 1000,
+                 extra={'event': 'word_filter_built', 'version': published.version, 'bytes': published.size,
+                        'build_ms': round(published.build_seconds * 1000, 1),
+                        'false_positive_rate': false_positive_rate})
+    metrics.REGISTRY.gauge('wordle_word_filter_bytes', "Size of the dictionary filter sent to browsers.",
+                           lambda: published.size)
+    metrics.REGISTRY.gauge('wordle_word_filter_build_seconds', "Time taken to build the dictionary filter.",
+                           lambda: published.build_seconds)
+    return published
+
+def get_word_filter():
+    return current_app.extensions['wordle']['word_filter']
+
+def _start_timer():
+    g.request_start = time.perf_counter()
+
+def _record_request(response):
+    """Records the request's latency."""
+    start = g.get('request_start')
+    if start is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        REQUEST_SECONDS.labels(route, request.method, str(response.status_code)).observe(
+            time.perf_counter() - start)
+    return response
+
+class MeasuredSessionInterface(SecureCookieSessionInterface):
+    """The default signed-cookie sessions, recording the size of each cookie set.
+
+    Flask saves the session after the after_request hooks have run, so the
+    cookie can only be measured here.
+    """
+
+    def save_session(self, app, session, response):
+        super().save_session(app, session, response)
+        for header in response.headers.getlist('Set-Cookie'):
+            if header.startswith(self.get_cookie_name(app) + '='):
+                SESSION_COOKIE_BYTES.observe(len(header))
+
+
+def get_engine():
+    """The current app's GameEngine (None if the word list failed to load)."""
+    return current_app.extensions['wordle']['engine']
+
+def get_game_store():
+    return current_app.extensions['wordle']['game_store']
+
+def get_stats_store():
+    return current_app.extensions['wordle']['stats']
+
+def load_game_state():
+    """Returns the current player's game state from the store, or None."""
+    return game_api.load_game_state(get_game_store(), session)
+
+def save_game_state(game_state):
+    """Stores the current player's game state, giving them a game id if needed."""
+    game_api.save_game_state(get_game_store(), session, game_state)
+
+def clear_game_state():
+    """Ends the current player's game."""
+    game_api.clear_game_state(get_game_store(), session)
+
+@bp.app_template_filter('feedback_symbols')
+def feedback_symbols(feedback):
+    """Turns a stored feedback pattern id into the symbol list the board renders."""
+    return as_pattern(feedback).to_symbols()
+
+def new_game_state(difficulty):
+    """Starts a game, drawing its target from this player's no-repeat schedule kept in the session."""
+    return game_api.new_game_state(get_engine(), session, difficulty)
+
+@bp.route('/')
 def index():
-    if word_manager is None:
+    if get_engine() is None:
         # If WordManager failed to load, show an error message
         flash("Error: Could not load the word list. Please check server logs.", "error")
         return render_template('index.html', game_state=None, error=True)
@@ -61,275 +253,302 @@ def index():
     if is_refresh:
         # Always create a new game on refresh
         # Get previous difficulty to maintain it across refreshes
-        previous_difficulty = session.get('game_state', {}).get('difficulty', DEFAULT_DIFFICULTY)
+        previous_difficulty = (load_game_state() or {}).get('difficulty', DEFAULT_DIFFICULTY)
         difficulty = request.args.get('difficulty', previous_difficulty)
         
         # Start completely fresh game
-        if 'game_state' in session:
-            session.pop('game_state', None)
+        clear_game_state()
         
-        # Select new random word
-        word_manager.select_target_word()
-        target_word = word_manager.get_target_word().upper()
-        logging.info(f"Page refreshed - starting new game with target: {target_word}")
-            
-        # Set up fresh game state with the same difficulty
-        if difficulty not in DIFFICULTY_SETTINGS:
-            difficulty = DEFAULT_DIFFICULTY
-                
-        difficulty_config = DIFFICULTY_SETTINGS[difficulty]
-        attempts = difficulty_config['guesses']
-        allowed_hints = difficulty_config['hints']
-
-        session['game_state'] = {
-            'target_word': target_word,
-            'guesses': [],
-            'feedback': [],
-            'attempts_left': attempts,
-            'message': 'Enter your first guess!',
-            'game_over': False,
-            'win': False,
-            'difficulty': difficulty,
-            'allowed_hints': allowed_hints,
-            'hints_used': 0
-        }
-    elif 'game_state' not in session:
-        # If coming from redirect but no game state exists
-        logging.info("No game state found after redirect, creating new game")
-        try:
-            # Rest of the existing "new game" logic
-            word_manager.select_target_word()
-            target_word = word_manager.get_target_word().upper()
-            
-            difficulty = request.args.get('difficulty', DEFAULT_DIFFICULTY)
-            if difficulty not in DIFFICULTY_SETTINGS:
-                difficulty = DEFAULT_DIFFICULTY
-                
-            difficulty_config = DIFFICULTY_SETTINGS[difficulty]
-            attempts = difficulty_config['guesses']
-            allowed_hints = difficulty_config['hints']
-
-            session['game_state'] = {
-                'target_word': target_word,
-                'guesses': [],
-                'feedback': [],
-                'attempts_left': attempts,
-                'message': 'Enter your first guess!',
-                'game_over': False,
-                'win': False,
-                'difficulty': difficulty,
-                'allowed_hints': allowed_hints,
-                'hints_used': 0
-            }
-        except Exception as e:
-            logging.error(f"Error starting new game: {e}")
-            flash("Error starting a new game. Please try refreshing.", "error")
-            return render_template('index.html', game_state=None, error=True)
+        # Set up fresh game state with the same difficulty and the player's next target word
+        game_state = new_game_state(difficulty)
+        logging.info(f"Page refreshed - starting new game with target: {game_state['target_word']}")
+        save_game_state(game_state)
     else:
-        # Coming from redirect with existing game state - maintain it
-        # Ensure existing game states have all required fields for difficulty and hints
-        game_state = session['game_state']
-        if 'difficulty' not in game_state:
-            game_state['difficulty'] = DEFAULT_DIFFICULTY
-            logging.info(f"Adding missing 'difficulty' to existing game state: {DEFAULT_DIFFICULTY}")
-            
-        if 'allowed_hints' not in game_state:
-            # Get hints based on difficulty or default to medium difficulty settings
-            difficulty = game_state.get('difficulty', DEFAULT_DIFFICULTY)
-            allowed_hints = DIFFICULTY_SETTINGS.get(difficulty, DIFFICULTY_SETTINGS[DEFAULT_DIFFICULTY])['hints']
-            game_state['allowed_hints'] = allowed_hints
-            logging.info(f"Adding missing 'allowed_hints' to existing game state: {allowed_hints}")
-            
-        if 'hints_used' not in game_state:
-            game_state['hints_used'] = 0
-            logging.info("Adding missing 'hints_used' to existing game state: 0")
-            
-        # Always ensure attempts_left matches the difficulty setting for consistency
+        game_state = load_game_state()
+        if game_state is None:
+            # If coming from redirect but no game state exists
+            logging.info("No game state found after redirect, creating new game")
+            try:
+                game_state = new_game_state(request.args.get('difficulty', DEFAULT_DIFFICULTY))
+                save_game_state(game_state)
+            except Exception as e:
+                logging.error(f"Error starting new game: {e}")
+                flash("Error starting a new game. Please try refreshing.", "error")
+                return render_template('index.html', game_state=None, error=True)
+        elif upgrade_game_state(game_state):
+            # Coming from redirect with an older game state - store it in the current form
+            save_game_state(game_state)
+
+    # The page is a function of the game state alone (unless there are flashed
+    # messages to show), so a browser that already has it gets a 304
+    etag = page_etag(game_state) if '_flashes' not in session else None
+    if etag is not None and request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        # logging.info(f"Rendering index with state: {game_state}") # Debug print - can be noisy
+        word_filter = get_word_filter()
+        response = make_response(render_template(
+            'index.html', game_state=game_state, error=False, difficulties=DIFFICULTY_SETTINGS,
+            candidates_remaining=get_engine().count_candidates(game_state),
+            message=describe_message(game_state),
+            word_filter_url=url_for('.word_filter', v=word_filter.version) if word_filter else None,
+            not_a_word_message=MESSAGES['not_a_word']))
+    if etag is not None:
+        response.set_etag(etag, weak=True) # Weak: the body may be re-encoded (compressed) on the way out
+    response.cache_control.no_cache = True # Always revalidate
+    response.cache_control.private = True # Per session, and shows the target once the game is over
+    return response
+
+def upgrade_game_state(game_state):
+    """Brings a game state saved by an older version up to date, in place.
+
+    Returns:
+        bool: Whether anything was changed (and so needs saving).
+    """
+    changed = False
+    # Ensure existing game states have all required fields for difficulty and hints
+    if 'difficulty' not in game_state:
+        game_state['difficulty'] = DEFAULT_DIFFICULTY
+        logging.info(f"Adding missing 'difficulty' to existing game state: {DEFAULT_DIFFICULTY}")
+        changed = True
+
+    if 'allowed_hints' not in game_state:
+        # Get hints based on difficulty or default to medium difficulty settings
         difficulty = game_state.get('difficulty', DEFAULT_DIFFICULTY)
-        if difficulty in DIFFICULTY_SETTINGS:
-            expected_attempts = DIFFICULTY_SETTINGS[difficulty]['guesses']
-            current_attempts = game_state.get('attempts_left', 0)
-            guesses_made = len(game_state.get('guesses', []))
-            
-            # Calculate correct attempts_left based on difficulty and guesses made
-            correct_attempts_left = expected_attempts - guesses_made
-            
-            # Adjust only if there's a mismatch
-            if current_attempts != correct_attempts_left:
-                game_state['attempts_left'] = correct_attempts_left
-                logging.info(f"Fixed attempts_left to {correct_attempts_left} based on difficulty {difficulty} and {guesses_made} guesses made")
-                
-        session['game_state'] = game_state
-        session.modified = True
-
-    game_state = session.get('game_state', {})
-    # logging.info(f"Rendering index with state: {game_state}") # Debug print - can be noisy
-    return render_template('index.html', game_state=game_state, error=False, difficulties=DIFFICULTY_SETTINGS)
-
-@app.route('/guess', methods=['POST'])
+        allowed_hints = DIFFICULTY_SETTINGS.get(difficulty, DIFFICULTY_SETTINGS[DEFAULT_DIFFICULTY])['hints']
+        game_state['allowed_hints'] = allowed_hints
+        logging.info(f"Adding missing 'allowed_hints' to existing game state: {allowed_hints}")
+        changed = True
+
+    if 'hints_used' not in game_state:
+        game_state['hints_used'] = 0
+        logging.info("Adding missing 'hints_used' to existing game state: 0")
+        changed = True
+
+    # Older sessions stored each feedback as a list of symbols
+    if any(not isinstance(f, int) for f in game_state.get('feedback', [])):
+        game_state['feedback'] = [int(as_pattern(f)) for f in game_state['feedback']]
+        logging.info("Converted legacy feedback symbol lists to pattern ids")
+        changed = True
+
+    # Older sessions stored the message text itself; keep a key instead
+    if game_state.get('message') not in MESSAGES:
+        game_state['message'] = default_message(game_state)
+        game_state.pop('message_arg', None)
+        changed = True
+
+    # Always ensure attempts_left matches the difficulty setting for consistency
+    difficulty = game_state.get('difficulty', DEFAULT_DIFFICULTY)
+    if difficulty in DIFFICULTY_SETTINGS:
+        expected_attempts = DIFFICULTY_SETTINGS[difficulty]['guesses']
+        current_attempts = game_state.get('attempts_left', 0)
+        guesses_made = len(game_state.get('guesses', []))
+
+        # Calculate correct attempts_left based on difficulty and guesses made
+        correct_attempts_left = expected_attempts - guesses_made
+
+        # Adjust only if there's a mismatch
+        if current_attempts != correct_attempts_left:
+            game_state['attempts_left'] = correct_attempts_left
+            logging.info(f"Fixed attempts_left to {correct_attempts_left} based on difficulty {difficulty} and {guesses_made} guesses made")
+            changed = True
+    return changed
+
+def page_etag(game_state):
+    """ETag for the index page showing `game_state`: a digest of its stored form (and of the templates and assets)."""
+    try:
+        record = encode_state(game_state)
+    except ValueError:
+        return None
+    if isinstance(record, str):
+        record = record.encode()
+    assets_version = current_app.extensions['wordle']['assets'].version
+    return hashlib.blake2b(PAGE_VERSION + assets_version + record, digest_size=12).hexdigest()
+
+@bp.route('/guess', methods=['POST'])
 def handle_guess():
-    if word_manager is None:
+    if get_engine() is None:
         flash("Cannot process guess: Word list not loaded.", "error")
-        return redirect(url_for('index', from_redirect=1))
+        return redirect(url_for('.index', from_redirect=1))
 
-    if 'game_state' not in session:
+    game_state = load_game_state()
+    if game_state is None:
         flash("No active game found. Starting a new one.", "warning")
-        return redirect(url_for('index', from_redirect=1))
-
-    game_state = session['game_state'] # Get mutable copy
+        return redirect(url_for('.index', from_redirect=1))
 
     if game_state.get('game_over', False):
         flash("The game is over. Start a new game?", "info") # Add a /new_game route later
-        return redirect(url_for('index', from_redirect=1))
+        return redirect(url_for('.index', from_redirect=1))
 
     guess = request.form.get('guess', '').upper() # Normalize to uppercase
-
-    # --- Input Validation ---
-    valid = True
-    if len(guess) != 5:
-        game_state['message'] = "Guess must be exactly 5 letters long."
-        valid = False
-    elif not guess.isalpha():
-        game_state['message'] = "Guess must contain only letters."
-        valid = False
-    # Validate directly against WordManager instead of session
-    elif not word_manager.is_valid_word(guess):
-        logging.error(f"Word validation failed for '{guess}'")
-        game_state['message'] = f'"{guess}" is not a valid word in the dictionary.'
-        valid = False
-
-    if not valid:
-        session['game_state'] = game_state # Save updated message
-        session.modified = True # Mark session as modified
-        logging.error(f"Validation failed - session state saved")
-        return redirect(url_for('index', from_redirect=1))
-    # ------------------------
-
-    # --- Process Valid Guess --- (Ensure evaluator handles uppercase)
-    target = game_state['target_word'] # Already uppercase
-    feedback_symbols = evaluator.evaluate_guess(target, guess) # Fixed parameter order: target first, then guess
-
-    game_state['guesses'].append(guess)
-    game_state['feedback'].append(feedback_symbols)
-    game_state['attempts_left'] -= 1
-
-    # --- Check Win/Loss Conditions ---
-    if guess == target:
-        game_state['win'] = True
-        game_state['game_over'] = True
-        game_state['message'] = f"Congratulations! You guessed the word '{target}' in {len(game_state['guesses'])} tries!"
-    elif game_state['attempts_left'] <= 0:
-        game_state['game_over'] = True
-        game_state['message'] = f"Game Over! You ran out of guesses. The word was '{target}'."
+    feedback = get_engine().apply_guess(game_state, guess)
+    save_game_state(game_state) # Save the updated state (or the validation message)
+    if feedback is None:
+        logging.info("Rejected guess %s: %s", guess, game_state['message'],
+                     extra={'event': 'guess_rejected', 'guess': guess, 'reason': game_state['message']})
     else:
-        game_state['message'] = "Enter your next guess."
-    # -------------------------
-
-    session['game_state'] = game_state # Save the updated state
-    session.modified = True # Mark session as modified
-    logging.info(f"Guess processed: {guess}, Feedback: {feedback_symbols}, State: {game_state}")
+        game_api.record_finished_game(get_stats_store(), session, game_state)
+        logging.info("Guess %s: %s", guess, feedback,
+                     extra={'event': 'guess', 'guess': guess, 'feedback': str(feedback),
+                            'attempts_left': game_state['attempts_left'], 'game_over': game_state['game_over']})
 
-    return redirect(url_for('index', from_redirect=1))
+    return redirect(url_for('.index', from_redirect=1))
 
-@app.route('/new_game')
+@bp.route('/new_game')
 def new_game():
     # Get the difficulty parameter if provided
     difficulty = request.args.get('difficulty', DEFAULT_DIFFICULTY)
     if difficulty not in DIFFICULTY_SETTINGS:
         difficulty = DEFAULT_DIFFICULTY
         
-    # Clear the old game state from the session
-    if 'game_state' in session:
-        session.pop('game_state', None)
-        # Force WordManager to select a new random word
-        word_manager.select_target_word()
+    # Clear the old game state; index() draws the next target
+    if load_game_state() is not None:
+        clear_game_state()
         logging.info(f"Starting new game via /new_game route with difficulty: {difficulty}")
     else:
         logging.info(f"/new_game called but no existing game state found. Using difficulty: {difficulty}")
 
     # Redirect back to the index page with difficulty parameter
-    return redirect(url_for('index', difficulty=difficulty, from_redirect=1))
+    return redirect(url_for('.index', difficulty=difficulty, from_redirect=1))
 
-@app.route('/hint')
+@bp.route('/hint')
 def get_hint():
     """Provides a hint for the current game if available"""
-    if word_manager is None:
+    if get_engine() is None:
         flash("Cannot provide hint: Word list not loaded.", "error")
-        return redirect(url_for('index', from_redirect=1))
+        return redirect(url_for('.index', from_redirect=1))
 
-    if 'game_state' not in session:
+    game_state = load_game_state()
+    if game_state is None:
         flash("No active game found. Starting a new one.", "warning")
-        return redirect(url_for('index', from_redirect=1))
-
-    game_state = session['game_state']
+        return redirect(url_for('.index', from_redirect=1))
 
     if game_state.get('game_over', False):
         flash("The game is over. Start a new game to use hints.", "info")
-        return redirect(url_for('index', from_redirect=1))
-
-    # Check if hints are allowed for this difficulty
-    allowed_hints = game_state.get('allowed_hints', 0)
-    if allowed_hints <= 0:
-        game_state['message'] = "Hints are disabled for this difficulty level."
-        session['game_state'] = game_state
-        session.modified = True
-        return redirect(url_for('index', from_redirect=1))
-
-    # Check if player has used all available hints
-    hints_used = game_state.get('hints_used', 0)
-    if hints_used >= allowed_hints:
-        game_state['message'] = "You have already used all your hints for this game."
-        session['game_state'] = game_state
-        session.modified = True
-        return redirect(url_for('index', from_redirect=1))
-
-    # Generate a hint - find a letter not yet revealed
-    target_word = game_state['target_word'] 
-    guesses = game_state.get('guesses', [])
-    feedback = game_state.get('feedback', [])
-    
-    # Find positions that haven't been correctly guessed yet
-    unrevealed_positions = []
-    for i in range(5):  # Assuming 5-letter words
-        position_revealed = False
-        # Check if this position has been correctly guessed in any previous guess
-        for guess_idx, guess_feedback in enumerate(feedback):
-            if i < len(guess_feedback) and guess_feedback[i] == evaluator.CORRECT_POSITION:
-                position_revealed = True
-                break
-        if not position_revealed:
-            unrevealed_positions.append(i)
-    
-    if not unrevealed_positions:
-        # All positions have been revealed already, which shouldn't happen
-        # but we handle it gracefully
-        game_state['message'] = "No new hints available - you've already found all correct positions!"
+        return redirect(url_for('.index', from_redirect=1))
+
+    get_engine().apply_hint(game_state)
+    save_game_state(game_state)
+    return redirect(url_for('.index', from_redirect=1))
+
+# --- JSON API ---
+# Single round-trip versions of the form routes for static/js/game.js: each
+# action returns only what changed instead of redirecting to a full render.
+# The actions themselves live in game_api, shared with the ASGI front end.
+
+NOT_AN_OBJECT = {'error': "Expected a JSON object."}
+
+def api_params(fallback):
+    """The request's JSON object, or `fallback` (form or query values) without a JSON body.
+
+    Returns None for a JSON body that is not an object; the routes answer
+    400, as the ASGI front end does.
+    """
+    params = request.get_json(silent=True)
+    if params is None:
+        return fallback
+    return params if isinstance(params, dict) else None
+
+@bp.route('/api/game', methods=['GET', 'POST'])
+def api_game():
+    """GET: the current game (started if there is none). POST: start a new game."""
+    params = api_params(request.values)
+    if params is None:
+        return jsonify(NOT_AN_OBJECT), 400
+    status, body = game_api.game(get_engine(), get_game_store(), session, params, new=request.method == 'POST')
+    return jsonify(body), status
+
+@bp.route('/api/guess', methods=['POST'])
+def api_guess():
+    """Plays a guess; returns its feedback and the fields it changed."""
+    params = api_params(request.form)
+    if params is None:
+        return jsonify(NOT_AN_OBJECT), 400
+    status, body = game_api.guess(get_engine(), get_game_store(), session, params, stats=get_stats_store())
+    return jsonify(body), status
+
+@bp.route('/api/hint', methods=['POST'])
+def api_hint():
+    """Uses a hint; returns the revealed position and letter (null if none was given)."""
+    status, body = game_api.hint(get_engine(), get_game_store(), session)
+    return jsonify(body), status
+
+@bp.route('/api/stats')
+def api_stats():
+    """The player's statistics (null before their first finished game) and everyone's per difficulty."""
+    status, body = game_api.player_stats(get_stats_store(), session)
+    return jsonify(body), status
+
+@bp.route('/api/leaderboard')
+def api_leaderboard():
+    """The top players (?limit=, 10 by default)."""
+    status, body = game_api.leaderboard(get_stats_store(), session, request.args)
+    return jsonify(body), status
+
+@bp.route('/api/bot/games', methods=['POST'])
+def api_bot_games():
+    """Starts {"count": n, "difficulty": ...} games for an automated player; returns their ids."""
+    params = api_params({})
+    if params is None:
+        return jsonify(NOT_AN_OBJECT), 400
+    status, body = game_api.new_games(get_engine(), get_game_store(), params,
+                                      current_app.config['WORDLE_BATCH_MAX_MOVES'])
+    return jsonify(body), status
+
+@bp.route('/api/bot/guesses', methods=['POST'])
+def api_bot_guesses():
+    """Plays {"moves": [{"game_id": ..., "guess": ...}, ...]}; streams one result per move."""
+    params = api_params({})
+    if params is None:
+        return jsonify(NOT_AN_OBJECT), 400
+    status, body = game_api.guess_batch(get_engine(), get_game_store(), params,
+                                        current_app.config['WORDLE_BATCH_MAX_MOVES'])
+    if isinstance(body, dict):
+        return jsonify(body), status
+    return Response(body, status=status, mimetype='application/json')
+# ------------------------------------
+
+@bp.route('/api/word-filter')
+def word_filter():
+    """The dictionary's Bloom filter (see word_filter.py), for checking guesses in the browser.
+
+    Pages link it as /api/word-filter?v=<version>; a request for the current
+    version may be cached forever, any other is revalidated by ETag.
+    """
+    published = get_word_filter()
+    if published is None:
+        return jsonify({'error': "Word list not loaded."}), 503
+    response = Response(published.payload, mimetype='application/octet-stream')
+    response.set_etag(published.version)
+    response.headers['X-Word-Filter-Version'] = published.version
+    response.cache_control.public = True
+    if request.args.get('v') == published.version:
+        response.cache_control.max_age = 365 * 24 * 3600
+        response.cache_control.immutable = True
     else:
-        # Choose a random unrevealed position
-        import random
-        hint_position = random.choice(unrevealed_positions)
-        hint_letter = target_word[hint_position]
-        
-        # Update game state with hint
-        game_state['hints_used'] = hints_used + 1
-        game_state['message'] = f"Hint: Letter at position {hint_position + 1} is '{hint_letter}'."
-    
-    session['game_state'] = game_state
-    session.modified = True
-    return redirect(url_for('index', from_redirect=1))
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@bp.route('/assets/<path:filename>')
+def asset(filename):
+    """Serves a fingerprinted static file; cached by browsers for a year."""
+    return current_app.extensions['wordle']['assets'].send(filename)
 
-@app.route('/debug')
+@bp.route('/metrics')
+def metrics_endpoint():
+    """Serves every metric in the Prometheus text format."""
+    return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
+
+@bp.route('/debug')
 def debug_session():
     """Debug endpoint to check session state"""
     output = []
     output.append("Session Debug Info:")
     
-    # Check if game_state exists in session
-    if 'game_state' in session:
-        output.append("Game state exists in session")
-        
-        # Get the game state
-        game_state = session['game_state']
+    # Check if a game state exists for this session's game id
+    game_state = load_game_state()
+    if game_state is not None:
+        output.append(f"Game state exists in store for game id {session.get('game_id')}")
         
         # Check game state keys
         output.append(f"Game state keys: {list(game_state.keys())}")
@@ -352,13 +571,11 @@ def debug_session():
         else:
             output.append("ERROR: valid_words not found in game_state!")
     else:
-        output.append("ERROR: No game_state in session!")
+        output.append("ERROR: No game_state in store for this session!")
     
     # Return debug info
     return "<br>".join(output)
 
-# TODO: Add routes for /hint
-
 if __name__ == '__main__':
     # Debug mode should be False in production
-    app.run(debug=True, host='0.0.0.0', port=5001) 
\ No newline at end of file
+    create_app().run(debug=True, host='0.0.0.0', port=5001) 
\ No newline at end of file
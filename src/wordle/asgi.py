@@ -0,0 +1,275 @@
+import asyncio
+import json
+import logging
+import time
+from http.cookies import CookieError, SimpleCookie
+from urllib.parse import parse_qs, parse_qsl
+
+from itsdangerous import BadSignature
+
+from . import game_api
+from . import metrics
+from .duel import DEFAULT_PLAYERS, DuelError, DuelHub
+from .app import REQUEST_SECONDS, SESSION_COOKIE_BYTES, create_app
+
+MAX_BODY_BYTES = 64 * 1024
+MAX_WEBSOCKET_MESSAGE = 1024
+DUEL_PATH = '/ws/duel'
+JSON_CONTENT_TYPE = (b"content-type", b"application/json")
+
+
+class AsgiGameApp:
+    """ASGI front end for the JSON game API, for async servers such as uvicorn.
+
+    Serves the same /api/game, /api/guess, /api/hint and bot API actions as
+    the Flask routes (both call game_api), using the GameEngine and GameStore
+    of a Flask app from create_app() and reading and writing its signed
+    session cookie, so a player can move between the two front ends mid-game.
+
+    Connections are held and requests parsed without a thread per
+    connection, so one process can hold many idle or slow connections. The
+    game actions themselves run in worker threads: any of them may wait on
+    SQLite (a GameStore or StatsStore cache miss, or their flush threads
+    holding the connection for a write), which must not stall the event
+    loop and every other connection on it, duel WebSockets included.
+    """
+
+    def __init__(self, flask_app):
+        """
+        Args:
+            flask_app (Flask): An app built by create_app(); provides the
+                engine, store, secret key and session cookie settings.
+        """
+        services = flask_app.extensions['wordle']
+        self.engine = services['engine']
+        self.store = services['game_store']
+        self.stats = services['stats']
+        self._serializer = flask_app.session_interface.get_signing_serializer(flask_app)
+        self._max_age = int(flask_app.permanent_session_lifetime.total_seconds())
+        config = flask_app.config
+        self._cookie_name = config['SESSION_COOKIE_NAME']
+        attributes = [f"Path={config['SESSION_COOKIE_PATH'] or config['APPLICATION_ROOT']}"]
+        if config['SESSION_COOKIE_HTTPONLY']:
+            attributes.append("HttpOnly")
+        if config['SESSION_COOKIE_SECURE']:
+            attributes.append("Secure")
+        if config['SESSION_COOKIE_SAMESITE']:
+            attributes.append(f"SameSite={config['SESSION_COOKIE_SAMESITE']}")
+        self._cookie_attributes = "; ".join(attributes)
+
+        self.duels = DuelHub(self.engine) if self.engine is not None else None
+        engine, store, stats = self.engine, self.store, self.stats
+        self._routes = {
+            '/api/game': {
+                'GET': lambda session, params: game_api.game(engine, store, session, params),
+                'POST': lambda session, params: game_api.game(engine, store, session, params, new=True),
+            },
+            '/api/guess': {'POST': lambda session, params: game_api.guess(engine, store, session, params, stats)},
+            '/api/hint': {'POST': lambda session, params: game_api.hint(engine, store, session)},
+            '/api/stats': {'GET': lambda session, params: game_api.player_stats(stats, session)},
+            '/api/leaderboard': {'GET': lambda session, params: game_api.leaderboard(stats, session, params)},
+            '/api/bot/games': {'POST': lambda session, params: game_api.new_games(
+                engine, store, params, flask_app.config['WORDLE_BATCH_MAX_MOVES'])},
+            '/api/bot/guesses': {'POST': lambda session, params: game_api.guess_batch(
+                engine, store, params, flask_app.config['WORDLE_BATCH_MAX_MOVES'])},
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            start = time.perf_counter()
+            status = await self._http(scope, receive, send)
+            route = scope['path'] if scope['path'] in self._routes or scope['path'] == '/metrics' else 'unmatched'
+            REQUEST_SECONDS.labels(route, scope['method'], str(status)).observe(time.perf_counter() - start)
+        elif scope['type'] == 'websocket':
+            await self._websocket(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.store.close() # Write any pending games
+                self.stats.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope, receive, send):
+        """Handles one request; returns the response status (for metrics)."""
+        if scope['path'] == '/metrics' and scope['method'] == 'GET':
+            body = metrics.REGISTRY.render().encode()
+            await self._send(send, 200, body, [(b"content-type", metrics.CONTENT_TYPE.encode())])
+            return 200
+        methods = self._routes.get(scope['path'])
+        if methods is None:
+            return await self._respond(send, 404, {'error': "Not found."})
+        handler = methods.get(scope['method'])
+        if handler is None:
+            return await self._respond(send, 405, {'error': "Method not allowed."},
+                                       [(b"allow", ", ".join(methods).encode())])
+
+        body = await self._read_body(receive)
+        if body is None:
+            return await self._respond(send, 413, {'error': "Request body too large."})
+        headers = dict(scope['headers']) # Lowercase names; repeats collapse, fine for these two
+        params = self._parse_params(scope, headers, body)
+        if params is None:
+            return await self._respond(send, 400, {'error': "Expected a JSON object."})
+        session, cookie_present = self._load_session(headers)
+        before = dict(session)
+        try:
+            status, payload = await asyncio.to_thread(handler, session, params)
+        except Exception:
+            logging.exception(f"Error handling {scope['method']} {scope['path']}")
+            return await self._respond(send, 500, {'error': "Internal server error."})
+
+        if not isinstance(payload, dict): # Bot API results, sent as they are serialized
+            await self._stream(send, status, payload)
+            return status
+        extra_headers = []
+        if session != before or (cookie_present and not session):
+            cookie = self._session_cookie(session)
+            SESSION_COOKIE_BYTES.observe(len(cookie))
+            extra_headers.append((b"set-cookie", cookie))
+        return await self._respond(send, status, payload, extra_headers)
+
+    async def _websocket(self, scope, receive, send):
+        """Runs one duel connection: /ws/duel?name=...&room=... (or &size=n for a new room).
+
+        Messages from the room are written by a separate task as they are
+        queued, so a slow client only ever holds up its own connection; the
+        connection ends when either the client or the room gives up.
+        """
+        if (await receive())['type'] != 'websocket.connect':
+            return
+        if scope['path'] != DUEL_PATH or self.duels is None:
+            await send({'type': 'websocket.close', 'code': 1008})
+            return
+        query = parse_qs(scope.get('query_string', b"").decode("utf-8", "replace"))
+        await send({'type': 'websocket.accept'})
+        try:
+            size = query.get('size', [DEFAULT_PLAYERS])[0]
+            player = self.duels.join(query.get('room', [None])[0], query.get('name', [None])[0],
+                                     int(size) if str(size).isdigit() else 0)
+        except DuelError as e:
+            await send({'type': 'websocket.send', 'text': json.dumps({'type': 'error', 'error': str(e)})})
+            await send({'type': 'websocket.close', 'code': 1008})
+            return
+
+        reader = asyncio.create_task(self._read_duel(player, receive))
+        writer = asyncio.create_task(self._write_duel(player, send))
+        try:
+            await asyncio.wait((reader, writer), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            player.room.leave(player)
+            for task in (reader, writer):
+                task.cancel()
+            await asyncio.gather(reader, writer, return_exceptions=True)
+
+    async def _read_duel(self, player, receive):
+        """Acts on the client's messages until it disconnects."""
+        while (message := await receive())['type'] != 'websocket.disconnect':
+            text = message.get('text') or ""
+            if len(text) <= MAX_WEBSOCKET_MESSAGE:
+                self.duels.handle(player, text)
+
+    @staticmethod
+    async def _write_duel(player, send):
+        """Sends the player's queued messages; closes the socket if the room drops them."""
+        while (text := await player.next_message()) is not None:
+            await send({'type': 'websocket.send', 'text': text})
+        await send({'type': 'websocket.close', 'code': 1013}) # Fell too far behind
+
+    @staticmethod
+    async def _read_body(receive):
+        """Reads the request body, or returns None if it exceeds MAX_BODY_BYTES."""
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                break
+            chunk = message.get('body', b"")
+            size += len(chunk)
+            if size > MAX_BODY_BYTES:
+                return None
+            chunks.append(chunk)
+            if not message.get('more_body', False):
+                break
+        return b"".join(chunks)
+
+    @staticmethod
+    def _parse_params(scope, headers, body):
+        """Request parameters from a JSON or form body, else the query string.
+
+        Returns None for JSON that is not an object; unreadable JSON and null
+        count as no parameters, as in Flask.
+        """
+        content_type = headers.get(b"content-type", b"").split(b";")[0].strip()
+        if body and content_type == b"application/json":
+            try:
+                params = json.loads(body)
+            except ValueError:
+                params = None
+            if params is None:
+                return {}
+            return params if isinstance(params, dict) else None
+        if body and content_type == b"application/x-www-form-urlencoded":
+            return dict(parse_qsl(body.decode("utf-8", "replace")))
+        return dict(parse_qsl(scope.get('query_string', b"").decode("utf-8", "replace")))
+
+    def _load_session(self, headers):
+        """Returns (session dict, whether a session cookie was sent)."""
+        try:
+            cookies = SimpleCookie(headers.get(b"cookie", b"").decode("latin-1"))
+        except CookieError:
+            return {}, False
+        morsel = cookies.get(self._cookie_name)
+        if morsel is None:
+            return {}, False
+        try:
+            return dict(self._serializer.loads(morsel.value, max_age=self._max_age)), True
+        except BadSignature: # Also covers expired cookies
+            return {}, True
+
+    def _session_cookie(self, session):
+        if not session:
+            return f"{self._cookie_name}=; Max-Age=0; {self._cookie_attributes}".encode("latin-1")
+        value = self._serializer.dumps(session)
+        return f"{self._cookie_name}={value}; {self._cookie_attributes}".encode("latin-1")
+
+    @classmethod
+    async def _respond(cls, send, status, payload, extra_headers=()):
+        """Sends a JSON response; returns its status."""
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        await cls._send(send, status, body, [JSON_CONTENT_TYPE, *extra_headers])
+        return status
+
+    @staticmethod
+    async def _stream(send, status, chunks):
+        """Sends a JSON response body from an iterator of text chunks.
+
+        The chunks are serialized in a worker thread too: a full bot batch is
+        a thousand results, too much JSON to encode on the event loop.
+        """
+        await send({'type': 'http.response.start', 'status': status, 'headers': [JSON_CONTENT_TYPE]})
+        chunks = iter(chunks)
+        while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+            await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b""})
+
+    @staticmethod
+    async def _send(send, status, body, headers):
+        headers = [(b"content-length", str(len(body)).encode()), *headers]
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+
+def create_asgi_app(flask_app=None):
+    """Builds the ASGI app (over a new Flask app from create_app() by default).
+
+    Run with, e.g.:
+        uvicorn --factory src.wordle.asgi:create_asgi_app
+    """
+    return AsgiGameApp(flask_app if flask_app is not None else create_app())
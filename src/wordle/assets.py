@@ -0,0 +1,173 @@
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+
+from flask import request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError: # brotli is optional: without it only gzip is produced and served
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST_NAME = 'manifest.json'
+# Fingerprinted files never change, so browsers may keep them for a year without asking
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+COMPRESSIBLE_SUFFIXES = ('.css', '.js', '.svg', '.json', '.txt', '.html')
+COMPRESSIBLE_MIMETYPES = ('text/html', 'text/plain', 'application/json')
+MIN_COMPRESS_BYTES = 512 # Smaller bodies gain too little to be worth it
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+def available_encodings():
+    """Content encodings this process can produce, best first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def compress(data, encoding, best=False):
+    """Compresses `data` with 'br' or 'gzip' (best=True for build time, else fast enough per request)."""
+    if encoding == 'br':
+        return brotli.compress(data, quality=11 if best else 5)
+    return gzip.compress(data, compresslevel=9 if best else 6, mtime=0)
+
+def fingerprinted_name(relative_path, data):
+    """css/style.css -> css/style.<first 10 hex digits of the content hash>.css"""
+    stem, suffix = os.path.splitext(relative_path)
+    return f"{stem}.{hashlib.blake2b(data, digest_size=5).hexdigest()}{suffix}"
+
+
+def build_assets(static_dir=STATIC_DIR, dist_dir=DIST_DIR):
+    """Copies every static file into `dist_dir` under a content-hashed name, with compressed copies.
+
+    Text files also get .gz (and, if brotli is installed, .br) versions
+    next to them, when that makes them smaller. Files from earlier builds
+    are left in place so pages rendered before a deploy keep working.
+
+    Returns:
+        dict: The manifest written to dist_dir: original path -> hashed path.
+    """
+    manifest = {}
+    dist_dir = os.path.abspath(dist_dir)
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = sorted(d for d in dirs if os.path.abspath(os.path.join(root, d)) != dist_dir)
+        for name in sorted(files):
+            source = os.path.join(root, name)
+            relative = os.path.relpath(source, static_dir).replace(os.sep, '/')
+            with open(source, 'rb') as f:
+                data = f.read()
+            hashed = fingerprinted_name(relative, data)
+            target = os.path.join(dist_dir, hashed)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            _write(target, data)
+            if name.endswith(COMPRESSIBLE_SUFFIXES):
+                for encoding in available_encodings():
+                    compressed = compress(data, encoding, best=True)
+                    if len(compressed) < len(data):
+                        _write(target + ENCODING_SUFFIXES[encoding], compressed)
+            manifest[relative] = hashed
+    _write(os.path.join(dist_dir, MANIFEST_NAME), json.dumps(manifest, indent=2, sort_keys=True).encode())
+    return manifest
+
+def _write(path, data):
+    """Writes via a temporary file, so a server never reads half a file."""
+    temporary = f"{path}.tmp{os.getpid()}"
+    with open(temporary, 'wb') as f:
+        f.write(data)
+    os.replace(temporary, path)
+
+
+class Assets:
+    """Serves built (fingerprinted, precompressed) static files with long-lived cache headers.
+
+    Templates link files with asset_url('css/style.css'), which points at
+    the hashed copy from the last build_assets() run, or at the plain
+    /static file if the assets have not been built.
+    """
+
+    def __init__(self, dist_dir=DIST_DIR):
+        self.dist_dir = dist_dir
+        try:
+            with open(os.path.join(dist_dir, MANIFEST_NAME), 'rb') as f:
+                manifest = f.read()
+        except FileNotFoundError:
+            logging.info("Static assets are not built; serving them unversioned "
+                         "(python -m src.wordle.assets builds them).")
+            manifest = b"{}"
+        self.manifest = json.loads(manifest)
+        # Changes whenever any asset does; part of page ETags, since pages embed the asset URLs
+        self.version = hashlib.blake2b(manifest, digest_size=8).digest()
+
+    def url(self, filename):
+        """URL of a static file: its fingerprinted copy when built, else the plain /static one."""
+        hashed = self.manifest.get(filename)
+        if hashed is None:
+            return url_for('static', filename=filename)
+        return url_for('wordle.asset', filename=hashed)
+
+    def send(self, filename):
+        """Response for a built file, precompressed if the client accepts it; 404 if unknown."""
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        encoding = None
+        for candidate in available_encodings():
+            if request.accept_encodings[candidate] and os.path.isfile(
+                    os.path.join(self.dist_dir, filename + ENCODING_SUFFIXES[candidate])):
+                encoding = candidate
+                break
+        served = filename + ENCODING_SUFFIXES[encoding] if encoding else filename
+        response = send_from_directory(self.dist_dir, served, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if filename.endswith(COMPRESSIBLE_SUFFIXES):
+            response.vary.add('Accept-Encoding')
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    def install(self, app):
+        """Makes asset_url() available to the app's templates."""
+        app.jinja_env.globals['asset_url'] = self.url
+        return self
+
+
+def compress_response(response):
+    """after_request hook: compresses HTML, text and JSON bodies for clients that accept it.
+
+    Streamed responses are left alone; compressing them here would buffer them.
+    """
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES or 'Content-Encoding' in response.headers):
+        return response
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS_BYTES:
+        return response
+    response.vary.add('Accept-Encoding')
+    for encoding in available_encodings():
+        if request.accept_encodings[encoding]:
+            response.set_data(compress(data, encoding))
+            response.headers['Content-Encoding'] = encoding
+            break
+    return response
+
+
+def main():
+    """Builds the fingerprinted, precompressed copies of the static files."""
+    parser = argparse.ArgumentParser(description="Build fingerprinted, precompressed static assets.")
+    parser.add_argument("--static-dir", default=STATIC_DIR, help="Source files (default: src/wordle/static)")
+    parser.add_argument("--dist-dir", default=DIST_DIR, help="Output directory (default: static/dist)")
+    args = parser.parse_args()
+
+    manifest = build_assets(args.static_dir, args.dist_dir)
+    for original, hashed in sorted(manifest.items()):
+        variants = [suffix for suffix in ('.gz', '.br')
+                    if os.path.isfile(os.path.join(args.dist_dir, hashed + suffix))]
+        print(f"{original} -> {hashed} {' '.join(variants)}")
+    if brotli is None:
+        print("brotli is not installed; only gzip copies were written.")
+
+
+if __name__ == "__main__":
+    main()
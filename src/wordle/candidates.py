@@ -0,0 +1,162 @@
+from collections import Counter
+
+from .feedback import CORRECT_POSITION, INCORRECT, WORD_LENGTH, as_pattern, code_to_symbols
+
+
+def _bits_from_ids(ids, size):
+    """Builds an int bitset (bit i set for each id) in one step."""
+    bitmap = bytearray((size + 7) // 8)
+    for i in ids:
+        bitmap[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bitmap, "little")
+
+
+class CandidateIndex:
+    """Read-only constraint bitsets over a dictionary, shared by every CandidateSet.
+
+    Bit i of every bitset stands for word i of the ordered word list.
+    """
+
+    def __init__(self, words, word_length=None):
+        """Precomputes the per-position and per-letter-count bitsets.
+
+        Args:
+            words (Sequence[str]): The ordered, lowercase dictionary (WordManager.word_list).
+            word_length (int): Letters per word; taken from the first word if not given.
+
+        Raises:
+            ValueError: If the words are not all `word_length` letters long.
+        """
+        self.words = words
+        if word_length is None:
+            word_length = len(words[0]) if len(words) else WORD_LENGTH
+        self.word_length = word_length
+        size = len(words)
+        self.all_bits = (1 << size) - 1
+
+        at_position = [{} for _ in range(word_length)] # [i][letter] -> ids
+        at_least = {} # (letter, k) -> ids of words with k or more copies of letter
+        for word_id, word in enumerate(words):
+            if len(word) != word_length:
+                raise ValueError(f"Expected {word_length}-letter words, got {word!r}.")
+            for i, letter in enumerate(word):
+                at_position[i].setdefault(letter, []).append(word_id)
+            for letter, count in Counter(word).items():
+                for k in range(1, count + 1):
+                    at_least.setdefault((letter, k), []).append(word_id)
+
+        self._at_position = [
+            {letter: _bits_from_ids(ids, size) for letter, ids in position.items()}
+            for position in at_position
+        ]
+        self._at_least = {key: _bits_from_ids(ids, size) for key, ids in at_least.items()}
+
+    def letter_at(self, position, letter):
+        """Bitset of words with `letter` at `position`."""
+        return self._at_position[position].get(letter, 0)
+
+    def at_least(self, letter, count):
+        """Bitset of words containing `letter` at least `count` times."""
+        if count <= 0:
+            return self.all_bits
+        return self._at_least.get((letter, count), 0)
+
+    def consistent_with(self, guess, feedback):
+        """Bitset of words that would give `feedback` for `guess`.
+
+        Args:
+            guess (str): The guess, any case.
+            feedback (FeedbackPattern | list[str]): Its feedback; for other
+                word lengths than 5, a symbol list or a base-3 code.
+        """
+        guess = guess.lower()
+        if self.word_length == WORD_LENGTH:
+            symbols = as_pattern(feedback).to_symbols()
+        elif isinstance(feedback, int):
+            symbols = code_to_symbols(feedback, self.word_length)
+        else:
+            symbols = list(feedback)
+        bits = self.all_bits
+
+        # Per position: correct letters are fixed; any other letter is ruled out there
+        for i, (letter, symbol) in enumerate(zip(guess, symbols)):
+            if symbol == CORRECT_POSITION:
+                bits &= self.letter_at(i, letter)
+            else:
+                bits &= ~self.letter_at(i, letter)
+
+        # Per letter: each '*' or '+' is one copy in the target; an '_' for the
+        # same letter means there are no more copies than that
+        for letter in set(guess):
+            found = 0
+            capped = False
+            for guess_letter, symbol in zip(guess, symbols):
+                if guess_letter == letter:
+                    if symbol == INCORRECT:
+                        capped = True
+                    else:
+                        found += 1
+            bits &= self.at_least(letter, found)
+            if capped:
+                bits &= ~self.at_least(letter, found + 1)
+        return bits
+
+
+class CandidateSet:
+    """The dictionary words still consistent with a game's guesses and feedback.
+
+    Narrows incrementally: each apply() ANDs a handful of precomputed bitsets
+    into the current set instead of rescanning the word list.
+    """
+
+    def __init__(self, index, bits=None):
+        """
+        Args:
+            index (CandidateIndex): The shared dictionary bitsets.
+            bits (int): Starting bitset; defaults to every word.
+        """
+        self.index = index
+        self.bits = index.all_bits if bits is None else bits
+
+    @classmethod
+    def from_history(cls, index, guesses, feedback):
+        """Builds the set for parallel lists of guesses and their feedback."""
+        candidates = cls(index)
+        for guess, guess_feedback in zip(guesses, feedback):
+            candidates.apply(guess, guess_feedback)
+        return candidates
+
+    def apply(self, guess, feedback):
+        """Narrows the set with one guess and its feedback."""
+        self.bits &= self.index.consistent_with(guess, feedback)
+
+    @property
+    def count(self):
+        """The number of remaining candidates."""
+        return self.bits.bit_count()
+
+    def word_ids(self):
+        """Returns the ids of the remaining words, in word-list order."""
+        # Scan the binary string; much faster than peeling bits off a big int
+        binary = bin(self.bits)[:1:-1] # Lowest bit first
+        ids = []
+        i = binary.find("1")
+        while i != -1:
+            ids.append(i)
+            i = binary.find("1", i + 1)
+        return ids
+
+    def words(self):
+        """Returns the remaining words, in word-list order."""
+        words = self.index.words
+        return [words[i] for i in self.word_ids()]
+
+    def __contains__(self, word_id):
+        return bool(self.bits >> word_id & 1)
+
+    def __len__(self):
+        return self.count
+
+    def copy(self):
+        """Returns an independent copy sharing the same index."""
+        return CandidateSet(self.index, self.bits)
@@ -0,0 +1,193 @@
+import argparse
+import logging
+import mmap
+import os
+import struct
+from collections.abc import Sequence
+
+# Compiled word list layout (all integers little-endian):
+#   header   magic, format version, word length, word count, hash table slots,
+#            source file size and mtime (ns) used for the staleness check
+#   records  `count` fixed-width ASCII words, in the same sorted order as
+#            WordManager.word_list, so record position == word id
+#   table    open-addressing hash index of uint32 slots; 0 is empty,
+#            otherwise the slot holds (word id + 1)
+MAGIC = b"WRDL"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sHHIIQQ")
+SLOT = struct.Struct("<I")
+
+FNV_OFFSET = 0x811C9DC5
+FNV_PRIME = 0x01000193
+
+
+def _fnv1a(data):
+    """32-bit FNV-1a hash; stable across processes, unlike hash()."""
+    h = FNV_OFFSET
+    for byte in data:
+        h = ((h ^ byte) * FNV_PRIME) & 0xFFFFFFFF
+    return h
+
+
+def compiled_path_for(text_path):
+    """Returns the compiled file path that sits next to a text word list."""
+    return os.path.splitext(text_path)[0] + ".bin"
+
+
+def build_compiled_words(words, source_path, output_path=None):
+    """Writes a compiled word list for `words`, stamped with `source_path`'s metadata.
+
+    Args:
+        words (list[str]): The sorted, normalized words (as WordManager loads them).
+        source_path (str): The text file the words came from.
+        output_path (str): Where to write; defaults to compiled_path_for(source_path).
+
+    Returns:
+        str: The path of the compiled file.
+    """
+    if output_path is None:
+        output_path = compiled_path_for(source_path)
+    word_length = len(words[0]) if words else 0
+    if any(len(word) != word_length for word in words):
+        raise ValueError("All words in a compiled word list must have the same length.")
+
+    table_size = 1
+    while table_size < 2 * len(words):
+        table_size *= 2
+    mask = table_size - 1
+    table = [0] * table_size
+    records = bytearray()
+    for i, word in enumerate(words):
+        encoded = word.encode("ascii")
+        records += encoded
+        slot = _fnv1a(encoded) & mask
+        while table[slot]:
+            slot = (slot + 1) & mask
+        table[slot] = i + 1
+    # Keep the hash table 4-byte aligned
+    records += b"\0" * (-len(records) % 4)
+
+    source_stat = os.stat(source_path)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, word_length, len(words), table_size,
+                         source_stat.st_size, source_stat.st_mtime_ns)
+
+    # Write to a temp file and rename, so readers never map a half-written file
+    tmp_path = f"{output_path}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(records)
+        f.write(struct.pack(f"<{table_size}I", *table))
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+class CompiledWordList(Sequence):
+    """A read-only, memory-mapped word list with a built-in hash index.
+
+    Behaves like the ordered word list (indexing, len, iteration) and like
+    the word -> id index (`in`, `get`), so WordManager can use one object
+    for both. Pages are shared between every process mapping the same file.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mm) < HEADER.size:
+            raise ValueError(f"Compiled word list '{path}' is truncated.")
+        (magic, version, self.word_length, self._count, self._table_size,
+         self.source_size, self.source_mtime_ns) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"'{path}' is not a compiled word list (version {FORMAT_VERSION}).")
+        self._records_offset = HEADER.size
+        records_size = self._count * self.word_length
+        self._table_offset = self._records_offset + records_size + (-records_size % 4)
+        if len(self._mm) < self._table_offset + self._table_size * SLOT.size:
+            raise ValueError(f"Compiled word list '{path}' is truncated.")
+        self._mask = self._table_size - 1
+
+    def is_stale(self, source_path):
+        """Checks whether the text file has changed since this list was compiled."""
+        try:
+            source_stat = os.stat(source_path)
+        except OSError:
+            return False # Source gone; the compiled list is all we have
+        return (source_stat.st_size != self.source_size
+                or source_stat.st_mtime_ns != self.source_mtime_ns)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("word index out of range")
+        start = self._records_offset + index * self.word_length
+        return self._mm[start:start + self.word_length].decode("ascii")
+
+    def get(self, word, default=None):
+        """Returns the id (position) of a lowercase word, or `default`."""
+        if len(word) != self.word_length or not word.isascii():
+            return default
+        encoded = word.encode("ascii")
+        mm = self._mm
+        slot = _fnv1a(encoded) & self._mask
+        while True:
+            entry = SLOT.unpack_from(mm, self._table_offset + slot * SLOT.size)[0]
+            if not entry:
+                return default
+            start = self._records_offset + (entry - 1) * self.word_length
+            if mm[start:start + self.word_length] == encoded:
+                return entry - 1
+            slot = (slot + 1) & self._mask
+
+    def __contains__(self, word):
+        return isinstance(word, str) and self.get(word) is not None
+
+    def close(self):
+        """Unmaps the file."""
+        self._mm.close()
+
+
+def load_compiled_words(text_path):
+    """Maps the compiled list for `text_path`, or returns None if missing or stale."""
+    path = compiled_path_for(text_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        compiled = CompiledWordList(path)
+    except (OSError, ValueError) as e:
+        logging.warning(f"Ignoring compiled word list {path}: {e}")
+        return None
+    if compiled.is_stale(text_path):
+        compiled.close()
+        return None
+    return compiled
+
+
+def main():
+    """Compiles a text word list into the binary format WordManager can mmap."""
+    # Imported here: word_manager imports this module for loading
+    from .word_manager import WordManager
+
+    parser = argparse.ArgumentParser(description="Compile a Wordle word list for fast loading.")
+    parser.add_argument(
+        "word_file",
+        nargs="?",
+        default="data/words.txt",
+        help="Word list to compile, relative to src/wordle or absolute (default: data/words.txt)",
+    )
+    parser.add_argument("-o", "--output", help="Output path (default: next to the word list, .bin)")
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    text_path = os.path.join(base_dir, args.word_file)
+    manager = WordManager(text_path, use_compiled=False)
+    output_path = build_compiled_words(manager.word_list, text_path, args.output)
+    print(f"Compiled {len(manager.word_list)} words to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+import asyncio
+import json
+import secrets
+
+from .game_engine import DIFFICULTY_SETTINGS
+from .metrics import REGISTRY
+from .state_codec import describe_message
+from .target_scheduler import TargetScheduler
+
+MAX_PLAYERS = 8
+DEFAULT_PLAYERS = 2 # A race starts once its room has this many players
+MAX_GUESSES = DIFFICULTY_SETTINGS['medium']['guesses']
+OUTBOX_SIZE = 32 # Messages queued for one slow client before it is resynced
+MAX_RESYNCS = 8 # Resyncs in a row (without the client catching up) before it is dropped
+MAX_NAME_LENGTH = 20
+
+_MESSAGES = REGISTRY.counter('wordle_duel_messages_total', "Duel messages queued for clients.").labels()
+_RESYNCS = REGISTRY.counter('wordle_duel_resyncs_total',
+                            "Times a slow duel client's backlog was replaced by a snapshot.").labels()
+
+
+class DuelError(Exception):
+    """A player cannot join (or act in) a room; the message is shown to them."""
+
+
+def _encode(message):
+    return json.dumps(message, separators=(",", ":"))
+
+
+class DuelPlayer:
+    """One connection in a room: its progress and its outgoing message queue.
+
+    Only feedback and attempt counts are ever sent to other players; the
+    letters of a player's guesses go to that player alone.
+    """
+
+    def __init__(self, room, player_id, name):
+        self.room = room
+        self.player_id = player_id
+        self.name = name
+        self.guesses = [] # Never sent to the other players
+        self.feedback = [] # Pattern strings, e.g. "_+__*"
+        self.won = False
+        self.resyncs = 0 # Consecutive resyncs; reset whenever the client drains its queue
+        self.closed = False
+        self.outbox = asyncio.Queue(OUTBOX_SIZE) # Encoded messages; None stops the writer
+
+    @property
+    def attempts_left(self):
+        return MAX_GUESSES - len(self.feedback)
+
+    @property
+    def done(self):
+        return self.won or self.attempts_left <= 0
+
+    def progress(self):
+        return {'id': self.player_id, 'name': self.name, 'feedback': self.feedback,
+                'attempts_left': self.attempts_left, 'won': self.won}
+
+    def deliver(self, text):
+        """Queues an encoded message without waiting (called from the event loop).
+
+        A client that falls OUTBOX_SIZE messages behind has its backlog
+        replaced by one snapshot of the room, which carries everything the
+        dropped messages did; after MAX_RESYNCS of those in a row it leaves
+        the room and is disconnected, so one stalled socket never holds
+        memory or the room.
+        """
+        if self.closed:
+            return
+        try:
+            self.outbox.put_nowait(text)
+            _MESSAGES.inc()
+            return
+        except asyncio.QueueFull:
+            pass
+        _RESYNCS.inc()
+        self.resyncs += 1
+        while not self.outbox.empty():
+            self.outbox.get_nowait()
+        if self.resyncs > MAX_RESYNCS:
+            self.room.leave(self)
+        else:
+            self.outbox.put_nowait(_encode(self.room.snapshot('sync', self)))
+
+    def close(self):
+        """Stops the connection's writer; the connection then ends."""
+        if not self.closed:
+            self.closed = True
+            while not self.outbox.empty():
+                self.outbox.get_nowait()
+            self.outbox.put_nowait(None)
+
+    async def next_message(self):
+        """The next encoded message to send, or None once the player is closed."""
+        if self.outbox.empty():
+            self.resyncs = 0 # Caught up
+        return await self.outbox.get()
+
+
+class DuelRoom:
+    """Players racing on one target word; the first to find it wins.
+
+    The race starts when `size` players have joined (nobody can join after
+    that) and ends on the first win or once everyone is out of guesses.
+    Rooms live on one event loop and are only touched from it, so they need
+    no locks.
+    """
+
+    def __init__(self, hub, room_id, target_word, size=DEFAULT_PLAYERS):
+        self.hub = hub
+        self.room_id = room_id
+        self.size = size
+        self.target_word = target_word # Uppercase
+        self.players = {}
+        self.started = False
+        self.finished = False
+        self.winner = None
+        self._next_player = 0
+
+    def snapshot(self, kind, player):
+        """The whole room as `player` may see it: everyone's progress, and only their own guesses."""
+        message = {'type': kind, 'room': self.room_id, 'you': player.player_id, 'guesses': player.guesses,
+                   'size': self.size, 'started': self.started, 'max_guesses': MAX_GUESSES,
+                   'players': [p.progress() for p in self.players.values()]}
+        if self.finished:
+            message.update(finished=True, winner=self.winner, target_word=self.target_word)
+        return message
+
+    def broadcast(self, message, exclude=None):
+        """Sends one message to every player (but `exclude`), encoding it once."""
+        text = _encode(message)
+        for player in list(self.players.values()):
+            if player is not exclude:
+                player.deliver(text)
+
+    def join(self, name):
+        if self.started:
+            raise DuelError("This race has already started.")
+        self._next_player += 1
+        player = DuelPlayer(self, self._next_player, name)
+        self.broadcast({'type': 'joined', 'player': player.progress()})
+        self.players[player.player_id] = player
+        player.deliver(_encode(self.snapshot('room', player)))
+        if len(self.players) >= self.size:
+            self.started = True
+            self.broadcast({'type': 'start'})
+        return player
+
+    def leave(self, player):
+        if self.players.pop(player.player_id, None) is None:
+            return
+        player.close()
+        if not self.players:
+            self.hub.remove(self)
+            return
+        self.broadcast({'type': 'left', 'player': player.player_id})
+        self._check_finished()
+
+    def guess(self, player, guess):
+        """Plays a player's guess; they get the full result, everyone else only its feedback."""
+        engine = self.hub.engine
+        if not self.started:
+            raise DuelError("Waiting for more players.")
+        if self.finished or player.done:
+            raise DuelError("The race is over.")
+        guess = str(guess).upper()
+        error = engine.guess_error(guess)
+        if error is not None:
+            state = {}
+            engine.reject_guess(state, guess, error)
+            player.deliver(_encode({'type': 'rejected', 'guess': guess, 'message': describe_message(state)}))
+            return
+        feedback = engine.evaluator.evaluate_pattern(self.target_word, guess)
+        player.guesses.append(guess)
+        player.feedback.append(str(feedback))
+        player.won = feedback.is_win
+        player.deliver(_encode({'type': 'result', 'guess': guess, 'feedback': str(feedback),
+                                'attempts_left': player.attempts_left, 'won': player.won}))
+        self.broadcast({'type': 'progress', 'player': player.player_id, 'feedback': str(feedback),
+                        'attempts_left': player.attempts_left, 'won': player.won}, exclude=player)
+        if player.won and self.winner is None:
+            self.winner = player.player_id
+        self._check_finished()
+
+    def _check_finished(self):
+        if self.started and not self.finished and (
+                self.winner is not None or all(p.done for p in self.players.values())):
+            self.finished = True
+            self.broadcast({'type': 'finished', 'winner': self.winner, 'target_word': self.target_word})
+
+
+class DuelHub:
+    """All duel rooms of one process, on one event loop.
+
+    Each room fans its messages out to its own players' bounded queues
+    (see DuelPlayer.deliver), and targets are drawn from one shared
+    schedule, so rooms don't repeat a word until the dictionary is used up.
+    """
+
+    def __init__(self, engine):
+        """
+        Args:
+            engine (GameEngine): The shared engine; its dictionary and
+                Evaluator check and score every guess.
+        """
+        self.engine = engine
+        self.rooms = {}
+        self._scheduler = TargetScheduler(engine.word_count)
+        REGISTRY.gauge('wordle_duel_rooms', "Open duel rooms.", lambda: len(self.rooms))
+        REGISTRY.gauge('wordle_duel_players', "Players connected to duel rooms.",
+                       lambda: sum(len(room.players) for room in list(self.rooms.values())))
+
+    def create_room(self, size=DEFAULT_PLAYERS):
+        if not 2 <= size <= MAX_PLAYERS:
+            raise DuelError(f"A race needs 2 to {MAX_PLAYERS} players.")
+        room_id = secrets.token_urlsafe(6)
+        room = self.rooms[room_id] = DuelRoom(self, room_id, self.engine.draw_target_word(self._scheduler), size)
+        return room
+
+    def join(self, room_id, name, size=DEFAULT_PLAYERS):
+        """Joins the room `room_id` as `name`; returns the DuelPlayer.
+
+        Without a room id, a new room for `size` players is created.
+
+        Raises:
+            DuelError: If the room does not exist, is full or has started.
+        """
+        name = str(name or "Player").strip()[:MAX_NAME_LENGTH] or "Player"
+        if room_id is None:
+            return self.create_room(size).join(name)
+        room = self.rooms.get(room_id)
+        if room is None:
+            raise DuelError("No such room.")
+        return room.join(name)
+
+    def remove(self, room):
+        self.rooms.pop(room.room_id, None)
+
+    def handle(self, player, text):
+        """Acts on one message from a player's client, e.g. {"type": "guess", "guess": "crane"}."""
+        if player.closed: # Already out of the room
+            return
+        try:
+            message = json.loads(text)
+        except ValueError:
+            message = None
+        try:
+            if not isinstance(message, dict) or message.get('type') != 'guess':
+                raise DuelError("Expected {\"type\": \"guess\", \"guess\": ...}.")
+            player.room.guess(player, message.get('guess', ''))
+        except DuelError as e:
+            player.deliver(_encode({'type': 'error', 'error': str(e)}))
@@ -1,53 +1,186 @@
-from collections import Counter
+from . import feedback as fb
+from .feedback import FeedbackPattern
+
+try:
+    import numpy as np
+except ImportError: # numpy is only needed for the batch API
+    np = None
 
 class Evaluator:
     """Evaluates a guess against the target word and provides feedback."""
 
-    CORRECT_POSITION = "*"  # Symbol for correct letter in correct position
-    WRONG_POSITION = "+"    # Symbol for correct letter in wrong position
-    INCORRECT = "_"        # Symbol for incorrect letter
+    CORRECT_POSITION = fb.CORRECT_POSITION  # Symbol for correct letter in correct position
+    WRONG_POSITION = fb.WRONG_POSITION      # Symbol for correct letter in wrong position
+    INCORRECT = fb.INCORRECT                # Symbol for incorrect letter
+
+    # Base-3 digit of each symbol; see FeedbackPattern
+    FEEDBACK_DIGITS = fb.FEEDBACK_DIGITS
+
+    def __init__(self, feedback_matrix=None, word_length=5):
+        """Initializes the Evaluator.
+
+        Args:
+            feedback_matrix (FeedbackMatrix): Optional precomputed matrix (see
+                feedback_matrix.load_feedback_matrix); in-dictionary pairs are
+                then looked up instead of computed.
+            word_length (int): Length of the words being compared (5 for the
+                standard game; 4-8 for the length variants).
+        """
+        self.feedback_matrix = feedback_matrix
+        self.word_length = word_length
+        self._weights = fb.position_weights(word_length)
 
     def evaluate_guess(self, target_word, guess):
         """Evaluates the guess against the target word using two-pass logic.
 
         Args:
-            target_word (str): The secret 5-letter word.
-            guess (str): The player's 5-letter guess.
+            target_word (str): The secret word (5 letters unless word_length says otherwise).
+            guess (str): The player's guess, the same length.
 
         Returns:
-            list[str]: A list of 5 feedback symbols (e.g., ['*', '+', '_', '_', '*']).
+            list[str]: A list of feedback symbols (e.g., ['*', '+', '_', '_', '*']).
         """
-        if len(target_word) != 5 or len(guess) != 5:
-            raise ValueError("Target word and guess must be 5 letters long.")
+        pattern = self.evaluate_pattern(target_word, guess)
+        if self.word_length == fb.WORD_LENGTH:
+            return pattern.to_symbols()
+        return fb.code_to_symbols(pattern, self.word_length)
+
+    def evaluate_pattern(self, target_word, guess):
+        """Evaluates the guess against the target word, returning its base-3 feedback code.
+
+        Args:
+            target_word (str): The secret word (5 letters unless word_length says otherwise).
+            guess (str): The player's guess, the same length.
+
+        Returns:
+            FeedbackPattern: The feedback as a pattern id (0..242) for 5-letter
+                words; a plain int base-3 code for other lengths.
+        """
+        if len(target_word) != self.word_length or len(guess) != self.word_length:
+            raise ValueError(f"Target word and guess must be {self.word_length} letters long.")
 
         target_word = target_word.lower()
         guess = guess.lower()
+        if self.feedback_matrix is not None:
+            pattern = self.feedback_matrix.lookup(target_word, guess)
+            if pattern is not None:
+                return pattern
 
-        feedback = [self.INCORRECT] * 5  # Initialize feedback with INCORRECT
-        target_counts = Counter(target_word)
-        guess_letters = list(guess)
+        code = 0 # Every position starts as INCORRECT (digit 0)
+        target_counts = {} # Target letters not matched in pass 1
 
         # Pass 1: Check for correct position (*)
-        for i in range(5):
-            if guess_letters[i] == target_word[i]:
-                feedback[i] = self.CORRECT_POSITION
-                target_counts[guess_letters[i]] -= 1
-                # Mark guess letter as processed for correct position
-                # We don't set to None anymore, rely on feedback array state
-
-        # Pass 2: Check for wrong position (+)
-        for i in range(5):
-            # Only check letters not already marked as correct position
-            if feedback[i] == self.CORRECT_POSITION:
-                continue
-
-            current_guess_char = guess_letters[i]
-            if target_counts[current_guess_char] > 0:
-                feedback[i] = self.WRONG_POSITION
-                target_counts[current_guess_char] -= 1
-            # No else needed, defaults to INCORRECT if not CORRECT or WRONG position
-
-        return feedback
+        for target_char, guess_char, weight in zip(target_word, guess, self._weights):
+            if guess_char == target_char:
+                code += 2 * weight
+            else:
+                target_counts[target_char] = target_counts.get(target_char, 0) + 1
+
+        # Pass 2: Check for wrong position (+), consuming leftover target letters.
+        # Skipped entirely for an exact match.
+        if target_counts:
+            for target_char, guess_char, weight in zip(target_word, guess, self._weights):
+                if guess_char != target_char and target_counts.get(guess_char, 0) > 0:
+                    code += weight
+                    target_counts[guess_char] -= 1
+
+        if self.word_length == fb.WORD_LENGTH:
+            return FeedbackPattern.of(code)
+        return code
+
+    @staticmethod
+    def encode_words(words, word_length=5):
+        """Encodes words as a (n, word_length) uint8 array of letter indices (a=0 .. z=25).
+
+        Args:
+            words (list[str]): Alphabetic words of word_length letters, any case.
+            word_length (int): Expected length of every word.
+
+        Returns:
+            numpy.ndarray: Array of shape (len(words), word_length), dtype uint8.
+        """
+        if np is None:
+            raise ImportError("numpy is required for batch evaluation.")
+        words = list(words)
+        if any(len(word) != word_length for word in words):
+            raise ValueError(f"All words must be {word_length} letters long.")
+        encoded = np.frombuffer("".join(words).lower().encode("ascii"), dtype=np.uint8)
+        return (encoded - ord("a")).reshape(len(words), word_length)
+
+    def _code_dtype(self):
+        # 3**5 = 243 codes fit a uint8; 6+ letter words need uint16
+        return np.uint8 if 3 ** self.word_length <= 256 else np.uint16
+
+    def evaluate_batch(self, targets, guesses):
+        """Evaluates encoded guesses against encoded targets in one vectorized pass.
+
+        Gives exactly the same feedback as evaluate_pattern (including its
+        duplicate-letter rules), as raw base-3 codes (FeedbackPattern ids for
+        5-letter words).
+
+        Args:
+            targets (numpy.ndarray): (n, word_length) encoded target words (see encode_words).
+            guesses (numpy.ndarray): (word_length,) one encoded guess scored against
+                                     every target, or (n, word_length) one guess per target.
+
+        Returns:
+            numpy.ndarray: (n,) feedback codes; uint8 up to 5 letters, uint16 above.
+        """
+        if np is None:
+            raise ImportError("numpy is required for batch evaluation.")
+        length = self.word_length
+        targets = np.asarray(targets, dtype=np.uint8)
+        guesses = np.asarray(guesses, dtype=np.uint8)
+        if targets.ndim != 2 or targets.shape[1] != length:
+            raise ValueError(f"Targets must be an (n, {length}) array of encoded words.")
+        if guesses.shape != targets.shape and guesses.shape != (length,):
+            raise ValueError("Guesses must be a single encoded word or match the targets' shape.")
+        if targets.max(initial=0) > 25 or guesses.max(initial=0) > 25:
+            raise ValueError("Encoded letters must be in the range 0..25.")
+        if guesses.ndim == 1:
+            return self._evaluate_one_guess(targets, guesses)
+
+        # matches[n, i, k]: guess letter i equals target letter k
+        matches = guesses[:, :, None] == targets[:, None, :]
+        correct = targets == guesses
+
+        # Pass 1: copies of each guess letter left in the target after
+        # correct positions are taken out
+        available = (matches & ~correct[:, None, :]).sum(axis=2, dtype=np.int8)
+
+        # Pass 2: left to right, a guess letter is in the wrong position if
+        # earlier guess positions with the same letter haven't used up its copies
+        same_letter = guesses[:, :, None] == guesses[:, None, :]
+        wrong_position = np.zeros(targets.shape, dtype=bool)
+        for i in range(length):
+            used = (same_letter[:, i, :i] & wrong_position[:, :i]).sum(axis=1, dtype=np.int8)
+            wrong_position[:, i] = ~correct[:, i] & (available[:, i] > used)
+
+        dtype = self._code_dtype()
+        digits = np.where(correct, 2, wrong_position).astype(dtype)
+        return (digits * np.array(self._weights, dtype=dtype)).sum(axis=1, dtype=dtype)
+
+    def _evaluate_one_guess(self, targets, guess):
+        """evaluate_batch for a single guess; works letter by letter on whole columns."""
+        columns = np.ascontiguousarray(targets.T) # (word_length, n): one row per position
+        correct = columns == guess[:, None]
+        dtype = self._code_dtype()
+        codes = np.zeros(len(targets), dtype=dtype)
+        guess = guess.tolist()
+        for letter in set(guess):
+            positions = [i for i, guess_letter in enumerate(guess) if guess_letter == letter]
+            # Pass 1: copies of this letter left in each target after correct positions
+            available = (columns == letter).sum(axis=0, dtype=np.int8)
+            for i in positions:
+                available -= correct[i]
+            # Pass 2: hand the leftover copies to the other positions, left to right
+            for i in positions:
+                wrong_position = ~correct[i] & (available > 0)
+                if i != positions[-1]:
+                    available -= wrong_position
+                codes += correct[i] * dtype(2 * self._weights[i])
+                codes += wrong_position * dtype(self._weights[i])
+        return codes
 
 # Example Usage (for testing)
 if __name__ == '__main__':
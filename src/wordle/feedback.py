@@ -0,0 +1,113 @@
+from functools import lru_cache
+
+CORRECT_POSITION = "*"  # Symbol for correct letter in correct position
+WRONG_POSITION = "+"    # Symbol for correct letter in wrong position
+INCORRECT = "_"        # Symbol for incorrect letter
+
+# Base-3 digit of each symbol. Position i contributes digit * 3**i, so a
+# 5-letter feedback list packs into one id in 0..242 (fits a uint8).
+FEEDBACK_DIGITS = {INCORRECT: 0, WRONG_POSITION: 1, CORRECT_POSITION: 2}
+WORD_LENGTH = 5
+PATTERN_COUNT = 3 ** WORD_LENGTH
+POSITION_WEIGHTS = tuple(3 ** i for i in range(WORD_LENGTH))
+
+_DIGIT_SYMBOLS = {digit: symbol for symbol, digit in FEEDBACK_DIGITS.items()}
+
+
+class FeedbackPattern(int):
+    """Feedback for one guess, packed into a base-3 integer (0..242).
+
+    It is an int, so it compares, hashes and serializes (JSON, sessions) like
+    a small integer. Use from_symbols/to_symbols to convert to and from the
+    '*', '+', '_' symbol lists shown to players.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, value):
+        if not 0 <= value < PATTERN_COUNT:
+            raise ValueError(f"Feedback pattern id must be in 0..{PATTERN_COUNT - 1}, got {value}.")
+        return super().__new__(cls, value)
+
+    @classmethod
+    def of(cls, value):
+        """Returns the shared instance for a pattern id (no allocation)."""
+        return _PATTERNS[value]
+
+    @classmethod
+    def from_symbols(cls, symbols):
+        """Converts a feedback symbol list (or string) like ['*', '+', '_', '_', '*']."""
+        try:
+            return _PATTERNS_BY_SYMBOLS["".join(symbols)]
+        except (KeyError, TypeError):
+            raise ValueError(f"Not a 5-symbol feedback list: {symbols!r}") from None
+
+    def to_symbols(self):
+        """Returns the feedback as a list of 5 symbols."""
+        return list(_SYMBOLS[self])
+
+    def correct_positions(self):
+        """Returns the positions whose letter was in the correct position."""
+        return _CORRECT_POSITIONS[self]
+
+    @property
+    def is_win(self):
+        """True when every letter is in the correct position."""
+        return self == PATTERN_COUNT - 1
+
+    def __str__(self):
+        return _SYMBOLS[self]
+
+    def __repr__(self):
+        return f"FeedbackPattern('{_SYMBOLS[self]}')"
+
+
+# Lookup tables for every pattern, built once at import
+_SYMBOLS = [
+    "".join(_DIGIT_SYMBOLS[(code // weight) % 3] for weight in POSITION_WEIGHTS)
+    for code in range(PATTERN_COUNT)
+]
+_CORRECT_POSITIONS = [
+    tuple(i for i, symbol in enumerate(symbols) if symbol == CORRECT_POSITION)
+    for symbols in _SYMBOLS
+]
+_PATTERNS = [FeedbackPattern(code) for code in range(PATTERN_COUNT)]
+_PATTERNS_BY_SYMBOLS = {symbols: _PATTERNS[code] for code, symbols in enumerate(_SYMBOLS)}
+
+WIN_PATTERN = _PATTERNS[PATTERN_COUNT - 1]
+
+
+def as_pattern(feedback):
+    """Normalizes stored feedback (a pattern id or a legacy symbol list) to a FeedbackPattern."""
+    if isinstance(feedback, int):
+        return _PATTERNS[feedback] if 0 <= feedback < PATTERN_COUNT else FeedbackPattern(feedback)
+    return FeedbackPattern.from_symbols(feedback)
+
+
+# --- Other word lengths (4-8 letter variants) ---
+# FeedbackPattern covers the standard 5-letter game; these helpers handle
+# plain base-3 codes of any length, building each length's table on first use.
+
+def position_weights(length):
+    """The base-3 weight of each position for words of `length` letters."""
+    return tuple(3 ** i for i in range(length))
+
+@lru_cache(maxsize=None)
+def _symbol_table(length):
+    return [
+        "".join(_DIGIT_SYMBOLS[(code // weight) % 3] for weight in position_weights(length))
+        for code in range(3 ** length)
+    ]
+
+def code_to_symbols(code, length):
+    """Converts a base-3 feedback code for a `length`-letter word to its symbol list."""
+    if not 0 <= code < 3 ** length:
+        raise ValueError(f"Feedback code must be in 0..{3 ** length - 1}, got {code}.")
+    return list(_symbol_table(length)[code])
+
+def symbols_to_code(symbols):
+    """Converts a feedback symbol list of any length to its base-3 code."""
+    try:
+        return sum(FEEDBACK_DIGITS[symbol] * 3 ** i for i, symbol in enumerate(symbols))
+    except KeyError:
+        raise ValueError(f"Unknown feedback symbol in {symbols!r}") from None
@@ -0,0 +1,144 @@
+import argparse
+import glob
+import hashlib
+import os
+from multiprocessing import Pool
+
+import numpy as np
+
+from .evaluator import Evaluator
+from .feedback import FeedbackPattern
+
+# Cached matrices live next to the word list, one file per word-list digest
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cache")
+FILE_PREFIX = "feedback_matrix_"
+ROWS_PER_TASK = 256
+
+
+def word_list_digest(words):
+    """Returns a hex digest identifying an ordered word list."""
+    return hashlib.sha256("\n".join(words).encode("ascii")).hexdigest()
+
+
+# --- Parallel build; workers receive the encoded targets once ---
+_worker_targets = None
+
+def _init_worker(targets):
+    global _worker_targets
+    _worker_targets = targets
+
+def _build_rows(bounds):
+    """Computes matrix rows [start, stop) in a worker process."""
+    start, stop = bounds
+    evaluator = Evaluator()
+    rows = np.empty((stop - start, len(_worker_targets)), dtype=np.uint8)
+    for row, guess in enumerate(_worker_targets[start:stop]):
+        rows[row] = evaluator.evaluate_batch(_worker_targets, guess)
+    return start, rows
+
+
+def build_feedback_matrix(words, out=None, processes=None):
+    """Computes the guess x target feedback matrix for `words`.
+
+    Args:
+        words (list[str]): The dictionary, in word-id order.
+        out (numpy.ndarray): Optional (n, n) uint8 array to fill (e.g. a memmap).
+        processes (int): Worker processes; defaults to the number of cores.
+
+    Returns:
+        numpy.ndarray: matrix[guess_id, target_id] is the FeedbackPattern id.
+    """
+    targets = Evaluator.encode_words(words)
+    if out is None:
+        out = np.empty((len(words), len(words)), dtype=np.uint8)
+    tasks = [(start, min(start + ROWS_PER_TASK, len(words)))
+             for start in range(0, len(words), ROWS_PER_TASK)]
+    processes = processes or os.cpu_count() or 1
+
+    if processes == 1 or len(tasks) <= 1:
+        _init_worker(targets)
+        for start, rows in map(_build_rows, tasks):
+            out[start:start + len(rows)] = rows
+    else:
+        with Pool(processes, initializer=_init_worker, initargs=(targets,)) as pool:
+            for start, rows in pool.imap_unordered(_build_rows, tasks):
+                out[start:start + len(rows)] = rows
+    return out
+
+
+class FeedbackMatrix:
+    """Precomputed feedback for every (guess, target) pair in a dictionary."""
+
+    def __init__(self, words, matrix):
+        """
+        Args:
+            words (list[str]): The dictionary the matrix was built for, in id order.
+            matrix (numpy.ndarray): (n, n) uint8 pattern ids, usually memory-mapped.
+        """
+        if matrix.shape != (len(words), len(words)):
+            raise ValueError("Feedback matrix shape does not match the word list.")
+        self.words = words
+        self.matrix = matrix
+        self._word_index = {word: i for i, word in enumerate(words)}
+
+    def word_id(self, word):
+        """Returns the matrix row/column of a lowercase word, or None."""
+        return self._word_index.get(word)
+
+    def lookup(self, target_word, guess):
+        """Returns the FeedbackPattern for two lowercase words, or None if either is unknown."""
+        target_id = self._word_index.get(target_word)
+        guess_id = self._word_index.get(guess)
+        if target_id is None or guess_id is None:
+            return None
+        return FeedbackPattern.of(int(self.matrix[guess_id, target_id]))
+
+
+def load_feedback_matrix(words, cache_dir=DEFAULT_CACHE_DIR, processes=None):
+    """Memory-maps the cached matrix for `words`, building and saving it first if needed.
+
+    The cache file is keyed by word_list_digest(words), so editing words.txt
+    produces a new key and the matrix is rebuilt. Matrices for other word
+    lists are removed from `cache_dir` when a new one is written.
+
+    Returns:
+        FeedbackMatrix: The matrix, backed by a read-only memory map.
+    """
+    words = list(words)
+    path = os.path.join(cache_dir, f"{FILE_PREFIX}{word_list_digest(words)}.npy")
+    if not os.path.exists(path):
+        os.makedirs(cache_dir, exist_ok=True)
+        # Build into a temp file and rename, so concurrent readers never see
+        # a partial matrix
+        tmp_path = f"{path}.tmp{os.getpid()}"
+        out = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.uint8,
+                                        shape=(len(words), len(words)))
+        build_feedback_matrix(words, out=out, processes=processes)
+        out.flush()
+        del out
+        os.replace(tmp_path, path)
+        for old_path in glob.glob(os.path.join(cache_dir, f"{FILE_PREFIX}*.npy")):
+            if old_path != path:
+                os.remove(old_path)
+    return FeedbackMatrix(words, np.load(path, mmap_mode="r"))
+
+
+def main():
+    """Builds (or verifies) the cached feedback matrix for the default word list."""
+    from .word_manager import WordManager
+
+    parser = argparse.ArgumentParser(description="Precompute the Wordle feedback matrix.")
+    parser.add_argument("-j", "--processes", type=int, default=None,
+                        help="Worker processes (default: one per core)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help=f"Where to store the matrix (default: {DEFAULT_CACHE_DIR})")
+    args = parser.parse_args()
+
+    words = WordManager().word_list
+    matrix = load_feedback_matrix(words, cache_dir=args.cache_dir, processes=args.processes)
+    print(f"Feedback matrix ready: {matrix.matrix.shape[0]} x {matrix.matrix.shape[1]} "
+          f"({matrix.matrix.nbytes / 1e6:.1f} MB) in {args.cache_dir}")
+
+
+if __name__ == "__main__":
+    main()
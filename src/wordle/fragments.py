@@ -0,0 +1,75 @@
+import threading
+from collections import OrderedDict
+
+from flask import request
+from markupsafe import Markup
+
+from .metrics import REGISTRY
+
+_LOOKUPS = REGISTRY.counter('wordle_fragment_cache_total', "Template fragment lookups, by result.", ['result'])
+_HIT, _MISS = _LOOKUPS.labels('hit'), _LOOKUPS.labels('miss')
+
+
+class FragmentCache:
+    """Rendered template fragments, reused across requests.
+
+    A fragment's output must depend only on its cache key: board rows are
+    keyed by (guess, feedback), page fragments by (name, difficulty, any
+    extra context, script root), the last because their links come from
+    url_for().
+    Entries are kept in a bounded LRU shared by every thread.
+    """
+
+    def __init__(self, jinja_env, capacity=4096):
+        """
+        Args:
+            jinja_env (Environment): The app's Jinja environment (app.jinja_env).
+            capacity (int): Most fragments kept; least recently used go first.
+        """
+        self.jinja_env = jinja_env
+        self.capacity = capacity
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, template_name, key, **context):
+        """Returns the cached fragment for `key`, rendering `template_name` with `context` on a miss."""
+        cache_key = (template_name, key)
+        with self._lock:
+            html = self._cache.get(cache_key)
+            if html is not None:
+                self._cache.move_to_end(cache_key)
+        if html is not None:
+            _HIT.inc()
+            return html
+        _MISS.inc()
+        html = Markup(self.jinja_env.get_template(template_name).render(**context))
+        with self._lock:
+            self._cache[cache_key] = html
+            if len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+        return html
+
+    def __len__(self):
+        return len(self._cache)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def board_row(self, guess, feedback):
+        """One row of the game board: the guess's tiles coloured by its feedback."""
+        key = feedback if isinstance(feedback, int) else tuple(feedback) # Legacy symbol lists
+        return self.render('fragments/board_row.html', (guess, key), guess=guess, feedback=feedback)
+
+    def page_fragment(self, name, difficulty, **context):
+        """A static part of the page (templates/fragments/<name>.html) for one difficulty.
+
+        Any extra context (e.g. allowed_hints) becomes part of the cache key.
+        """
+        key = (difficulty, request.script_root, *sorted(context.items()))
+        return self.render(f'fragments/{name}.html', key, difficulty=difficulty, **context)
+
+    def install(self, app):
+        """Makes board_row() and page_fragment() available to the app's templates."""
+        app.jinja_env.globals.update(board_row=self.board_row, page_fragment=self.page_fragment)
+        return self
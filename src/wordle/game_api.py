@@ -0,0 +1,259 @@
+import json
+import logging
+
+from .game_engine import DEFAULT_DIFFICULTY
+from .game_store import GameStore
+from .state_codec import describe_message
+from .stats_store import StatsStore
+from .target_scheduler import TargetScheduler
+
+# Game actions behind the JSON API, independent of the web framework: the
+# Flask routes (app.py) and the ASGI handlers (asgi.py) both call these with
+# the shared GameEngine and GameStore and the player's session dict. Each
+# action returns (HTTP status, JSON-serializable body).
+
+MAX_BATCH_MOVES = 1000 # Per bot API request
+
+
+def load_game_state(store, session):
+    """Returns the player's game state from the store, or None."""
+    if 'game_state' in session:
+        # Older sessions carried the whole game in the cookie; move it server-side
+        save_game_state(store, session, session.pop('game_state'))
+    game_id = session.get('game_id')
+    return store.get(game_id) if game_id else None
+
+def save_game_state(store, session, game_state):
+    """Stores the player's game state, giving them a game id if needed."""
+    if 'game_id' not in session:
+        session['game_id'] = GameStore.new_game_id()
+    store.put(session['game_id'], game_state)
+
+def clear_game_state(store, session):
+    """Ends the player's game."""
+    game_id = session.pop('game_id', None)
+    if game_id:
+        store.delete(game_id)
+
+def new_game_state(engine, session, difficulty):
+    """Starts a game, drawing its target from the player's no-repeat schedule kept in the session."""
+    scheduler = TargetScheduler.from_token(session.get('target_schedule'), engine.word_count)
+    game_state = engine.new_game(difficulty, scheduler)
+    session['target_schedule'] = scheduler.to_token()
+    return game_state
+
+
+def record_finished_game(stats, session, game_state):
+    """Adds a game that just ended to the player's statistics, giving them a player id if needed."""
+    if stats is None or not game_state.get('game_over'):
+        return
+    if 'player_id' not in session:
+        session['player_id'] = StatsStore.new_player_id()
+    stats.record(session['player_id'], game_state.get('difficulty', DEFAULT_DIFFICULTY),
+                 game_state['win'], len(game_state['guesses']))
+
+
+def _error(message, status):
+    return status, {'error': message}
+
+def _load_active_game(engine, store, session):
+    """Returns (game_state, None) for the player's game in progress, or (None, error)."""
+    if engine is None:
+        return None, _error("Word list not loaded.", 503)
+    game_state = load_game_state(store, session)
+    if game_state is None:
+        return None, _error("No active game.", 404)
+    if game_state.get('game_over', False):
+        return None, _error("The game is over.", 409)
+    return game_state, None
+
+def game(engine, store, session, params, new=False):
+    """The player's current game, started if there is none (or if `new`)."""
+    if engine is None:
+        return _error("Word list not loaded.", 503)
+    game_state = None if new else load_game_state(store, session)
+    if game_state is None:
+        game_state = new_game_state(engine, session, params.get('difficulty', DEFAULT_DIFFICULTY))
+        clear_game_state(store, session)
+        save_game_state(store, session, game_state)
+    return 200, engine.view(game_state)
+
+def guess(engine, store, session, params, stats=None):
+    """Plays params['guess']; returns its feedback and the fields it changed.
+
+    A game it ends is recorded in `stats` (a StatsStore), if given.
+    """
+    game_state, error = _load_active_game(engine, store, session)
+    if error:
+        return error
+    guess = str(params.get('guess', '')).upper()
+    feedback = engine.apply_guess(game_state, guess)
+    save_game_state(store, session, game_state)
+    if feedback is None:
+        logging.info("Rejected guess %s: %s", guess, game_state['message'],
+                     extra={'event': 'guess_rejected', 'guess': guess, 'reason': game_state['message']})
+        return 200, {'valid': False, 'message': describe_message(game_state)}
+    record_finished_game(stats, session, game_state)
+    logging.info("Guess %s: %s", guess, feedback,
+                 extra={'event': 'guess', 'guess': guess, 'feedback': str(feedback),
+                        'attempts_left': game_state['attempts_left'], 'game_over': game_state['game_over']})
+
+    delta = {
+        'valid': True,
+        'guess': guess,
+        'feedback': str(feedback),
+        'attempts_left': game_state['attempts_left'],
+        'message': describe_message(game_state),
+        'game_over': game_state['game_over'],
+        'win': game_state['win'],
+        'candidates_remaining': engine.count_candidates(game_state),
+    }
+    if game_state['game_over']:
+        delta['target_word'] = game_state['target_word']
+    return 200, delta
+
+def hint(engine, store, session):
+    """Uses a hint; returns the revealed position and letter (None if none was given)."""
+    game_state, error = _load_active_game(engine, store, session)
+    if error:
+        return error
+    position = engine.apply_hint(game_state)
+    save_game_state(store, session, game_state)
+    return 200, {
+        'position': position,
+        'letter': game_state['target_word'][position] if position is not None else None,
+        'hints_used': game_state.get('hints_used', 0),
+        'message': describe_message(game_state),
+    }
+
+def player_stats(stats, session):
+    """The player's statistics and every player's per difficulty."""
+    if stats is None:
+        return _error("Statistics are not enabled.", 503)
+    player_id = session.get('player_id')
+    return 200, {
+        'player': stats.player_stats(player_id) if player_id else None,
+        'difficulties': stats.difficulty_stats(),
+    }
+
+def leaderboard(stats, session, params):
+    """The top params['limit'] players (10 by default); the caller's own entry is marked."""
+    if stats is None:
+        return _error("Statistics are not enabled.", 503)
+    try:
+        limit = int(params.get('limit', 10))
+    except (TypeError, ValueError):
+        return _error("limit must be a number.", 400)
+    entries = stats.leaderboard(limit)
+    player_id = session.get('player_id')
+    for entry in entries:
+        entry['you'] = entry.pop('player') == player_id # Player ids stay private
+    return 200, {'leaderboard': entries}
+
+
+# --- Bot API ---
+# Automated players address games by id (the ids are unguessable, so holding
+# one is what authorizes playing it) and send many moves per request.
+
+def _batch_size(value, limit):
+    """Returns (size, None) for a count or list length within 1..limit, else (None, error)."""
+    size = value if isinstance(value, int) and not isinstance(value, bool) else None
+    if size is None or size < 1:
+        return None, _error("Expected a positive count or a non-empty list.", 400)
+    if size > limit:
+        return None, _error(f"At most {limit} per request.", 413)
+    return size, None
+
+def new_games(engine, store, params, limit=MAX_BATCH_MOVES):
+    """Starts params['count'] games at params['difficulty']; returns their ids.
+
+    Targets come from one fresh schedule, so a batch never repeats a word
+    until the dictionary is used up.
+    """
+    if engine is None:
+        return _error("Word list not loaded.", 503)
+    if not isinstance(params, dict):
+        return _error("Expected a JSON object.", 400)
+    count, error = _batch_size(params.get('count', 1), limit)
+    if error:
+        return error
+    difficulty = params.get('difficulty', DEFAULT_DIFFICULTY)
+    scheduler = TargetScheduler(engine.word_count)
+    game_ids = []
+    for _ in range(count):
+        game_id = GameStore.new_game_id()
+        store.put(game_id, engine.new_game(difficulty, scheduler))
+        game_ids.append(game_id)
+    return 200, {'game_ids': game_ids}
+
+def guess_batch(engine, store, params, limit=MAX_BATCH_MOVES):
+    """Plays params['moves'], a list of {"game_id": ..., "guess": ...}, in order.
+
+    All guesses are checked against the dictionary in one pass and all
+    playable ones are evaluated in one vectorized call; the moves are then
+    applied in order, so several moves on one game behave as if sent one at
+    a time. Each game is loaded and stored once.
+
+    Returns:
+        (status, body): On success body is an iterator of JSON text chunks,
+        {"results": [...]} with one result per move, for the front end to
+        stream; errors are the usual dicts.
+    """
+    if engine is None:
+        return _error("Word list not loaded.", 503)
+    if not isinstance(params, dict):
+        return _error("Expected a JSON object.", 400)
+    moves = params.get('moves')
+    _, error = _batch_size(len(moves) if isinstance(moves, list) else None, limit)
+    if error:
+        return error
+    game_ids = [move.get('game_id') if isinstance(move, dict) else None for move in moves]
+    game_ids = [game_id if isinstance(game_id, str) else None for game_id in game_ids] # Others: "No such game."
+    guesses = [str(move.get('guess', '')).upper() if isinstance(move, dict) else '' for move in moves]
+
+    states = {game_id: store.get(game_id) for game_id in set(game_ids) if game_id is not None}
+    errors = [engine.guess_error(guess) for guess in guesses] # One dictionary lookup pass
+    playable = [i for i, (game_id, error) in enumerate(zip(game_ids, errors))
+                if error is None and states.get(game_id) is not None and not states[game_id]['game_over']]
+    feedback = dict(zip(playable, engine.evaluate_many(
+        [states[game_ids[i]]['target_word'] for i in playable], [guesses[i] for i in playable])))
+
+    results, changed = [], set()
+    for i, (game_id, guess) in enumerate(zip(game_ids, guesses)):
+        game_state = states.get(game_id)
+        if game_state is None:
+            results.append({'game_id': game_id, 'error': "No such game."})
+        elif game_state['game_over']:
+            results.append({'game_id': game_id, 'error': "The game is over."})
+        elif errors[i] is not None:
+            engine.reject_guess(game_state, guess, errors[i])
+            results.append({'game_id': game_id, 'valid': False, 'message': describe_message(game_state)})
+        else:
+            engine.record_guess(game_state, guess, feedback[i])
+            result = {
+                'game_id': game_id,
+                'valid': True,
+                'guess': guess,
+                'feedback': str(feedback[i]),
+                'attempts_left': game_state['attempts_left'],
+                'game_over': game_state['game_over'],
+                'win': game_state['win'],
+            }
+            if game_state['game_over']:
+                result['target_word'] = game_state['target_word']
+            results.append(result)
+        if game_state is not None:
+            changed.add(game_id)
+    for game_id in changed:
+        store.put(game_id, states[game_id])
+    logging.info("Guess batch: %d moves, %d played", len(moves), len(playable),
+                 extra={'event': 'guess_batch', 'moves': len(moves), 'played': len(playable)})
+    return 200, _stream_results(results)
+
+def _stream_results(results, chunk_size=256):
+    """Serializes {"results": [...]} a few hundred results at a time."""
+    yield '{"results":['
+    for start in range(0, len(results), chunk_size):
+        chunk = ",".join(json.dumps(result, separators=(",", ":")) for result in results[start:start + chunk_size])
+        yield chunk if start == 0 else "," + chunk
+    yield ']}'
@@ -0,0 +1,230 @@
+import random
+import time
+
+from .candidates import CandidateIndex, CandidateSet
+from .compiled_words import CompiledWordList
+from .evaluator import Evaluator, np
+from .feedback import FeedbackPattern, as_pattern
+from .metrics import REGISTRY
+from .state_codec import describe_message
+
+# --- Define difficulty levels ---
+DIFFICULTY_SETTINGS = {
+    'easy': {'guesses': 8, 'hints': 2},
+    'medium': {'guesses': 6, 'hints': 1},
+    'hard': {'guesses': 6, 'hints': 0},
+    'pro': {'guesses': 5, 'hints': 0}
+}
+# Default difficulty
+DEFAULT_DIFFICULTY = 'medium'
+# ------------------------------------
+
+# --- Metrics (children cached: these are hit on every guess) ---
+_GUESS_RESULTS = REGISTRY.counter('wordle_guesses_total', "Guesses received, by validation result.", ['result'])
+_VALID, _NOT_A_WORD, _BAD_LENGTH, _NOT_ALPHA = (
+    _GUESS_RESULTS.labels(result) for result in ('valid', 'not_a_word', 'bad_length', 'not_alpha'))
+_VALIDATION_SECONDS = REGISTRY.histogram(
+    'wordle_validation_seconds', "Time to look a guess up in the dictionary.").labels()
+_EVALUATION_SECONDS = REGISTRY.histogram(
+    'wordle_evaluation_seconds', "Time to compute a guess's feedback.").labels()
+_BATCH_EVALUATION_SECONDS = REGISTRY.histogram(
+    'wordle_batch_evaluation_seconds', "Time to compute the feedback of a batch of guesses.").labels()
+# ------------------------------------
+
+
+class GameEngine:
+    """The web game's rules over a read-only dictionary shared by every request.
+
+    Everything is built in __init__ and never changed afterwards: the word
+    list is a tuple (or a mapped CompiledWordList), lookups go through a
+    frozenset, and the candidate bitsets are precomputed. Any number of
+    threads can use one engine without locks, and a server that builds it
+    before forking shares it with all of its workers.
+
+    Per-game data lives only in the state dicts passed in, and targets are
+    drawn from each player's own TargetScheduler.
+    """
+
+    def __init__(self, word_manager, evaluator=None):
+        """
+        Args:
+            word_manager (WordManager): A loaded dictionary; its words are
+                copied, so later changes to it do not affect the engine.
+            evaluator (Evaluator): Feedback evaluator; a plain one by default.
+        """
+        words = word_manager.word_list
+        if isinstance(words, CompiledWordList):
+            self.words = self._lookup = words # Read-only mapping, already hashed
+        else:
+            self.words = tuple(words)
+            self._lookup = frozenset(words)
+        if not self.words:
+            raise ValueError("Cannot run games without any words.")
+        self.candidate_index = CandidateIndex(self.words)
+        self.evaluator = evaluator or Evaluator()
+
+    @property
+    def word_count(self):
+        return len(self.words)
+
+    def is_valid_word(self, word):
+        """Checks if a word (any case) is in the dictionary."""
+        return word.lower() in self._lookup
+
+    def draw_target_word(self, scheduler):
+        """Draws a player's next target (uppercase) from their TargetScheduler."""
+        return self.words[scheduler.next_id()].upper()
+
+    def new_game(self, difficulty, scheduler):
+        """Starts a game with a freshly drawn target at the given difficulty."""
+        if difficulty not in DIFFICULTY_SETTINGS:
+            difficulty = DEFAULT_DIFFICULTY
+        difficulty_config = DIFFICULTY_SETTINGS[difficulty]
+        return {
+            'target_word': self.draw_target_word(scheduler),
+            'guesses': [],
+            'feedback': [],
+            'attempts_left': difficulty_config['guesses'],
+            'message': 'first_guess',
+            'game_over': False,
+            'win': False,
+            'difficulty': difficulty,
+            'allowed_hints': difficulty_config['hints'],
+            'hints_used': 0
+        }
+
+    def apply_guess(self, game_state, guess):
+        """Plays an (uppercase) guess against a game state, updating it in place.
+
+        Returns:
+            FeedbackPattern: The guess's feedback, or None if the guess was
+                             rejected (the state's message says why).
+        """
+        # --- Input Validation ---
+        start = time.perf_counter()
+        error = self.guess_error(guess)
+        _VALIDATION_SECONDS.observe(time.perf_counter() - start)
+        if error is not None:
+            self.reject_guess(game_state, guess, error)
+            return None
+        # ------------------------
+
+        target = game_state['target_word'] # Already uppercase
+        with _EVALUATION_SECONDS.time():
+            feedback = self.evaluator.evaluate_pattern(target, guess)
+        self.record_guess(game_state, guess, feedback)
+        return feedback
+
+    def guess_error(self, guess):
+        """Why an (uppercase) guess is not playable: a message key, or None if it is."""
+        if len(guess) != 5:
+            _BAD_LENGTH.inc()
+            return 'bad_length'
+        if not (guess.isascii() and guess.isalpha()): # The codec and the dictionary are A-Z only
+            _NOT_ALPHA.inc()
+            return 'not_alpha'
+        if not self.is_valid_word(guess):
+            _NOT_A_WORD.inc()
+            return 'not_a_word'
+        _VALID.inc()
+        return None
+
+    @staticmethod
+    def reject_guess(game_state, guess, error):
+        """Sets a game's message for a guess that guess_error() turned down."""
+        game_state['message'] = error
+        if error == 'not_a_word':
+            game_state['message_arg'] = guess
+
+    def evaluate_many(self, targets, guesses):
+        """Feedback for many (target, guess) pairs of valid words, in one vectorized pass if numpy is available.
+
+        Returns:
+            list[FeedbackPattern]: One pattern per pair, as evaluate_pattern() gives.
+        """
+        if not targets:
+            return []
+        with _BATCH_EVALUATION_SECONDS.time():
+            if np is None:
+                return [self.evaluator.evaluate_pattern(target, guess) for target, guess in zip(targets, guesses)]
+            codes = self.evaluator.evaluate_batch(Evaluator.encode_words(targets), Evaluator.encode_words(guesses))
+            return [FeedbackPattern.of(code) for code in codes.tolist()]
+
+    @staticmethod
+    def record_guess(game_state, guess, feedback):
+        """Adds a valid guess and its feedback to a game state, ending the game on a win or the last try."""
+        game_state['guesses'].append(guess)
+        game_state['feedback'].append(int(feedback)) # Stored as a pattern id (0..242)
+        game_state['attempts_left'] -= 1
+
+        # --- Check Win/Loss Conditions ---
+        if feedback.is_win:
+            game_state['win'] = True
+            game_state['game_over'] = True
+            game_state['message'] = 'win'
+        elif game_state['attempts_left'] <= 0:
+            game_state['game_over'] = True
+            game_state['message'] = 'loss'
+        else:
+            game_state['message'] = 'next_guess'
+        # -------------------------
+
+    def apply_hint(self, game_state):
+        """Reveals one letter of the target if the game's hint allowance permits.
+
+        Returns:
+            int: The revealed position, or None if no hint was given (the
+                 state's message says why).
+        """
+        # Check if hints are allowed for this difficulty
+        allowed_hints = game_state.get('allowed_hints', 0)
+        if allowed_hints <= 0:
+            game_state['message'] = 'hints_disabled'
+            return None
+
+        # Check if player has used all available hints
+        hints_used = game_state.get('hints_used', 0)
+        if hints_used >= allowed_hints:
+            game_state['message'] = 'hints_used_up'
+            return None
+
+        # Find positions that haven't been correctly guessed yet
+        revealed_positions = set()
+        for guess_feedback in game_state.get('feedback', []):
+            revealed_positions.update(as_pattern(guess_feedback).correct_positions())
+        unrevealed_positions = [i for i in range(5) if i not in revealed_positions]
+
+        if not unrevealed_positions:
+            # All positions have been revealed already, which shouldn't happen
+            # but we handle it gracefully
+            game_state['message'] = 'no_new_hints'
+            return None
+
+        hint_position = random.choice(unrevealed_positions)
+        game_state['hints_used'] = hints_used + 1
+        game_state['message'] = 'hint'
+        game_state['message_arg'] = hint_position # The letter is looked up when rendering
+        return hint_position
+
+    def count_candidates(self, game_state):
+        """How many dictionary words are still consistent with the game's guesses."""
+        return CandidateSet.from_history(self.candidate_index, game_state.get('guesses', []),
+                                         game_state.get('feedback', [])).count
+
+    def view(self, game_state):
+        """The client's view of a game; the target is only revealed once the game is over."""
+        view = {
+            'guesses': game_state.get('guesses', []),
+            'feedback': [str(as_pattern(f)) for f in game_state.get('feedback', [])],
+            'attempts_left': game_state.get('attempts_left', 0),
+            'message': describe_message(game_state),
+            'game_over': game_state.get('game_over', False),
+            'win': game_state.get('win', False),
+            'difficulty': game_state.get('difficulty', DEFAULT_DIFFICULTY),
+            'allowed_hints': game_state.get('allowed_hints', 0),
+            'hints_used': game_state.get('hints_used', 0),
+            'candidates_remaining': self.count_candidates(game_state),
+        }
+        if view['game_over']:
+            view['target_word'] = game_state['target_word']
+        return view
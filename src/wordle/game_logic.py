@@ -1,6 +1,7 @@
 import random # Added for hint selection
 from .word_manager import WordManager
 from .evaluator import Evaluator
+from .candidates import CandidateSet
 
 class Game:
     """Manages the Wordle game loop, state, and user interaction.
@@ -40,10 +41,11 @@ class Game:
             self.word_manager = WordManager() # Assumes words.txt is in default location
             self.evaluator = Evaluator()
             self.target_word = self.word_manager.get_target_word()
-            self.guesses_history = [] # Stores tuples of (guess, feedback_list)
+            self.guesses_history = [] # Stores tuples of (guess, FeedbackPattern)
             self.remaining_guesses = self.MAX_GUESSES
             # self.hint_used = False # Replaced by hints_used_count
             self.hints_used_count = 0 # Track hints used
+            self.candidates = None # CandidateSet of words still possible; set up in run()
         except ValueError as e:
             print(f"Error initializing game: {e}")
             self.target_word = None # Prevent game from running if setup fails
@@ -66,7 +68,7 @@ class Game:
             return
         print("\n--- Guesses So Far ---")
         for i, (guess, feedback) in enumerate(self.guesses_history):
-            feedback_str = " ".join(feedback)
+            feedback_str = " ".join(feedback.to_symbols())
             guess_str = " ".join(list(guess.upper()))
             # Calculate dynamic padding based on the prefix length
             prefix = f"Guess {i+1}: "
@@ -82,9 +84,8 @@ class Game:
 
         known_correct_positions = [False] * len(self.target_word)
         for _, feedback in self.guesses_history:
-            for i, symbol in enumerate(feedback):
-                if symbol == self.evaluator.CORRECT_POSITION:
-                    known_correct_positions[i] = True
+            for i in feedback.correct_positions():
+                known_correct_positions[i] = True
 
         available_hint_indices = [
             i for i, known in enumerate(known_correct_positions)
@@ -154,27 +155,32 @@ class Game:
             return # Exit if setup failed
 
         self._display_welcome()
+        self.candidates = CandidateSet(self.word_manager.get_candidate_index())
         win = False
 
         while self.remaining_guesses > 0:
             self._display_history()
             guess = self._get_user_guess()
-            feedback = self.evaluator.evaluate_guess(self.target_word, guess)
+            feedback = self.evaluator.evaluate_pattern(self.target_word, guess)
             self.guesses_history.append((guess, feedback))
+            self.candidates.apply(guess, feedback)
             self.remaining_guesses -= 1
 
             # Display the latest guess immediately with correct alignment
             guess_display_str = " ".join(list(guess.upper()))
-            feedback_display_str = " ".join(feedback)
+            feedback_display_str = " ".join(feedback.to_symbols())
             # Calculate dynamic padding based on the prefix length
             prefix = f"Guess {self.MAX_GUESSES - self.remaining_guesses}: "
             padding = " " * len(prefix)
             print(f"{prefix}{guess_display_str}")
             print(f"{padding}{feedback_display_str}") # Apply dynamic padding
 
-            if feedback == [self.evaluator.CORRECT_POSITION] * 5:
+            if feedback.is_win:
                 win = True
                 break # Exit loop on win
+            if self.remaining_guesses > 0:
+                plural = "s" if self.candidates.count != 1 else ""
+                print(f"{self.candidates.count} possible word{plural} remaining.")
 
         self._display_result(win)
 
@@ -0,0 +1,240 @@
+import atexit
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+
+class GameStore:
+    """Server-side storage for web game states, keyed by an opaque game id.
+
+    Hot games live in a bounded in-memory LRU. Changes are written behind to
+    a local SQLite file: put() only marks a game dirty, and a background
+    thread writes all dirty games in one transaction every `flush_interval`
+    seconds (or sooner once `flush_batch` games are waiting). Games evicted
+    from the LRU stay readable from the dirty set until they are written.
+
+    States are kept encoded (immutable str/bytes) and decoded on every get(),
+    so each request works on its own copy and concurrent requests never
+    share a mutable dict.
+
+    A store created before the server forks (preloading) reconnects and
+    restarts its flush thread in each child process. When several processes
+    serve the same players, pass shared=True: every get() and put() then goes
+    straight to SQLite, so no process serves another's stale copy.
+    """
+
+    def __init__(self, db_path, capacity=1024, flush_interval=1.0, flush_batch=256,
+                 encode=None, decode=None, shared=False):
+        """
+        Args:
+            db_path (str): SQLite file (":memory:" works for tests).
+            capacity (int): Most games kept in memory.
+            flush_interval (float): Seconds between background writes; 0
+                disables the background thread (call flush() yourself).
+            flush_batch (int): Dirty games that trigger an early write.
+            encode (callable): Turns a state into the str or bytes stored in
+                SQLite; compact JSON by default.
+            decode (callable): Inverse of `encode`; may raise ValueError for
+                unreadable rows, which then count as missing games.
+            shared (bool): Other processes use the same database; disables the
+                in-memory cache and write-behind.
+        """
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.shared = shared
+        self.db_path = db_path
+        self._encode = encode or (lambda state: json.dumps(state, separators=(",", ":")))
+        self._decode = decode or json.loads
+        self._closed = False
+        self._start()
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS games ("
+            "game_id TEXT PRIMARY KEY, state TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        if shared:
+            self._db.execute("PRAGMA journal_mode=WAL") # Readers don't block the writer
+        self._db.commit()
+        atexit.register(self.close)
+        ref = weakref.ref(self)
+        os.register_at_fork(after_in_child=lambda: ref() is not None and ref()._start())
+
+    def _start(self):
+        """Sets up the per-process parts: connection, locks and flush thread.
+
+        Also runs in a forked child, where the inherited connection and
+        thread are unusable; the parent writes its own pending games.
+        """
+        self._cache = OrderedDict() # game_id -> encoded state, least recently used first
+        self._dirty = {} # game_id -> encoded state (None = deleted) waiting to be written
+        self._writing = {} # the batch currently being written
+        self._lock = threading.Lock() # Guards _cache, _dirty and _writing; held only briefly
+        self._db_lock = threading.Lock() # Serializes use of the SQLite connection
+        self._flush_lock = threading.Lock() # One batch in flight at a time
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._wake = threading.Event()
+        self._flusher = None
+        if self.flush_interval > 0 and not self.shared and not self._closed:
+            self._flusher = threading.Thread(target=self._flush_loop, name="game-store-flush", daemon=True)
+            self._flusher.start()
+
+    @staticmethod
+    def new_game_id():
+        """Returns a fresh, unguessable game id."""
+        return secrets.token_urlsafe(16)
+
+    def get(self, game_id):
+        """Returns a fresh copy of the state for a game id, or None if there is no such game."""
+        record = None
+        if not self.shared:
+            with self._lock:
+                record = self._cache.get(game_id)
+                if record is not None:
+                    self._cache.move_to_end(game_id)
+                else:
+                    for pending in (self._dirty, self._writing):
+                        if game_id in pending:
+                            record = pending[game_id] # Evicted but not written yet (None if deleted)
+                            if record is None:
+                                return None
+                            self._remember(game_id, record)
+                            break
+        if record is None:
+            with self._db_lock:
+                row = self._db.execute("SELECT state FROM games WHERE game_id = ?", (game_id,)).fetchone()
+            if row is None:
+                return None
+            record = row[0]
+            if not self.shared:
+                with self._lock:
+                    # Another request may have stored (and even written) a newer state while
+                    # we read; only cache the row if nothing newer is held in memory.
+                    for newer in (self._cache, self._dirty, self._writing):
+                        if game_id in newer:
+                            record = newer[game_id]
+                            if record is None:
+                                return None
+                            break
+                    else:
+                        self._remember(game_id, record)
+        try:
+            return self._decode(record)
+        except ValueError as e:
+            logging.error(f"Discarding unreadable game {game_id}: {e}")
+            return None
+
+    def put(self, game_id, state):
+        """Stores a game's state; it is written to SQLite in the next batch.
+
+        Raises:
+            Whatever `encode` raises for a state it cannot store.
+        """
+        record = self._encode(state)
+        if self.shared:
+            self._write({game_id: record})
+            return
+        with self._lock:
+            self._remember(game_id, record)
+            self._dirty[game_id] = record
+            wake = len(self._dirty) >= self.flush_batch
+        if wake:
+            self._wake.set()
+
+    def delete(self, game_id):
+        """Forgets a game."""
+        if self.shared:
+            self._write({game_id: None})
+            return
+        with self._lock:
+            self._cache.pop(game_id, None)
+            self._dirty[game_id] = None
+
+    def _remember(self, game_id, record):
+        """Adds to the LRU (caller holds _lock), evicting the oldest games."""
+        self._cache[game_id] = record
+        self._cache.move_to_end(game_id)
+        while len(self._cache) > self.capacity:
+            self._cache.popitem(last=False)
+
+    def flush(self):
+        """Writes every dirty game to SQLite in one transaction; returns how many."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._dirty = self._dirty, {}
+                self._writing = pending
+            try:
+                return self._write(pending)
+            except sqlite3.Error:
+                with self._lock:
+                    for game_id, record in pending.items():
+                        self._dirty.setdefault(game_id, record) # Keep for the next attempt
+                raise
+            finally:
+                with self._lock:
+                    self._writing = {}
+
+    def _write(self, pending):
+        if not pending:
+            return 0
+        now = time.time()
+        rows = [(game_id, record, now) for game_id, record in pending.items() if record is not None]
+        deleted = [(game_id,) for game_id, record in pending.items() if record is None]
+        with self._db_lock, self._db:
+            self._db.executemany("INSERT OR REPLACE INTO games VALUES (?, ?, ?)", rows)
+            self._db.executemany("DELETE FROM games WHERE game_id = ?", deleted)
+        return len(rows) + len(deleted)
+
+    def pending_count(self):
+        """How many changed games are waiting to be written."""
+        with self._lock:
+            return len(self._dirty) + len(self._writing)
+
+    def cached_count(self):
+        """How many games are held in memory."""
+        return len(self._cache)
+
+    def count(self, updated_within=None):
+        """How many games are stored, optionally only those updated in the last `updated_within` seconds.
+
+        Games still waiting to be written are not included.
+        """
+        if updated_within is None:
+            query, params = "SELECT COUNT(*) FROM games", ()
+        else:
+            query, params = "SELECT COUNT(*) FROM games WHERE updated_at >= ?", (time.time() - updated_within,)
+        with self._db_lock:
+            return self._db.execute(query, params).fetchone()[0]
+
+    def prune(self, max_age_seconds):
+        """Deletes stored games not updated for `max_age_seconds`; returns how many."""
+        with self._db_lock, self._db:
+            cursor = self._db.execute("DELETE FROM games WHERE updated_at < ?",
+                                      (time.time() - max_age_seconds,))
+        return cursor.rowcount
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                logging.error(f"Game store flush failed: {e}")
+
+    def close(self):
+        """Writes any pending games and stops the background thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        with self._db_lock:
+            self._db.close()
@@ -0,0 +1,186 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+import weakref
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from .metrics import REGISTRY
+
+DEFAULT_QUEUE_SIZE = 10000
+
+_DROPPED = REGISTRY.counter('wordle_log_records_dropped_total', "Log records not written, by reason.", ['reason'])
+_QUEUE_FULL, _SAMPLED = _DROPPED.labels('queue_full'), _DROPPED.labels('sampled')
+
+# Attributes every LogRecord has; anything else on a record came from `extra=`
+_RECORD_ATTRIBUTES = frozenset(logging.makeLogRecord({}).__dict__) | {'message', 'asctime', 'taskName'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one line of JSON.
+
+    Besides time, level, logger and message, every field passed with
+    `extra=` becomes a key of its own, e.g.
+        logging.info("Guess %s", guess, extra={'event': 'guess', 'guess': guess})
+    """
+
+    def format(self, record):
+        payload = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES:
+                payload[key] = value
+        if record.exc_info:
+            payload['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class AsyncLogHandler(QueueHandler):
+    """Queues records for a background thread instead of writing them in the caller.
+
+    The queue is bounded: when it is full the record is dropped (and
+    counted) rather than blocking the request, and a warning with the
+    number of records lost is queued as soon as there is room again.
+
+    Records whose `event` has a sample rate below 1 are kept with that
+    probability (and carry `sample_rate`, so counts can be scaled back up);
+    warnings and errors are always kept.
+
+    Formatting happens on the writer thread, so log arguments should be
+    values that don't change afterwards (strings, numbers), not live state.
+    """
+
+    def __init__(self, maxsize=DEFAULT_QUEUE_SIZE, sample_rates=None):
+        super().__init__(queue.Queue(maxsize))
+        self.sample_rates = dict(sample_rates or {})
+        self.dropped = 0 # Lost to a full queue, over the handler's lifetime
+        self._unreported = 0
+        self._drop_lock = threading.Lock()
+
+    def prepare(self, record):
+        return record # Formatted later, on the listener's thread
+
+    def emit(self, record):
+        rate = self.sample_rates.get(getattr(record, 'event', None))
+        if rate is not None and rate < 1 and record.levelno < logging.WARNING:
+            if random.random() >= rate:
+                _SAMPLED.inc()
+                return
+            record.sample_rate = rate
+        if self._unreported:
+            self._report_drops()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _QUEUE_FULL.inc()
+            with self._drop_lock:
+                self.dropped += 1
+                self._unreported += 1
+
+    def _report_drops(self):
+        with self._drop_lock:
+            count, self._unreported = self._unreported, 0
+        summary = logging.makeLogRecord({
+            'name': __name__, 'levelno': logging.WARNING, 'levelname': 'WARNING',
+            'msg': "Dropped %d log records: the log queue was full", 'args': (count,),
+            'event': 'log_records_dropped', 'dropped': count,
+        })
+        try:
+            self.queue.put_nowait(summary)
+        except queue.Full:
+            with self._drop_lock:
+                self._unreported += count
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel) # Wait for room: the queue may be full when stopping
+
+
+class LogPipeline:
+    """Routes the root logger through an AsyncLogHandler to a JSON stream writer.
+
+    A pipeline set up before the server forks restarts its writer thread
+    (with a fresh queue) in each child process.
+    """
+
+    def __init__(self, level=logging.INFO, stream=None, sample_rates=None, queue_size=DEFAULT_QUEUE_SIZE):
+        self.handler = AsyncLogHandler(queue_size, sample_rates)
+        self.writer = logging.StreamHandler(stream if stream is not None else sys.stderr)
+        self.writer.setFormatter(JsonFormatter())
+        self.level = level
+        self._listener = None
+        self._start()
+        REGISTRY.gauge('wordle_log_queue_depth', "Log records waiting to be written.",
+                       lambda: self.handler.queue.qsize())
+        atexit.register(self.stop)
+        ref = weakref.ref(self)
+        os.register_at_fork(after_in_child=lambda: ref() is not None and ref()._start())
+
+    def _start(self):
+        """Starts the writer thread (again, after a fork) on an empty queue."""
+        self.handler.queue = queue.Queue(self.handler.queue.maxsize)
+        self.handler._unreported = 0
+        self._listener = _Listener(self.handler.queue, self.writer, respect_handler_level=True)
+        self._listener.start()
+
+    def install(self, logger=None):
+        """Sends `logger`'s (default: the root logger's) records through the pipeline."""
+        logger = logger or logging.getLogger()
+        logger.addHandler(self.handler)
+        logger.setLevel(self.level)
+        return self
+
+    def stop(self):
+        """Writes every queued record, then stops the writer thread."""
+        if self._listener is not None and self._listener._thread is not None:
+            self._listener.stop()
+        self.writer.flush()
+
+
+def parse_sample_rates(text):
+    """Parses "event=rate,..." (e.g. "guess=0.1,page_view=0.5") into a dict."""
+    rates = {}
+    for item in (text or "").split(","):
+        if not item.strip():
+            continue
+        event, _, rate = item.partition("=")
+        try:
+            rates[event.strip()] = min(1.0, max(0.0, float(rate)))
+        except ValueError:
+            raise ValueError(f"Bad log sample rate {item.strip()!r}; expected event=rate") from None
+    return rates
+
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+def configure_logging(level=logging.INFO, sample_rates=None, queue_size=DEFAULT_QUEUE_SIZE, stream=None):
+    """Installs the process-wide pipeline on the root logger, like logging.basicConfig().
+
+    As with basicConfig(), nothing is installed if the root logger already
+    has handlers of its own (e.g. under a test runner). Calling it again
+    only updates the sample rates.
+
+    Returns:
+        LogPipeline: The installed pipeline, or None.
+    """
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is not None:
+            if sample_rates is not None:
+                _pipeline.handler.sample_rates = dict(sample_rates)
+            return _pipeline
+        if logging.getLogger().handlers:
+            return None
+        _pipeline = LogPipeline(level, stream, sample_rates, queue_size).install()
+        return _pipeline
@@ -0,0 +1,266 @@
+import threading
+import time
+from bisect import bisect_left
+
+# Latency buckets in seconds: 100µs .. 10s
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (16, 32, 64, 128, 256, 512, 1024, 2048, 4096) # Bytes
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Shards:
+    """Per-thread value storage: each thread writes only its own dict, without locks.
+
+    A lock is taken once per thread (to register its shard) and at scrape
+    time; shards of threads that have exited are folded into `retired` so
+    thread-per-connection servers don't grow the list forever.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._live = [] # (thread, values)
+        self._retired = {}
+
+    def values(self):
+        """This thread's dict of key -> number (counters) or list (histograms)."""
+        try:
+            return self._local.values
+        except AttributeError:
+            values = self._local.values = {}
+            with self._lock:
+                self._live.append((threading.current_thread(), values))
+            return values
+
+    def merged(self):
+        """Sums every shard into one dict (a consistent-enough snapshot)."""
+        with self._lock:
+            live = []
+            for thread, values in self._live:
+                if thread.is_alive():
+                    live.append((thread, values))
+                else:
+                    _add_into(self._retired, values)
+            self._live = live
+            total = {}
+            _add_into(total, self._retired)
+            for _, values in live:
+                _add_into(total, values.copy()) # dict.copy() is atomic under the GIL
+        return total
+
+
+def _add_into(total, values):
+    for key, value in values.items():
+        if isinstance(value, list):
+            existing = total.get(key)
+            if existing is None:
+                total[key] = list(value)
+            else:
+                for i, item in enumerate(value):
+                    existing[i] += item
+        else:
+            total[key] = total.get(key, 0) + value
+
+
+def _label_text(labelnames, labelvalues, extra=()):
+    pairs = list(zip(labelnames, labelvalues)) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+               for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, registry, name, documentation, labelnames):
+        self._shards = registry._shards
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock() # Guards adding children; lookups don't need it
+
+    def labels(self, *labelvalues):
+        """The child for one combination of label values (cache it on hot paths)."""
+        child = self._children.get(labelvalues)
+        if child is None:
+            if len(labelvalues) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labelvalues}")
+            with self._lock:
+                child = self._children.setdefault(labelvalues, self._child((self.name, labelvalues)))
+        return child
+
+    def _label_values(self):
+        """Every child's label values so far; safe while other threads add children."""
+        with self._lock:
+            return list(self._children)
+
+    def _header(self):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class _CounterChild:
+    __slots__ = ("_shards", "_key")
+
+    def __init__(self, shards, key):
+        self._shards = shards
+        self._key = key
+
+    def inc(self, amount=1):
+        values = self._shards.values()
+        values[self._key] = values.get(self._key, 0) + amount
+
+
+class Counter(_Metric):
+    """A monotonically increasing count, e.g. calls made."""
+    kind = "counter"
+
+    def _child(self, key):
+        return _CounterChild(self._shards, key)
+
+    def inc(self, amount=1):
+        """Increments the unlabelled counter."""
+        self.labels().inc(amount)
+
+    def render(self, merged):
+        lines = self._header()
+        for labelvalues in self._label_values():
+            value = merged.get((self.name, labelvalues), 0)
+            lines.append(f"{self.name}{_label_text(self.labelnames, labelvalues)} {value}")
+        return lines
+
+
+class _HistogramChild:
+    __slots__ = ("_shards", "_key", "_bounds")
+
+    def __init__(self, shards, key, bounds):
+        self._shards = shards
+        self._key = key
+        self._bounds = bounds
+
+    def observe(self, value):
+        values = self._shards.values()
+        counts = values.get(self._key)
+        if counts is None:
+            # One slot per bucket, one for +Inf, then the running sum
+            counts = values[self._key] = [0] * (len(self._bounds) + 2)
+        counts[bisect_left(self._bounds, value)] += 1
+        counts[-1] += value
+
+    def time(self):
+        """Context manager that observes the elapsed seconds of its block."""
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ("_child", "_start")
+
+    def __init__(self, child):
+        self._child = child
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._child.observe(time.perf_counter() - self._start)
+
+
+class Histogram(_Metric):
+    """Counts observations (e.g. latencies) into cumulative buckets."""
+    kind = "histogram"
+
+    def __init__(self, registry, name, documentation, labelnames, buckets):
+        super().__init__(registry, name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _child(self, key):
+        return _HistogramChild(self._shards, key, self.buckets)
+
+    def observe(self, value):
+        """Records one observation in the unlabelled histogram."""
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def render(self, merged):
+        lines = self._header()
+        for labelvalues in self._label_values():
+            counts = merged.get((self.name, labelvalues))
+            if counts is None:
+                continue
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                le = bound if bound == "+Inf" else repr(float(bound))
+                lines.append(f"{self.name}_bucket{_label_text(self.labelnames, labelvalues, [('le', le)])} "
+                             f"{cumulative}")
+            labels = _label_text(self.labelnames, labelvalues)
+            lines.append(f"{self.name}_sum{labels} {counts[-1]}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Gauge:
+    """A value read from a callback at scrape time, e.g. a queue length."""
+    kind = "gauge"
+
+    def __init__(self, name, documentation, callback):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+
+    def render(self, merged):
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}",
+                f"{self.name} {self.callback()}"]
+
+
+class Registry:
+    """A set of metrics rendered together in the Prometheus text format.
+
+    Recording only touches the calling thread's own shard; the shards are
+    summed when render() is called (i.e. when /metrics is scraped).
+    """
+
+    def __init__(self):
+        self._shards = _Shards()
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _add(self, name, factory):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        """Returns the counter called `name` (created on first use); by convention it ends in _total."""
+        return self._add(name, lambda: Counter(self, name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Returns the histogram called `name` (created on first use)."""
+        return self._add(name, lambda: Histogram(self, name, documentation, labelnames, buckets))
+
+    def gauge(self, name, documentation, callback):
+        """Registers (or replaces) a gauge whose value comes from callback()."""
+        with self._lock:
+            self._metrics[name] = Gauge(name, documentation, callback)
+
+    def render(self):
+        """The current values of every metric in the Prometheus text exposition format."""
+        merged = self._shards.merged()
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render(merged))
+        return "\n".join(lines) + "\n"
+
+
+# The process-wide registry the web app serves on /metrics
+REGISTRY = Registry()
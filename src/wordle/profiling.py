@@ -0,0 +1,181 @@
+import argparse
+import cProfile
+import glob
+import hmac
+import io
+import logging
+import os
+import pstats
+import random
+import re
+import threading
+import time
+
+PROFILE_HEADER = 'HTTP_X_WORDLE_PROFILE' # Sent as "X-Wordle-Profile: <token>"
+FILE_HEADER = 'X-Wordle-Profile-File'
+DEFAULT_KEEP = 200
+
+# Profile file names: <unix ms>-<method>-<path with "/" as ".">-<duration ms>ms.prof
+_FILE_NAME = re.compile(r"^\d+-(?P<method>[A-Z]+)-(?P<route>.*)-(?P<ms>\d+)ms\.prof$")
+
+
+class RequestProfiler:
+    """WSGI middleware that runs selected requests under cProfile.
+
+    A request is profiled when it carries the X-Wordle-Profile header with
+    the configured token, or at random with probability `sample_rate`.
+    Each profile is written to `directory` as a pstats file (only the
+    newest `keep` are kept), and the response names it in the
+    X-Wordle-Profile-File header.
+
+    cProfile can only profile one request at a time per process; a request
+    selected while another is being profiled runs unprofiled. Everything
+    else passes straight through.
+    """
+
+    def __init__(self, wsgi_app, directory, token=None, sample_rate=0.0, keep=DEFAULT_KEEP):
+        """
+        Args:
+            wsgi_app: The WSGI app to wrap (e.g. flask_app.wsgi_app).
+            directory (str): Where profiles are written; created if needed.
+            token (str): Secret the profiling header must match; without one,
+                the header is ignored.
+            sample_rate (float): Share of all requests to profile (0 = none).
+            keep (int): How many profile files to keep.
+        """
+        self.wsgi_app = wsgi_app
+        self.directory = directory
+        self.token = token
+        self.sample_rate = sample_rate
+        self.keep = keep
+        self._busy = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def wants_profile(self, environ):
+        requested = environ.get(PROFILE_HEADER)
+        if requested and self.token and hmac.compare_digest(requested, self.token):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def __call__(self, environ, start_response):
+        if not self.wants_profile(environ) or not self._busy.acquire(blocking=False):
+            return self.wsgi_app(environ, start_response)
+        try:
+            return self._profile(environ, start_response)
+        finally:
+            self._busy.release()
+
+    def _profile(self, environ, start_response):
+        response = {}
+
+        def capture_start_response(status, headers, exc_info=None):
+            response['start'] = (status, headers, exc_info)
+            return lambda data: response.setdefault('written', []).append(data)
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError: # Another profiler (e.g. a debugger's) is already active
+            return self.wsgi_app(environ, start_response)
+        start = time.perf_counter()
+        try:
+            result = self.wsgi_app(environ, capture_start_response)
+            try:
+                body = list(result) # Include producing the body in the profile
+            finally:
+                if hasattr(result, 'close'):
+                    result.close()
+        finally:
+            profiler.disable()
+            elapsed = time.perf_counter() - start
+        name = self._save(profiler, environ, elapsed)
+
+        status, headers, exc_info = response['start']
+        if name is not None:
+            headers = headers + [(FILE_HEADER, name)]
+        start_response(status, headers, exc_info)
+        return response.get('written', []) + body
+
+    def _save(self, profiler, environ, elapsed):
+        """Writes the profile and drops the oldest beyond `keep`; returns the file name."""
+        slug = re.sub(r"[^A-Za-z0-9_]+", ".", environ.get('PATH_INFO', '')).strip(".")
+        name = f"{int(time.time() * 1000)}-{environ.get('REQUEST_METHOD', 'GET')}-{slug}-{round(elapsed * 1000)}ms.prof"
+        try:
+            profiler.dump_stats(os.path.join(self.directory, name))
+            for old in profile_files(self.directory)[:-self.keep]:
+                os.remove(old)
+        except OSError as e:
+            logging.error(f"Could not save request profile {name}: {e}")
+            return None
+        return name
+
+
+def profile_files(directory):
+    """Profile files in `directory`, oldest first."""
+    return sorted(glob.glob(os.path.join(directory, "*.prof")), key=os.path.basename)
+
+
+def install_profiler(app):
+    """Wraps a Flask app's WSGI callable in a RequestProfiler if its config enables one.
+
+    Profiling is on when WORDLE_PROFILE_TOKEN or WORDLE_PROFILE_SAMPLE_RATE
+    is set; profiles go to WORDLE_PROFILE_DIR.
+
+    Returns:
+        RequestProfiler: The installed profiler, or None.
+    """
+    token = app.config.get('WORDLE_PROFILE_TOKEN')
+    sample_rate = float(app.config.get('WORDLE_PROFILE_SAMPLE_RATE') or 0)
+    if not token and sample_rate <= 0:
+        return None
+    profiler = RequestProfiler(app.wsgi_app, app.config['WORDLE_PROFILE_DIR'], token=token,
+                               sample_rate=sample_rate, keep=int(app.config.get('WORDLE_PROFILE_KEEP', DEFAULT_KEEP)))
+    app.wsgi_app = profiler
+    return profiler
+
+
+def hot_spot_report(files, sort='cumulative', limit=30):
+    """Merges profile files into one text report: requests per route, then the top functions.
+
+    Args:
+        files (list): pstats files written by RequestProfiler.
+        sort (str): pstats sort key, e.g. 'cumulative' or 'tottime'.
+        limit (int): How many functions to list.
+    """
+    routes = {}
+    for path in files:
+        match = _FILE_NAME.match(os.path.basename(path))
+        if match:
+            key = f"{match['method']} /{match['route'].replace('.', '/')}"
+            count, total = routes.get(key, (0, 0))
+            routes[key] = (count + 1, total + int(match['ms']))
+
+    out = io.StringIO()
+    out.write(f"{len(files)} profiled requests\n\n")
+    out.write(f"{'requests':>8} {'mean ms':>8}  route\n")
+    for route, (count, total) in sorted(routes.items(), key=lambda item: -item[1][1]):
+        out.write(f"{count:>8} {total / count:>8.1f}  {route}\n")
+    out.write("\n")
+    stats = pstats.Stats(*files, stream=out)
+    stats.strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+def main():
+    """Prints a hot-spot report over many captured request profiles."""
+    parser = argparse.ArgumentParser(description="Aggregate request profiles into one hot-spot report.")
+    parser.add_argument("directory", help="Directory of .prof files written by RequestProfiler")
+    parser.add_argument("--route", help="Only include profiles whose file name contains this (e.g. api.guess)")
+    parser.add_argument("--sort", default="cumulative", help="pstats sort key (default: cumulative)")
+    parser.add_argument("--limit", type=int, default=30, help="Functions to list (default: 30)")
+    args = parser.parse_args()
+
+    files = [path for path in profile_files(args.directory)
+             if args.route is None or args.route in os.path.basename(path)]
+    if not files:
+        parser.exit(1, f"No profiles found in {args.directory}\n")
+    print(hot_spot_report(files, args.sort, args.limit))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import threading
+
+from .evaluator import Evaluator
+from .word_manager import WordManager
+
+SUPPORTED_LENGTHS = range(4, 9) # 4 to 8 letter variants
+
+
+class ShardedWordIndex:
+    """One combined dictionary, split into per-length WordManager shards.
+
+    A shard is loaded the first time its length is requested, by streaming
+    the source files and keeping only words of that length, so memory only
+    grows for the word lengths actually in use.
+    """
+
+    def __init__(self, word_file_path="data/words.txt", lengths=SUPPORTED_LENGTHS):
+        """
+        Args:
+            word_file_path (str | list[str]): The combined word list(s); see WordManager.
+            lengths (Iterable[int]): The word lengths that may be requested.
+        """
+        self.word_file_path = word_file_path
+        self.lengths = frozenset(lengths)
+        self._shards = {} # length -> WordManager
+        self._evaluators = {} # length -> Evaluator
+        self._empty = set() # lengths with no words, so they aren't re-read every call
+        self._lock = threading.Lock() # Only taken while a shard is being loaded
+
+    def shard(self, length):
+        """Returns the WordManager for words of `length` letters, loading it on first use.
+
+        Raises:
+            ValueError: If the length is not supported or has no words.
+        """
+        shard = self._shards.get(length)
+        if shard is not None:
+            return shard
+        if length not in self.lengths:
+            raise ValueError(f"Word length {length} is not supported (choose from {sorted(self.lengths)}).")
+        with self._lock:
+            if length not in self._shards and length not in self._empty: # Not loaded by another thread meanwhile
+                try:
+                    self._shards[length] = WordManager(self.word_file_path, word_length=length)
+                except ValueError:
+                    self._empty.add(length)
+        if length in self._empty:
+            raise ValueError(f"The dictionary has no {length}-letter words.")
+        return self._shards[length]
+
+    def evaluator(self, length):
+        """Returns a shared Evaluator for `length`-letter words."""
+        evaluator = self._evaluators.get(length)
+        if evaluator is None:
+            evaluator = self._evaluators.setdefault(length, Evaluator(word_length=length))
+        return evaluator
+
+    def loaded_lengths(self):
+        """Returns the lengths whose shards are currently in memory."""
+        return sorted(self._shards)
+
+    def is_valid_word(self, word):
+        """Checks a word of any supported length against its shard."""
+        try:
+            return self.shard(len(word)).is_valid_word(word)
+        except ValueError:
+            return False
@@ -0,0 +1,192 @@
+import argparse
+import os
+from multiprocessing import Pool
+
+import numpy as np
+
+from .candidates import CandidateSet
+from .evaluator import Evaluator
+from .feedback import PATTERN_COUNT, FeedbackPattern
+
+METRICS = ("entropy", "expected_remaining")
+# Below this many (guess, candidate) evaluations the pool costs more than it saves
+PARALLEL_THRESHOLD = 2_000_000
+GUESSES_PER_TASK = 512
+
+
+def score_guesses(pattern_counts, metric):
+    """Scores guesses from how they split the remaining candidates.
+
+    Args:
+        pattern_counts (numpy.ndarray): (guesses, 243) number of candidates
+                                        giving each feedback pattern.
+        metric (str): "entropy" (bits of information, higher is better) or
+                      "expected_remaining" (candidates left on average, lower is better).
+
+    Returns:
+        numpy.ndarray: (guesses,) float scores.
+    """
+    counts = pattern_counts.astype(np.float64)
+    candidates = counts[0].sum() if len(counts) else 0
+    if metric == "expected_remaining":
+        return (counts ** 2).sum(axis=1) / candidates
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weighted = np.where(counts > 0, counts * np.log2(counts), 0.0)
+    return np.log2(candidates) - weighted.sum(axis=1) / candidates
+
+
+# --- Worker side: the word data is handed over once per worker process ---
+_worker_words = None
+_worker_matrix = None
+
+def _init_worker(encoded_words, matrix_path):
+    global _worker_words, _worker_matrix
+    _worker_words = encoded_words
+    # Workers map the cached matrix themselves, so its pages are shared
+    _worker_matrix = np.load(matrix_path, mmap_mode="r") if matrix_path else None
+
+def _pattern_counts(encoded_words, matrix, guess_ids, candidate_ids):
+    """Counts, for each guess, how many candidates give each feedback pattern."""
+    counts = np.empty((len(guess_ids), PATTERN_COUNT), dtype=np.int64)
+    if matrix is not None:
+        for row, guess_id in enumerate(guess_ids):
+            counts[row] = np.bincount(matrix[guess_id][candidate_ids], minlength=PATTERN_COUNT)
+        return counts
+    evaluator = Evaluator()
+    targets = encoded_words[candidate_ids]
+    for row, guess_id in enumerate(guess_ids):
+        patterns = evaluator.evaluate_batch(targets, encoded_words[guess_id])
+        counts[row] = np.bincount(patterns, minlength=PATTERN_COUNT)
+    return counts
+
+def _score_task(task):
+    start, stop, candidate_ids, metric = task
+    counts = _pattern_counts(_worker_words, _worker_matrix, range(start, stop), candidate_ids)
+    return start, score_guesses(counts, metric)
+
+
+class Solver:
+    """Recommends the most informative next guess for a game in progress.
+
+    Every dictionary word is scored as a guess against the candidates still
+    consistent with the history. Large searches are split across a process
+    pool; each worker receives the encoded dictionary once (or maps the
+    cached feedback matrix) and then only gets guess ranges to score.
+    """
+
+    def __init__(self, word_manager, feedback_matrix=None, processes=None):
+        """
+        Args:
+            word_manager (WordManager): Provides the dictionary and candidate index.
+            feedback_matrix (FeedbackMatrix): Optional precomputed matrix for the
+                same word list; turns evaluation into table lookups.
+            processes (int): Pool size for large searches; defaults to the number
+                of cores. 1 disables the pool.
+        """
+        self.word_manager = word_manager
+        self.words = word_manager.get_full_word_list()
+        self.encoded_words = Evaluator.encode_words(self.words)
+        self.feedback_matrix = feedback_matrix
+        self.processes = processes or os.cpu_count() or 1
+        self._pool = None
+        self._opening_cache = {} # metric -> ranking for an empty history
+
+    def rank_guesses(self, guesses=(), feedback=(), metric="entropy", top=10):
+        """Ranks next guesses for a history, best first.
+
+        Args:
+            guesses (list[str]): Guesses made so far.
+            feedback (list): Their feedback (FeedbackPattern ids or symbol lists).
+            metric (str): One of METRICS.
+            top (int): How many guesses to return.
+
+        Returns:
+            list[tuple[str, float]]: (guess, score) pairs.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}'. Choose from {', '.join(METRICS)}.")
+        if not guesses and metric in self._opening_cache:
+            return self._opening_cache[metric][:top]
+
+        candidates = CandidateSet.from_history(self.word_manager.get_candidate_index(), guesses, feedback)
+        candidate_ids = np.array(candidates.word_ids(), dtype=np.int64)
+        if len(candidate_ids) == 0:
+            return []
+
+        scores = self._score_all(candidate_ids, metric)
+        # Sort by score, preferring candidates (which might win) on ties
+        is_candidate = np.zeros(len(self.words), dtype=bool)
+        is_candidate[candidate_ids] = True
+        primary = -scores if metric == "entropy" else scores
+        order = np.lexsort((~is_candidate, primary))
+        ranking = [(self.words[i], float(scores[i])) for i in order[:max(top, 10)]]
+        if not guesses:
+            self._opening_cache[metric] = ranking
+        return ranking[:top]
+
+    def best_guess(self, guesses=(), feedback=(), metric="entropy"):
+        """Returns the single best next guess, or None if no word fits the history."""
+        ranking = self.rank_guesses(guesses, feedback, metric=metric, top=1)
+        return ranking[0][0] if ranking else None
+
+    def _score_all(self, candidate_ids, metric):
+        """Scores every dictionary word as a guess, in parallel for large searches."""
+        matrix = self.feedback_matrix.matrix if self.feedback_matrix is not None else None
+        work = len(self.words) * len(candidate_ids)
+        if self.processes == 1 or work < PARALLEL_THRESHOLD:
+            counts = _pattern_counts(self.encoded_words, matrix, range(len(self.words)), candidate_ids)
+            return score_guesses(counts, metric)
+
+        scores = np.empty(len(self.words), dtype=np.float64)
+        tasks = [(start, min(start + GUESSES_PER_TASK, len(self.words)), candidate_ids, metric)
+                 for start in range(0, len(self.words), GUESSES_PER_TASK)]
+        for start, chunk in self._get_pool().imap_unordered(_score_task, tasks):
+            scores[start:start + len(chunk)] = chunk
+        return scores
+
+    def _get_pool(self):
+        if self._pool is None:
+            matrix_path = getattr(self.feedback_matrix.matrix, "filename", None) if self.feedback_matrix else None
+            self._pool = Pool(self.processes, initializer=_init_worker,
+                              initargs=(self.encoded_words, matrix_path))
+        return self._pool
+
+    def close(self):
+        """Shuts down the worker pool, if one was started."""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def main():
+    """Prints the best next guesses for a history given as GUESS:FEEDBACK pairs."""
+    from .word_manager import WordManager
+
+    parser = argparse.ArgumentParser(description="Suggest the next Wordle guess.")
+    parser.add_argument("history", nargs="*", metavar="GUESS:FEEDBACK",
+                        help="Previous guesses with their feedback, e.g. crane:_+__*")
+    parser.add_argument("-m", "--metric", choices=METRICS, default="entropy")
+    parser.add_argument("-n", "--top", type=int, default=5, help="How many suggestions to show")
+    parser.add_argument("-j", "--processes", type=int, default=None, help="Worker processes")
+    args = parser.parse_args()
+
+    guesses, feedback = [], []
+    for entry in args.history:
+        guess, _, symbols = entry.partition(":")
+        guesses.append(guess)
+        feedback.append(FeedbackPattern.from_symbols(symbols))
+
+    with Solver(WordManager(), processes=args.processes) as solver:
+        for guess, score in solver.rank_guesses(guesses, feedback, metric=args.metric, top=args.top):
+            print(f"{guess.upper()}  {score:.3f}")
+
+
+if __name__ == "__main__":
+    main()
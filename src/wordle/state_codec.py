@@ -0,0 +1,171 @@
+import json
+import struct
+from functools import lru_cache
+
+from .feedback import PATTERN_COUNT, WORD_LENGTH, as_pattern
+
+CODEC_VERSION = 1
+# version, flags, attempts left, hints (allowed << 4 | used), guess count,
+# packed target, message code, message argument
+HEADER = struct.Struct("<BBBBBIBI")
+FLAG_GAME_OVER = 1
+FLAG_WIN = 2
+DIFFICULTY_SHIFT = 2 # Difficulty index lives in flag bits 2-3
+DIFFICULTIES = ("easy", "medium", "hard", "pro")
+DEFAULT_DIFFICULTY = "medium"
+
+# Status messages, stored as a key (plus one argument) and only turned into
+# text when the page is rendered. The order is the wire format: append only.
+MESSAGES = {
+    "first_guess": "Enter your first guess!",
+    "next_guess": "Enter your next guess.",
+    "win": "Congratulations! You guessed the word '{target}' in {tries} tries!",
+    "loss": "Game Over! You ran out of guesses. The word was '{target}'.",
+    "bad_length": "Guess must be exactly 5 letters long.",
+    "not_alpha": "Guess must contain only letters.",
+    "not_a_word": '"{word}" is not a valid word in the dictionary.',
+    "hints_disabled": "Hints are disabled for this difficulty level.",
+    "hints_used_up": "You have already used all your hints for this game.",
+    "no_new_hints": "No new hints available - you've already found all correct positions!",
+    "hint": "Hint: Letter at position {position} is '{letter}'.",
+}
+MESSAGE_KEYS = tuple(MESSAGES)
+MESSAGE_CODES = {key: code for code, key in enumerate(MESSAGE_KEYS)}
+WORD_ARGUMENT = "not_a_word" # Its argument is a packed word; "hint" takes a position
+
+
+@lru_cache(maxsize=65536)
+def pack_word(word):
+    """Packs a 5-letter A-Z word (any case) into 25 bits, 5 bits per letter."""
+    word = word.upper()
+    if len(word) != WORD_LENGTH or not (word.isascii() and word.isalpha()):
+        raise ValueError(f"Cannot pack '{word}': expected {WORD_LENGTH} letters A-Z.")
+    packed = 0
+    for i, letter in enumerate(word):
+        packed |= (ord(letter) - 65) << (5 * i)
+    return packed
+
+
+@lru_cache(maxsize=65536)
+def unpack_word(packed):
+    """Inverse of pack_word(); returns the uppercase word."""
+    return "".join(chr(65 + (packed >> (5 * i) & 31)) for i in range(WORD_LENGTH))
+
+
+@lru_cache(maxsize=64)
+def _guesses_struct(count):
+    """Packed guesses (u32 each) followed by their feedback ids (u8 each)."""
+    return struct.Struct(f"<{count}I{count}B")
+
+
+def default_message(game_state):
+    """The message key for a state's progress alone (used for legacy message text)."""
+    if game_state.get("win"):
+        return "win"
+    if game_state.get("game_over"):
+        return "loss"
+    return "next_guess" if game_state.get("guesses") else "first_guess"
+
+
+def describe_message(game_state):
+    """Renders a state's status message as display text.
+
+    Legacy states that still carry the text itself get it back unchanged.
+    """
+    key = game_state.get("message")
+    if key not in MESSAGES:
+        return key or "Enter your guess!"
+    target = game_state.get("target_word", "")
+    argument = game_state.get("message_arg")
+    if key == "hint":
+        return MESSAGES[key].format(position=argument + 1, letter=target[argument])
+    return MESSAGES[key].format(target=target, tries=len(game_state.get("guesses", [])), word=argument)
+
+
+def encode_state(game_state):
+    """Packs a web game state into a few bytes (14 + 5 per guess).
+
+    Missing fields take their defaults and legacy feedback symbol lists are
+    converted, so old dict-shaped states encode too.
+
+    Raises:
+        ValueError: If a word is not 5 letters A-Z or a count is out of range.
+    """
+    guesses = game_state.get("guesses", [])
+    feedback = [f if type(f) is int and 0 <= f < PATTERN_COUNT else int(as_pattern(f))
+                for f in game_state.get("feedback", [])]
+    if len(feedback) != len(guesses):
+        raise ValueError("Every guess needs exactly one feedback pattern.")
+
+    difficulty = game_state.get("difficulty", DEFAULT_DIFFICULTY)
+    difficulty_index = DIFFICULTIES.index(difficulty if difficulty in DIFFICULTIES else DEFAULT_DIFFICULTY)
+    flags = (FLAG_GAME_OVER if game_state.get("game_over") else 0) \
+        | (FLAG_WIN if game_state.get("win") else 0) \
+        | difficulty_index << DIFFICULTY_SHIFT
+    allowed_hints, hints_used = game_state.get("allowed_hints", 0), game_state.get("hints_used", 0)
+    if not (0 <= allowed_hints < 16 and 0 <= hints_used < 16):
+        raise ValueError("Hint counts must be between 0 and 15.")
+
+    key = game_state.get("message")
+    if key not in MESSAGE_CODES:
+        key = default_message(game_state)
+    argument = 0 # Any argument left over from an earlier message is dropped
+    if key == WORD_ARGUMENT:
+        argument = pack_word(game_state["message_arg"])
+    elif key == "hint":
+        argument = game_state["message_arg"]
+
+    try:
+        header = HEADER.pack(CODEC_VERSION, flags, max(0, game_state.get("attempts_left", 0)),
+                             allowed_hints << 4 | hints_used, len(guesses),
+                             pack_word(game_state.get("target_word", "")), MESSAGE_CODES[key], argument)
+        return header + _guesses_struct(len(guesses)).pack(*map(pack_word, guesses), *feedback)
+    except struct.error as e:
+        raise ValueError(f"Cannot encode game state: {e}") from e
+
+
+def decode_state(data):
+    """Unpacks encode_state() output into the dict the web app works with.
+
+    JSON text (how states were stored before this codec) is decoded as is.
+
+    Raises:
+        ValueError: If the data is truncated or from an unknown codec version.
+    """
+    if isinstance(data, str) or data[:1] == b"{":
+        return json.loads(data)
+    try:
+        (version, flags, attempts_left, hints, count,
+         target, code, argument) = HEADER.unpack_from(data)
+    except struct.error as e:
+        raise ValueError(f"Truncated game state: {e}") from e
+    if version != CODEC_VERSION:
+        raise ValueError(f"Unsupported game state version {version}.")
+    guesses_struct = _guesses_struct(count)
+    if len(data) != HEADER.size + guesses_struct.size or code >= len(MESSAGE_KEYS):
+        raise ValueError("Corrupt game state.")
+    values = guesses_struct.unpack_from(data, HEADER.size)
+    feedback = list(values[count:])
+    if any(f >= PATTERN_COUNT for f in feedback):
+        raise ValueError("Corrupt game state: feedback id out of range.")
+
+    key = MESSAGE_KEYS[code]
+    if key == "hint" and argument >= WORD_LENGTH:
+        raise ValueError("Corrupt game state: hint position out of range.")
+    state = {
+        "target_word": unpack_word(target),
+        "guesses": [unpack_word(guess) for guess in values[:count]],
+        "feedback": feedback,
+        "attempts_left": attempts_left,
+        "message": key,
+        "game_over": bool(flags & FLAG_GAME_OVER),
+        "win": bool(flags & FLAG_WIN),
+        "difficulty": DIFFICULTIES[flags >> DIFFICULTY_SHIFT & 3],
+        "allowed_hints": hints >> 4,
+        "hints_used": hints & 15,
+    }
+    if key == WORD_ARGUMENT:
+        state["message_arg"] = unpack_word(argument)
+    elif key == "hint":
+        state["message_arg"] = argument
+    return state
@@ -0,0 +1,179 @@
+// Plays guesses and hints through the JSON API (/api/guess, /api/hint), so
+// each move is a single request that updates the page in place. Without
+// JavaScript the form and hint link fall back to the redirecting routes.
+// Guesses the dictionary filter (/api/word-filter) rules out are rejected
+// without a request; the server still checks every guess it receives.
+(function () {
+    'use strict';
+
+    var FEEDBACK_CLASSES = {'*': 'correct-position', '+': 'wrong-position', '_': 'incorrect-letter'};
+    var wordFilter = null; // Set once /api/word-filter has loaded
+
+    function byId(id) {
+        return document.getElementById(id);
+    }
+
+    function setText(id, value) {
+        var element = byId(id);
+        if (element) {
+            element.textContent = value;
+        }
+    }
+
+    // Full page render: used when the game ends (to show the new-game
+    // choices) or when the API refuses the move (e.g. the game is gone)
+    function reloadPage() {
+        window.location.assign(byId('game-board').dataset.indexUrl);
+    }
+
+    function post(url, body) {
+        return fetch(url, {
+            method: 'POST',
+            credentials: 'same-origin',
+            headers: {'Content-Type': 'application/json', 'Accept': 'application/json'},
+            body: JSON.stringify(body || {})
+        }).then(function (response) {
+            return response.json().then(function (data) {
+                if (!response.ok) {
+                    throw new Error(data.error || response.statusText);
+                }
+                return data;
+            });
+        });
+    }
+
+    // Bloom filter built by src/wordle/word_filter.py; the hashing must match word_hashes() there
+    function fnv1a(word) {
+        var h = 0x811c9dc5;
+        for (var i = 0; i < word.length; i++) {
+            h = Math.imul(h ^ word.charCodeAt(i), 0x01000193);
+        }
+        return h >>> 0;
+    }
+
+    function fmix32(h) {
+        h ^= h >>> 16;
+        h = Math.imul(h, 0x85ebca6b);
+        h ^= h >>> 13;
+        h = Math.imul(h, 0xc2b2ae35);
+        return (h ^ (h >>> 16)) >>> 0;
+    }
+
+    function parseWordFilter(buffer) {
+        var view = new DataView(buffer);
+        var header = 16; // magic, hash count, word length, reserved, bit count, word count
+        if (String.fromCharCode(view.getUint8(0), view.getUint8(1), view.getUint8(2), view.getUint8(3)) !== 'WBF1') {
+            throw new Error('Unknown word filter format');
+        }
+        var hashCount = view.getUint8(4);
+        var wordLength = view.getUint8(5);
+        var bitCount = view.getUint32(8, true);
+        var bits = new Uint8Array(buffer, header);
+        return {
+            wordLength: wordLength,
+            mightContain: function (word) {
+                var h = fnv1a(word.toLowerCase());
+                var h1 = fmix32(h);
+                var h2 = (fmix32((h ^ 0x9e3779b9) >>> 0) | 1) >>> 0;
+                for (var i = 0; i < hashCount; i++) {
+                    var position = ((h1 + Math.imul(i, h2)) >>> 0) % bitCount;
+                    if (!(bits[position >> 3] >> (position & 7) & 1)) {
+                        return false;
+                    }
+                }
+                return true;
+            }
+        };
+    }
+
+    function loadWordFilter(url) {
+        fetch(url, {credentials: 'same-origin'}).then(function (response) {
+            if (!response.ok) {
+                throw new Error(response.statusText);
+            }
+            return response.arrayBuffer();
+        }).then(function (buffer) {
+            wordFilter = parseWordFilter(buffer);
+        }).catch(function () {
+            wordFilter = null; // Every guess goes to the server, as without the filter
+        });
+    }
+
+    // True if the filter proves the guess is not a word; anything else is left to the server
+    function certainlyNotAWord(guess) {
+        return wordFilter !== null && guess.length === wordFilter.wordLength &&
+            /^[a-z]+$/i.test(guess) && !wordFilter.mightContain(guess);
+    }
+
+    function addGuessRow(guess, feedback) {
+        var row = document.createElement('div');
+        row.className = 'guess-row';
+        for (var i = 0; i < guess.length; i++) {
+            var tile = document.createElement('span');
+            tile.className = 'tile ' + (FEEDBACK_CLASSES[feedback[i]] || '');
+            tile.textContent = guess[i];
+            row.appendChild(tile);
+        }
+        byId('game-board').appendChild(row);
+    }
+
+    function onGuess(event) {
+        var form = event.currentTarget;
+        var input = form.elements.guess;
+        event.preventDefault();
+        var guess = input.value.trim();
+        if (certainlyNotAWord(guess)) {
+            var board = byId('game-board');
+            setText('status-message', board.dataset.notAWord.replace('{word}', guess.toUpperCase()));
+            return;
+        }
+        post(form.dataset.api, {guess: input.value}).then(function (delta) {
+            setText('status-message', delta.message);
+            if (!delta.valid) {
+                return;
+            }
+            addGuessRow(delta.guess, delta.feedback);
+            input.value = '';
+            if (delta.game_over) {
+                reloadPage();
+                return;
+            }
+            setText('attempts-left', delta.attempts_left);
+            setText('candidates-remaining', delta.candidates_remaining);
+        }).catch(reloadPage);
+    }
+
+    function onHint(event) {
+        var link = event.currentTarget;
+        event.preventDefault();
+        post(link.dataset.api).then(function (delta) {
+            setText('status-message', delta.message);
+            setText('hints-used', delta.hints_used);
+            if (delta.hints_used >= Number(link.dataset.allowedHints)) {
+                var disabled = document.createElement('button');
+                disabled.className = 'hint-button';
+                disabled.disabled = true;
+                disabled.textContent = 'No Hints Left';
+                link.replaceWith(disabled);
+            }
+        }).catch(reloadPage);
+    }
+
+    document.addEventListener('DOMContentLoaded', function () {
+        var board = byId('game-board');
+        if (!window.fetch || !board) {
+            return;
+        }
+        if (board.dataset.wordFilter && window.DataView) {
+            loadWordFilter(board.dataset.wordFilter);
+        }
+        var form = byId('guess-form');
+        if (form) {
+            form.addEventListener('submit', onGuess);
+        }
+        var hint = byId('hint-button');
+        if (hint) {
+            hint.addEventListener('click', onHint);
+        }
+    });
+}());
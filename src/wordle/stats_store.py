@@ -0,0 +1,358 @@
+import atexit
+import bisect
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from .game_engine import DIFFICULTY_SETTINGS
+
+# A finished game's outcome: the number of guesses for a win, LOSS for a loss
+LOSS = 0
+MAX_OUTCOME = max(settings['guesses'] for settings in DIFFICULTY_SETTINGS.values())
+DEFAULT_LEADERBOARD_SIZE = 100
+
+_SCHEMA = (
+    # Every finished game, appended in batches; the tables below are kept in step with it
+    "CREATE TABLE IF NOT EXISTS finished_games ("
+    "player_id TEXT NOT NULL, difficulty TEXT NOT NULL, outcome INTEGER NOT NULL, finished_at REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS player_stats ("
+    "player_id TEXT PRIMARY KEY, played INTEGER NOT NULL, wins INTEGER NOT NULL, win_guesses INTEGER NOT NULL, "
+    "current_streak INTEGER NOT NULL, max_streak INTEGER NOT NULL, updated_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS player_rank ON player_stats (wins DESC, win_guesses ASC)",
+    "CREATE TABLE IF NOT EXISTS player_outcomes ("
+    "player_id TEXT NOT NULL, outcome INTEGER NOT NULL, count INTEGER NOT NULL, PRIMARY KEY (player_id, outcome))",
+    "CREATE TABLE IF NOT EXISTS outcome_totals ("
+    "difficulty TEXT NOT NULL, outcome INTEGER NOT NULL, count INTEGER NOT NULL, PRIMARY KEY (difficulty, outcome))",
+)
+# One finished game folded into the aggregates. In an UPDATE every column
+# still reads its old value, so the streak expressions see the old streak.
+_UPSERT_PLAYER = (
+    "INSERT INTO player_stats VALUES (?, 1, ?, ?, ?, ?, ?) ON CONFLICT (player_id) DO UPDATE SET "
+    "played = played + 1, wins = wins + excluded.wins, win_guesses = win_guesses + excluded.win_guesses, "
+    "current_streak = CASE WHEN excluded.wins THEN current_streak + 1 ELSE 0 END, "
+    "max_streak = MAX(max_streak, CASE WHEN excluded.wins THEN current_streak + 1 ELSE 0 END), "
+    "updated_at = excluded.updated_at"
+)
+_UPSERT_PLAYER_OUTCOME = ("INSERT INTO player_outcomes VALUES (?, ?, 1) "
+                          "ON CONFLICT (player_id, outcome) DO UPDATE SET count = count + 1")
+_UPSERT_TOTAL = ("INSERT INTO outcome_totals VALUES (?, ?, 1) "
+                 "ON CONFLICT (difficulty, outcome) DO UPDATE SET count = count + 1")
+_RANKED = ("SELECT player_id, played, wins, win_guesses FROM player_stats "
+           "WHERE wins > 0 ORDER BY wins DESC, win_guesses ASC LIMIT ?")
+
+
+def _new_player():
+    return {'played': 0, 'wins': 0, 'win_guesses': 0, 'current_streak': 0, 'max_streak': 0,
+            'outcomes': [0] * (MAX_OUTCOME + 1)}
+
+def _apply(player, outcome):
+    """Folds one finished game into a player's aggregates (in place)."""
+    player['played'] += 1
+    player['outcomes'][outcome] += 1
+    if outcome == LOSS:
+        player['current_streak'] = 0
+    else:
+        player['wins'] += 1
+        player['win_guesses'] += outcome
+        player['current_streak'] += 1
+        player['max_streak'] = max(player['max_streak'], player['current_streak'])
+
+def _rank_key(player_id, wins, win_guesses):
+    """Leaderboard order: most wins first, then fewest guesses over those wins."""
+    return (-wins, win_guesses, player_id)
+
+def _board_entry(rank, player_id, played, wins, win_guesses):
+    return {'rank': rank, 'player': player_id, 'played': played, 'wins': wins,
+            'win_rate': wins / played if played else 0.0,
+            'average_guesses': win_guesses / wins if wins else None}
+
+
+class StatsStore:
+    """Finished web games, with statistics kept up to date as they arrive.
+
+    record() appends a game and updates the in-memory aggregates at once; a
+    background thread writes the games, and the same changes to the
+    aggregate tables, to SQLite in one transaction every `flush_interval`
+    seconds (as GameStore does with game states). Nothing is ever
+    recomputed from the game log:
+
+    - per player: games, wins, streaks and guess distribution, held in a
+      bounded LRU and read from their own row on a miss (O(log n));
+    - per difficulty: the guess distribution and win rate (O(1));
+    - the top `leaderboard_size` players, kept sorted as scores change.
+      A player's rank key (wins, then fewest guesses in those wins) only
+      ever improves, so players outside the board never need tracking.
+
+    With shared=True (several processes writing one database) games are
+    still queued and written in batches, but no aggregates are kept in
+    memory: every read queries SQLite, so it sees every process's games
+    once they are written.
+    """
+
+    def __init__(self, db_path, capacity=4096, flush_interval=1.0, flush_batch=256,
+                 leaderboard_size=DEFAULT_LEADERBOARD_SIZE, shared=False):
+        """
+        Args:
+            db_path (str): SQLite file (":memory:" works for tests); may be
+                the game store's file.
+            capacity (int): Most players' statistics kept in memory.
+            flush_interval (float): Seconds between background writes; 0
+                disables the background thread (call flush() yourself).
+            flush_batch (int): Unwritten games that trigger an early write.
+            leaderboard_size (int): How many top players are kept ranked.
+            shared (bool): Other processes use the same database.
+        """
+        self.db_path = db_path
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.flush_batch = flush_batch
+        self.leaderboard_size = leaderboard_size
+        self.shared = shared
+        self._closed = False
+        self._start()
+        with self._db:
+            for statement in _SCHEMA:
+                self._db.execute(statement)
+            if shared:
+                self._db.execute("PRAGMA journal_mode=WAL")
+        self._load_aggregates()
+        atexit.register(self.close)
+        ref = weakref.ref(self)
+        os.register_at_fork(after_in_child=lambda: ref() is not None and ref()._start())
+
+    def _start(self):
+        """Sets up the per-process parts: connection, locks and flush thread (again in a forked child)."""
+        self._players = OrderedDict() # player_id -> aggregates, least recently used first
+        self._pending = [] # (player_id, difficulty, outcome, finished_at) not written yet
+        self._writing = [] # the batch currently being written
+        self._lock = threading.Lock() # Guards the in-memory state; held only briefly
+        self._db_lock = threading.Lock() # Serializes use of the connection; taken before _lock
+        self._flush_lock = threading.Lock()
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._wake = threading.Event()
+        self._flusher = None
+        if self.flush_interval > 0 and not self._closed:
+            self._flusher = threading.Thread(target=self._flush_loop, name="stats-store-flush", daemon=True)
+            self._flusher.start()
+        if hasattr(self, '_totals'): # A forked child: reload what the parent had written
+            self._load_aggregates()
+
+    def _load_aggregates(self):
+        """Reads the per-difficulty totals and the leaderboard (a few hundred rows at most)."""
+        with self._db_lock:
+            self._totals = self._read_totals()
+            ranked = self._db.execute(_RANKED, (self.leaderboard_size,)).fetchall()
+        self._board = [_rank_key(player_id, wins, win_guesses) for player_id, _, wins, win_guesses in ranked]
+        self._board_stats = {player_id: (played, wins, win_guesses) for player_id, played, wins, win_guesses in ranked}
+
+    def _read_totals(self):
+        """Per-difficulty outcome counts as written to SQLite (caller holds _db_lock)."""
+        totals = {}
+        for difficulty, outcome, count in self._db.execute("SELECT * FROM outcome_totals"):
+            totals.setdefault(difficulty, [0] * (MAX_OUTCOME + 1))[outcome] = count
+        return totals
+
+    @staticmethod
+    def new_player_id():
+        """Returns a fresh player id, kept in the player's session."""
+        return secrets.token_urlsafe(12)
+
+    def record(self, player_id, difficulty, won, guesses):
+        """Adds a finished game: won in `guesses` tries, or lost."""
+        outcome = guesses if won else LOSS
+        if not (0 <= outcome <= MAX_OUTCOME):
+            raise ValueError(f"A win takes 1 to {MAX_OUTCOME} guesses, not {guesses}.")
+        entry = (player_id, difficulty, outcome, time.time())
+        if self.shared: # Reads query SQLite, so there are no aggregates to update; just queue the write
+            with self._lock:
+                self._pending.append(entry)
+                wake = len(self._pending) >= self.flush_batch
+            if wake:
+                self._wake.set()
+            return
+        with self._lock:
+            player = self._players.get(player_id)
+            if player is not None:
+                self._record(player_id, player, entry)
+                wake = len(self._pending) >= self.flush_batch
+        if player is None:
+            with self._db_lock: # Nothing is written while we read, so pending games are applied once
+                loaded = self._read_player(player_id)
+                with self._lock:
+                    player = self._cached_player(player_id, loaded)
+                    self._record(player_id, player, entry)
+                    wake = len(self._pending) >= self.flush_batch
+        if wake:
+            self._wake.set()
+
+    def _record(self, player_id, player, entry):
+        """Applies one game to every in-memory aggregate (caller holds _lock)."""
+        _, difficulty, outcome, _ = entry
+        _apply(player, outcome)
+        self._players.move_to_end(player_id)
+        self._totals.setdefault(difficulty, [0] * (MAX_OUTCOME + 1))[outcome] += 1
+        self._pending.append(entry)
+        self._rank(player_id, player)
+
+    def _rank(self, player_id, player):
+        """Moves a player up the leaderboard after a game, if they are (or now belong) on it."""
+        board = self._board
+        stats = self._board_stats.get(player_id)
+        if stats is not None:
+            old_key = _rank_key(player_id, stats[1], stats[2])
+            new_key = _rank_key(player_id, player['wins'], player['win_guesses'])
+            if new_key != old_key:
+                del board[bisect.bisect_left(board, old_key)]
+                bisect.insort(board, new_key)
+        elif player['wins'] and (len(board) < self.leaderboard_size or
+                                 _rank_key(player_id, player['wins'], player['win_guesses']) < board[-1]):
+            bisect.insort(board, _rank_key(player_id, player['wins'], player['win_guesses']))
+            if len(board) > self.leaderboard_size:
+                del self._board_stats[board.pop()[2]]
+        else:
+            return
+        self._board_stats[player_id] = (player['played'], player['wins'], player['win_guesses'])
+
+    def _cached_player(self, player_id, loaded):
+        """The cached aggregates of a player, caching `loaded` (plus unwritten games) on a miss (caller holds _lock)."""
+        player = self._players.get(player_id)
+        if player is None:
+            player = loaded
+            for pending_id, _, outcome, _ in self._writing + self._pending:
+                if pending_id == player_id:
+                    _apply(player, outcome)
+            self._players[player_id] = player
+            while len(self._players) > self.capacity:
+                self._players.popitem(last=False)
+        return player
+
+    def _read_player(self, player_id):
+        """A player's aggregates as written to SQLite (caller holds _db_lock)."""
+        player = _new_player()
+        row = self._db.execute("SELECT played, wins, win_guesses, current_streak, max_streak "
+                               "FROM player_stats WHERE player_id = ?", (player_id,)).fetchone()
+        if row is not None:
+            for key, value in zip(('played', 'wins', 'win_guesses', 'current_streak', 'max_streak'), row):
+                player[key] = value
+            for outcome, count in self._db.execute(
+                    "SELECT outcome, count FROM player_outcomes WHERE player_id = ?", (player_id,)):
+                player['outcomes'][outcome] = count
+        return player
+
+    def player_stats(self, player_id):
+        """A player's games, wins, streaks and guess distribution.
+
+        Returns:
+            dict: played, wins, win_rate, current_streak, max_streak and
+                distribution ({guesses: wins} for 1..MAX_OUTCOME).
+        """
+        if self.shared:
+            with self._db_lock:
+                player = self._read_player(player_id)
+        else:
+            with self._lock:
+                player = self._players.get(player_id)
+                if player is not None:
+                    self._players.move_to_end(player_id)
+            if player is None:
+                with self._db_lock:
+                    loaded = self._read_player(player_id)
+                    with self._lock:
+                        player = self._cached_player(player_id, loaded)
+        with self._lock:
+            return {
+                'played': player['played'],
+                'wins': player['wins'],
+                'win_rate': player['wins'] / player['played'] if player['played'] else 0.0,
+                'current_streak': player['current_streak'],
+                'max_streak': player['max_streak'],
+                'distribution': {n: player['outcomes'][n] for n in range(1, MAX_OUTCOME + 1)},
+            }
+
+    def difficulty_stats(self):
+        """Every player's games per difficulty: played, wins, win_rate and guess distribution."""
+        if self.shared:
+            with self._db_lock:
+                totals = self._read_totals()
+        else:
+            with self._lock:
+                totals = {difficulty: list(counts) for difficulty, counts in self._totals.items()}
+        stats = {}
+        for difficulty, counts in sorted(totals.items()):
+            played = sum(counts)
+            wins = played - counts[LOSS]
+            stats[difficulty] = {'played': played, 'wins': wins, 'win_rate': wins / played if played else 0.0,
+                                 'distribution': {n: counts[n] for n in range(1, MAX_OUTCOME + 1)}}
+        return stats
+
+    def leaderboard(self, limit=10):
+        """The top `limit` players (at most leaderboard_size), best first."""
+        limit = max(0, min(limit, self.leaderboard_size))
+        if self.shared:
+            with self._db_lock:
+                ranked = self._db.execute(_RANKED, (limit,)).fetchall()
+            return [_board_entry(rank, *row) for rank, row in enumerate(ranked, 1)]
+        with self._lock:
+            return [_board_entry(rank, player_id, *self._board_stats[player_id])
+                    for rank, (_, _, player_id) in enumerate(self._board[:limit], 1)]
+
+    def pending_count(self):
+        """How many finished games are waiting to be written."""
+        with self._lock:
+            return len(self._pending) + len(self._writing)
+
+    def flush(self):
+        """Writes every recorded game (and its aggregate changes) in one transaction; returns how many."""
+        with self._flush_lock:
+            with self._lock:
+                self._writing, self._pending = self._pending, []
+            try:
+                with self._db_lock:
+                    written = self._write(self._writing)
+                    with self._lock:
+                        self._writing = [] # Written: readers now find these games in SQLite
+            except sqlite3.Error:
+                with self._lock:
+                    self._pending = self._writing + self._pending # Keep for the next attempt
+                    self._writing = []
+                raise
+            return written
+
+    def _write(self, entries):
+        """Appends games and folds them into the aggregate tables, in one transaction (caller holds _db_lock)."""
+        if not entries:
+            return 0
+        with self._db:
+            self._db.executemany("INSERT INTO finished_games VALUES (?, ?, ?, ?)", entries)
+            self._db.executemany(_UPSERT_PLAYER, [
+                (player_id, int(outcome != LOSS), outcome, int(outcome != LOSS), int(outcome != LOSS), finished_at)
+                for player_id, _, outcome, finished_at in entries])
+            self._db.executemany(_UPSERT_PLAYER_OUTCOME, [(player_id, outcome) for player_id, _, outcome, _ in entries])
+            self._db.executemany(_UPSERT_TOTAL, [(difficulty, outcome) for _, difficulty, outcome, _ in entries])
+        return len(entries)
+
+    def _flush_loop(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                logging.error(f"Stats store flush failed: {e}")
+
+    def close(self):
+        """Writes any pending games and stops the background thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        with self._db_lock:
+            self._db.close()
@@ -0,0 +1,95 @@
+import base64
+import binascii
+import secrets
+import struct
+
+MASK64 = (1 << 64) - 1
+ROUNDS = 4
+TOKEN_VERSION = 1
+TOKEN = struct.Struct("<BQII") # version, seed, cursor, word count
+
+
+def _mix(value):
+    """SplitMix64 finalizer: a cheap, well-distributed 64-bit hash."""
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & MASK64
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & MASK64
+    return value ^ (value >> 31)
+
+
+class TargetScheduler:
+    """Deals target word ids in a shuffled order with no repeats until all are used.
+
+    The shuffle is a keyed Feistel permutation of 0..word_count-1, so the
+    whole state is a seed and a cursor: each draw is O(1), nothing is stored
+    per word, and the state fits in a short session token. After the last
+    word the seed is re-mixed and a new shuffle starts.
+
+    Each player (or seed) gets their own scheduler; it never touches the
+    shared WordManager.
+    """
+
+    def __init__(self, word_count, seed=None, cursor=0):
+        """
+        Args:
+            word_count (int): Size of the dictionary being drawn from.
+            seed (int): 64-bit shuffle key; random if None.
+            cursor (int): How many ids of the current shuffle were already drawn.
+        """
+        if word_count <= 0:
+            raise ValueError("Cannot schedule targets from an empty word list.")
+        self.word_count = word_count
+        self._reseed(secrets.randbits(64) if seed is None else seed & MASK64)
+        self.cursor = cursor if 0 <= cursor < word_count else 0
+        # Smallest even number of bits covering every id, split into two halves
+        self._half_bits = max(1, ((word_count - 1).bit_length() + 1) // 2)
+        self._half_mask = (1 << self._half_bits) - 1
+
+    def _reseed(self, seed):
+        self.seed = seed
+        self._round_keys = [_mix(seed + i * 0x9E3779B97F4A7C15 & MASK64) for i in range(ROUNDS)]
+
+    def _permute(self, value):
+        """Maps an id to its shuffled position (a bijection on 0..word_count-1)."""
+        half_bits, half_mask = self._half_bits, self._half_mask
+        while True:
+            left, right = value >> half_bits, value & half_mask
+            for round_key in self._round_keys:
+                left, right = right, left ^ (_mix(right ^ round_key) & half_mask)
+            value = (left << half_bits) | right
+            # Cycle-walk: the Feistel domain is at most 4x word_count, so this
+            # takes a few steps on average
+            if value < self.word_count:
+                return value
+
+    def next_id(self):
+        """Returns the next target word id."""
+        word_id = self._permute(self.cursor)
+        self.cursor += 1
+        if self.cursor == self.word_count:
+            # Every word used: start a fresh shuffle
+            self._reseed(_mix(self.seed))
+            self.cursor = 0
+        return word_id
+
+    def to_token(self):
+        """Serializes the scheduler to a short URL-safe string (about 24 characters)."""
+        packed = TOKEN.pack(TOKEN_VERSION, self.seed, self.cursor, self.word_count)
+        return base64.urlsafe_b64encode(packed).rstrip(b"=").decode("ascii")
+
+    @classmethod
+    def from_token(cls, token, word_count):
+        """Restores a scheduler from to_token(), or starts a new one.
+
+        A missing or malformed token, or one made for a different dictionary
+        size, gives a fresh random schedule.
+        """
+        if token:
+            try:
+                packed = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+                version, seed, cursor, token_word_count = TOKEN.unpack(packed)
+            except (binascii.Error, struct.error, ValueError, TypeError):
+                pass
+            else:
+                if version == TOKEN_VERSION and token_word_count == word_count:
+                    return cls(word_count, seed=seed, cursor=cursor)
+        return cls(word_count)
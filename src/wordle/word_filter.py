@@ -0,0 +1,171 @@
+import argparse
+import gzip
+import hashlib
+import math
+import random
+import string
+import struct
+import time
+
+# Serialized filter (little-endian), as sent to the browser:
+#   header  magic, hash count k, word length, reserved, bit count m, word count n
+#   bits    ceil(m / 8) bytes; bit j is (bits[j >> 3] >> (j & 7)) & 1
+MAGIC = b"WBF1"
+HEADER = struct.Struct("<4sBBHII")
+DEFAULT_FALSE_POSITIVE_RATE = 0.01
+
+_FNV_PRIME = 0x01000193
+_FNV_OFFSET = 0x811C9DC5
+_SECOND_SEED = 0x9E3779B9 # Mixed in before the second finalizer so the two hashes differ
+_MASK32 = 0xFFFFFFFF
+
+
+def _fnv1a(word):
+    """32-bit FNV-1a over the word's (ASCII) characters."""
+    h = _FNV_OFFSET
+    for char in word:
+        h = ((h ^ ord(char)) * _FNV_PRIME) & _MASK32
+    return h
+
+def _fmix32(h):
+    """MurmurHash3's finalizer: spreads every input bit over the whole word."""
+    h ^= h >> 16
+    h = (h * 0x85EBCA6B) & _MASK32
+    h ^= h >> 13
+    h = (h * 0xC2B2AE35) & _MASK32
+    return h ^ (h >> 16)
+
+def word_hashes(word):
+    """The two 32-bit hashes behind a word's bit positions; static/js/game.js computes the same."""
+    h = _fnv1a(word.lower())
+    return _fmix32(h), _fmix32(h ^ _SECOND_SEED) | 1
+
+
+class WordFilter:
+    """A Bloom filter over the dictionary, small enough to send to the browser.
+
+    might_contain() is never wrong for a dictionary word and wrong for
+    roughly `false_positive_rate` of other strings, so a client can reject
+    most non-words without a request while the server still validates
+    every guess. Bit positions use double hashing over the two hashes of
+    word_hashes(): (h1 + i * h2) mod 2**32 mod m, for i in 0..k-1.
+    """
+
+    def __init__(self, bit_count, hash_count, word_length, bits=None, word_count=0):
+        self.bit_count = bit_count
+        self.hash_count = hash_count
+        self.word_length = word_length
+        self.word_count = word_count
+        self.bits = bits if bits is not None else bytearray((bit_count + 7) // 8)
+
+    @classmethod
+    def from_words(cls, words, false_positive_rate=DEFAULT_FALSE_POSITIVE_RATE, word_length=5):
+        """Builds a filter sized for `words` (any case) at the target false positive rate.
+
+        Args:
+            words (Sequence[str]): The dictionary (e.g. GameEngine.words).
+            false_positive_rate (float): Target share of non-words accepted, 0 < rate < 1.
+            word_length (int): The game's word length.
+        """
+        if not 0 < false_positive_rate < 1:
+            raise ValueError("The false positive rate must be between 0 and 1.")
+        count = max(1, len(words))
+        # Optimal Bloom filter size and hash count for n items at rate p
+        bit_count = math.ceil(-count * math.log(false_positive_rate) / math.log(2) ** 2)
+        hash_count = max(1, round(bit_count / count * math.log(2)))
+        word_filter = cls(bit_count, hash_count, word_length, word_count=len(words))
+        for word in words:
+            word_filter.add(word)
+        return word_filter
+
+    def _positions(self, word):
+        h1, h2 = word_hashes(word)
+        return (((h1 + i * h2) & _MASK32) % self.bit_count for i in range(self.hash_count))
+
+    def add(self, word):
+        for position in self._positions(word):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def might_contain(self, word):
+        """False only if `word` is certainly not in the dictionary."""
+        if len(word) != self.word_length:
+            return False
+        bits = self.bits
+        return all(bits[position >> 3] >> (position & 7) & 1 for position in self._positions(word))
+
+    @property
+    def expected_false_positive_rate(self):
+        """The theoretical rate for this size, hash count and number of words."""
+        return (1 - math.exp(-self.hash_count * self.word_count / self.bit_count)) ** self.hash_count
+
+    def to_bytes(self):
+        return HEADER.pack(MAGIC, self.hash_count, self.word_length, 0, self.bit_count,
+                           self.word_count) + bytes(self.bits)
+
+    @classmethod
+    def from_bytes(cls, data):
+        try:
+            magic, hash_count, word_length, _, bit_count, word_count = HEADER.unpack_from(data)
+        except struct.error:
+            raise ValueError("Word filter data is truncated.") from None
+        if magic != MAGIC or len(data) != HEADER.size + (bit_count + 7) // 8:
+            raise ValueError("Not a word filter, or the wrong length.")
+        return cls(bit_count, hash_count, word_length, bytearray(data[HEADER.size:]), word_count)
+
+
+class PublishedWordFilter:
+    """A built WordFilter with its serialized form, version tag and build stats, as served on /api/word-filter."""
+
+    def __init__(self, words, false_positive_rate=DEFAULT_FALSE_POSITIVE_RATE):
+        start = time.perf_counter()
+        self.filter = WordFilter.from_words(words, false_positive_rate)
+        self.payload = self.filter.to_bytes()
+        self.build_seconds = time.perf_counter() - start
+        # Changes whenever the dictionary or the filter parameters do
+        self.version = hashlib.blake2b(self.payload, digest_size=8).hexdigest()
+        self.false_positive_rate = false_positive_rate
+
+    @property
+    def size(self):
+        return len(self.payload)
+
+
+def measure_false_positive_rate(word_filter, words, samples=200_000, seed=0):
+    """Share of random letter strings (not in `words`) that the filter accepts."""
+    rng = random.Random(seed)
+    dictionary = {word.lower() for word in words}
+    accepted = tested = 0
+    while tested < samples:
+        candidate = "".join(rng.choices(string.ascii_lowercase, k=word_filter.word_length))
+        if candidate in dictionary:
+            continue
+        tested += 1
+        accepted += word_filter.might_contain(candidate)
+    return accepted / tested
+
+
+def main():
+    """Reports build time, payload size and false positive rate at several targets, for tuning."""
+    from .word_manager import WordManager
+
+    parser = argparse.ArgumentParser(description="Size the client-side dictionary filter.")
+    parser.add_argument("word_file", nargs="?", default="data/words.txt",
+                        help="Word list, relative to src/wordle or absolute (default: data/words.txt)")
+    parser.add_argument("--rates", default="0.1,0.05,0.01,0.005,0.001",
+                        help="Comma-separated target false positive rates")
+    args = parser.parse_args()
+
+    words = WordManager(args.word_file).word_list
+    print(f"{len(words)} words")
+    print(f"{'target':>8} {'bytes':>8} {'gzip':>8} {'k':>3} {'build ms':>9} {'expected':>9} {'measured':>9}")
+    for rate in (float(r) for r in args.rates.split(",")):
+        published = PublishedWordFilter(words, rate)
+        word_filter = published.filter
+        print(f"{rate:>8.3%} {published.size:>8} {len(gzip.compress(published.payload)):>8} "
+              f"{word_filter.hash_count:>3} {published.build_seconds * 1000:>9.1f} "
+              f"{word_filter.expected_false_positive_rate:>9.3%} "
+              f"{measure_false_positive_rate(word_filter, words):>9.3%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import gzip
+import io
+import os
+
+GZIP_MAGIC = b"\x1f\x8b"
+DEFAULT_CHUNK_SIZE = 1 << 20 # Bytes of text read per chunk
+
+
+class WordLoader:
+    """Streams words from one or more word files into a sorted, de-duplicated list.
+
+    Files are read in chunks (plain text or gzip, detected from the file
+    header), so memory use depends on the number of distinct words, not on
+    the size of the inputs. Each line is normalized (stripped, lowercased)
+    and kept only if it is an ASCII alphabetic word of the required length.
+    """
+
+    def __init__(self, word_length=5, chunk_size=DEFAULT_CHUNK_SIZE, progress=None, strict=False):
+        """
+        Args:
+            word_length (int): Keep only words of this length.
+            chunk_size (int): Approximate bytes of text to read per chunk.
+            progress (callable): Called after each chunk as
+                progress(path, bytes_read, total_bytes, unique_words).
+            strict (bool): Raise on an unreadable source instead of recording
+                it in `errors` and moving on to the next one.
+        """
+        self.word_length = word_length
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.strict = strict
+        self.errors = [] # (path, exception) for each source that could not be read
+        self.lines_read = 0
+        self.duplicates = 0
+
+    def normalize(self, line):
+        """Returns the normalized word for a line, or None if it is not a valid word."""
+        word = line.strip().lower()
+        if len(word) == self.word_length and word.isascii() and word.isalpha():
+            return word
+        return None
+
+    def load(self, paths):
+        """Loads every source and returns the distinct words, sorted.
+
+        Args:
+            paths (str | list[str]): One word file or several.
+
+        Returns:
+            list[str]: The sorted words from all sources that could be read.
+        """
+        if isinstance(paths, str):
+            paths = [paths]
+        words = set()
+        for path in paths:
+            try:
+                self._load_source(path, words)
+            except (OSError, EOFError) as e: # EOFError: truncated gzip
+                if self.strict:
+                    raise
+                self.errors.append((path, e))
+        return sorted(words)
+
+    def _load_source(self, path, words):
+        """Streams one file into `words`, chunk by chunk."""
+        normalize = self.normalize
+        with open(path, "rb") as raw:
+            total_bytes = os.fstat(raw.fileno()).st_size
+            is_gzip = raw.read(2) == GZIP_MAGIC
+            raw.seek(0)
+            stream = gzip.GzipFile(fileobj=raw) if is_gzip else raw
+            with io.TextIOWrapper(stream, encoding="utf-8", errors="replace") as text:
+                while True:
+                    lines = text.readlines(self.chunk_size)
+                    if not lines:
+                        break
+                    self.lines_read += len(lines)
+                    before = len(words)
+                    accepted = [word for word in map(normalize, lines) if word is not None]
+                    words.update(accepted)
+                    self.duplicates += len(accepted) - (len(words) - before)
+                    if self.progress is not None:
+                        self.progress(path, raw.tell(), total_bytes, len(words))
@@ -1,41 +1,87 @@
+import logging
 import random
 import os
 
+from .candidates import CandidateIndex
+from .compiled_words import load_compiled_words
+from .word_loader import WordLoader
+
 class WordManager:
     """Manages loading, selecting, and validating words for the Wordle game."""
 
-    def __init__(self, word_file_path="data/words.txt"):
+    word_length = 5 # Overridden per instance for the 4-8 letter variants
+
+    def __init__(self, word_file_path="data/words.txt", use_compiled=True, progress=None, word_length=5):
         """Initializes the WordManager, loading words from the specified file.
 
         Args:
-            word_file_path (str): The relative path to the word list file
-                                    within the src/wordle directory.
+            word_file_path (str | list[str]): The relative path to the word list
+                                    file within the src/wordle directory, or a
+                                    list of them (plain text or gzip) to merge.
+            use_compiled (bool): Map the compiled .bin next to the word file
+                                 when it exists and is up to date.
+            progress (callable): Optional loading progress callback; see WordLoader.
+            word_length (int): Load only words of this length.
         """
+        self.word_length = word_length
         # Construct the absolute path relative to this file's location
         base_dir = os.path.dirname(os.path.abspath(__file__))
-        absolute_word_file_path = os.path.join(base_dir, word_file_path)
+        if isinstance(word_file_path, str):
+            absolute_word_file_path = os.path.join(base_dir, word_file_path)
+        else:
+            absolute_word_file_path = [os.path.join(base_dir, path) for path in word_file_path]
 
-        self.word_list = self._load_words(absolute_word_file_path)
+        # Only a single source has a compiled counterpart
+        compiled = None
+        if use_compiled and isinstance(absolute_word_file_path, str):
+            compiled = load_compiled_words(absolute_word_file_path)
+            if compiled is not None and compiled.word_length != word_length:
+                compiled = None # Compiled for another length
+        if compiled is not None:
+            self._use_compiled(compiled)
+        else:
+            self._set_words(self._load_words(absolute_word_file_path, progress=progress))
         if not self.word_list:
             raise ValueError(f"Word list at '{absolute_word_file_path}' is empty or could not be loaded.")
         self.target_word = self._select_target_word()
 
-    def _load_words(self, file_path):
-        """Loads words from a file, filtering for 5-letter alphabetic words."""
-        words = set()
-        try:
-            with open(file_path, 'r') as f:
-                for line in f:
-                    word = line.strip().lower()
-                    if len(word) == 5 and word.isalpha():
-                        words.add(word)
-        except FileNotFoundError:
-            print(f"Error: Word file not found at {file_path}")
-            return []
-        except Exception as e:
-            print(f"Error loading word file: {e}")
-            return []
-        return list(words)
+    def _load_words(self, file_path, progress=None):
+        """Loads words from one file or several, filtering for word_length-letter alphabetic words.
+
+        Sources that cannot be read are reported and skipped.
+        """
+        loader = WordLoader(word_length=self.word_length, progress=progress)
+        words = loader.load(file_path)
+        for path, error in loader.errors:
+            if isinstance(error, FileNotFoundError):
+                logging.error(f"Word file not found at {path}")
+            else:
+                logging.error(f"Error loading word file {path}: {error}")
+        return words
+
+    @property
+    def word_list(self):
+        """The ordered array of loaded words, used for random selection."""
+        return self._word_list
+
+    @word_list.setter
+    def word_list(self, words):
+        """Replaces the loaded words and rebuilds the hashed lookup index."""
+        self._set_words(list(words))
+
+    def _set_words(self, words):
+        """Adopts a word list (without copying it) and indexes it."""
+        self._word_list = words
+        # word -> position in _word_list; gives O(1) validation and word ids
+        self._word_index = {word: i for i, word in enumerate(self._word_list)}
+        self._candidate_index = None
+
+    def _use_compiled(self, compiled):
+        """Serves the word list and index straight from a mapped CompiledWordList."""
+        # The compiled list is both the ordered array and the hashed index
+        self._word_list = compiled
+        self._word_index = compiled
+        self._candidate_index = None
 
     def _select_target_word(self):
         """Selects a random word from the loaded list."""
@@ -50,18 +96,35 @@ class WordManager:
         self.target_word = random.choice(self.word_list)
         return self.target_word
 
+    def draw_target_word(self, scheduler):
+        """Returns the next target from a per-player TargetScheduler.
+
+        Unlike select_target_word, this leaves the shared target_word alone.
+        """
+        return self.word_list[scheduler.next_id()]
+
     def get_target_word(self):
         """Returns the selected target word."""
         return self.target_word
 
     def is_valid_word(self, word):
         """Checks if a given word is in the loaded word list."""
-        return word.lower() in self.word_list
+        return word.lower() in self._word_index
+
+    def word_id(self, word):
+        """Returns the position of a word in the ordered word list, or None."""
+        return self._word_index.get(word.lower())
 
     def get_full_word_list(self):
         """Returns the full list of valid words."""
         return self.word_list
 
+    def get_candidate_index(self):
+        """Returns the shared CandidateIndex for the loaded words, building it on first use."""
+        if self._candidate_index is None:
+            self._candidate_index = CandidateIndex(self.word_list, self.word_length)
+        return self._candidate_index
+
 # Example Usage (for testing)
 if __name__ == '__main__':
     try:
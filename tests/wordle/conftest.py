@@ -0,0 +1,43 @@
+import pytest
+from src.wordle.app import create_app, load_engine
+from src.wordle.game_store import GameStore
+from src.wordle.state_codec import encode_state, decode_state
+from src.wordle.stats_store import StatsStore
+
+# Fixtures shared by the web app tests (Flask, ASGI, metrics, assets, ...).
+# Modules add only what is specific to them, e.g. extra app config.
+
+@pytest.fixture(scope="session")
+def engine():
+    """The shared, read-only GameEngine over the real dictionary."""
+    return load_engine()
+
+@pytest.fixture
+def game_store():
+    """An in-memory store using the production binary codec; nothing is written until flush()."""
+    store = GameStore(":memory:", flush_interval=0, encode=encode_state, decode=decode_state)
+    yield store
+    store.close()
+
+@pytest.fixture
+def stats_store():
+    """In-memory player statistics without a flush thread; closed after the test."""
+    store = StatsStore(":memory:", flush_interval=0)
+    yield store
+    store.close()
+
+@pytest.fixture
+def make_app(engine, game_store, stats_store):
+    """Builds a test app on the shared engine and stores; keyword arguments are extra config."""
+    def make(**config):
+        return create_app({'TESTING': True, **config}, engine=engine, game_store=game_store,
+                          stats_store=stats_store)
+    return make
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,230 @@
+from src.wordle.feedback import FeedbackPattern
+
+def set_target(client, game_store, target):
+    """Fixes the target of the client's current game."""
+    with client.session_transaction() as session:
+        game_id = session['game_id']
+    state = game_store.get(game_id)
+    state['target_word'] = target
+    game_store.put(game_id, state)
+
+def start_game(client, game_store, target='CRANE', difficulty='medium'):
+    """Starts a game through the API, then fixes its target for the test."""
+    state = client.post('/api/game', json={'difficulty': difficulty}).get_json()
+    set_target(client, game_store, target)
+    return state
+
+def test_new_game(client, game_store):
+    """Tests that POST /api/game starts a fresh game without revealing the target."""
+    state = start_game(client, game_store, difficulty='easy')
+    assert state['guesses'] == [] and state['feedback'] == []
+    assert state['attempts_left'] == 8
+    assert state['allowed_hints'] == 2
+    assert state['message'] == "Enter your first guess!"
+    assert 'target_word' not in state
+    assert client.get('/api/game').get_json() == state # GET returns the same game
+
+def test_guess_returns_delta(client, game_store):
+    """Tests that a valid guess answers with its feedback and the changed fields only."""
+    start_game(client, game_store)
+    delta = client.post('/api/guess', json={'guess': 'slate'}).get_json()
+    assert delta['valid'] is True
+    assert delta['guess'] == 'SLATE'
+    assert delta['feedback'] == '__*_*'
+    assert delta['attempts_left'] == 5
+    assert delta['message'] == "Enter your next guess."
+    assert delta['game_over'] is False
+    assert 0 < delta['candidates_remaining'] < 100
+    assert 'guesses' not in delta and 'target_word' not in delta
+    assert client.get('/api/game').get_json()['guesses'] == ['SLATE']
+
+def test_invalid_guess(client, game_store):
+    """Tests that rejected guesses report why and use no attempt."""
+    start_game(client, game_store)
+    delta = client.post('/api/guess', json={'guess': 'qwxyz'}).get_json()
+    assert delta == {'valid': False, 'message': '"QWXYZ" is not a valid word in the dictionary.'}
+    assert client.post('/api/guess', json={'guess': 'abc'}).get_json()['valid'] is False
+    assert client.get('/api/game').get_json()['attempts_left'] == 6
+
+def test_non_ascii_guess_is_rejected(client, game_store):
+    """Tests that accented letters are refused before the binary codec has to store them."""
+    start_game(client, game_store)
+    delta = client.post('/api/guess', json={'guess': 'naïve'}).get_json()
+    assert delta == {'valid': False, 'message': "Guess must contain only letters."}
+    assert client.post('/guess', data={'guess': 'écolé'}).status_code == 302
+    game_ids = start_bot_games(client, game_store, ['CRANE'])
+    moves = [{'game_id': game_ids[0], 'guess': 'écolé'}, {'game_id': game_ids[0], 'guess': 'crane'}]
+    results = client.post('/api/bot/guesses', json={'moves': moves}).get_json()['results']
+    assert results[0]['valid'] is False and results[1]['win'] is True
+
+def test_json_body_must_be_an_object(client, game_store):
+    """Tests that a JSON list or string is turned away, as the ASGI front end does."""
+    start_game(client, game_store)
+    for body in (["x"], "x", 5):
+        response = client.post('/api/guess', json=body)
+        assert (response.status_code, response.get_json()) == (400, {'error': "Expected a JSON object."})
+    assert client.post('/api/game', json=[]).status_code == 400
+    assert client.get('/api/game').get_json()['attempts_left'] == 6
+
+def test_win_reveals_target_and_ends_game(client, game_store):
+    """Tests the winning guess and that further guesses are refused."""
+    start_game(client, game_store)
+    delta = client.post('/api/guess', data={'guess': 'crane'}).get_json() # Form posts work too
+    assert delta['win'] is True and delta['game_over'] is True
+    assert delta['target_word'] == 'CRANE'
+    response = client.post('/api/guess', json={'guess': 'slate'})
+    assert response.status_code == 409
+
+def test_hint(client, game_store):
+    """Tests that a hint reveals an unsolved letter of the target."""
+    start_game(client, game_store)
+    delta = client.post('/api/hint').get_json()
+    assert delta['hints_used'] == 1
+    assert 'CRANE'[delta['position']] == delta['letter']
+    assert delta['message'] == f"Hint: Letter at position {delta['position'] + 1} is '{delta['letter']}'."
+    delta = client.post('/api/hint').get_json() # Medium allows one hint
+    assert delta['position'] is None
+    assert delta['message'] == "You have already used all your hints for this game."
+
+def test_no_game(client):
+    """Tests that moves without a game are refused."""
+    assert client.post('/api/guess', json={'guess': 'crane'}).status_code == 404
+    assert client.post('/api/hint').status_code == 404
+
+def test_form_routes_still_work(client, game_store):
+    """Tests the redirecting form flow that the API mirrors."""
+    client.get('/')
+    set_target(client, game_store, 'CRANE')
+    page = client.post('/guess', data={'guess': 'slate'}, follow_redirects=True).get_data(as_text=True)
+    assert 'Enter your next guess.' in page
+    assert 'js/game.js' in page
+
+def test_index_conditional_get(client, game_store):
+    """Tests that an unchanged page is answered with 304, and that any change to the game changes its ETag."""
+    client.get('/')
+    page = client.get('/?from_redirect=1')
+    etag = page.headers['ETag']
+    assert page.status_code == 200 and etag.startswith('W/')
+    assert 'no-cache' in page.headers['Cache-Control'] and 'private' in page.headers['Cache-Control']
+
+    unchanged = client.get('/?from_redirect=1', headers={'If-None-Match': etag})
+    assert unchanged.status_code == 304 and unchanged.get_data() == b''
+    assert unchanged.headers['ETag'] == etag
+
+    set_target(client, game_store, 'CRANE')
+    client.post('/api/guess', json={'guess': 'slate'})
+    changed = client.get('/?from_redirect=1', headers={'If-None-Match': etag})
+    assert changed.status_code == 200 and changed.headers['ETag'] != etag
+
+def test_redirected_page_load_does_not_rewrite_the_game(client, game_store, monkeypatch):
+    """Tests that showing an up-to-date game reads it once and stores nothing, while an old one is upgraded."""
+    start_game(client, game_store)
+    calls = {'get': 0, 'put': 0}
+    real_get, real_put = game_store.get, game_store.put
+
+    def counting(name, method):
+        def call(*args):
+            calls[name] += 1
+            return method(*args)
+        return call
+
+    monkeypatch.setattr(game_store, 'get', counting('get', real_get))
+    monkeypatch.setattr(game_store, 'put', counting('put', real_put))
+    client.get('/?from_redirect=1')
+    assert calls == {'get': 1, 'put': 0}
+
+    with client.session_transaction() as session:
+        game_id = session['game_id']
+    state = real_get(game_id)
+    state['attempts_left'] = 1 # Out of step with the guesses made, as old sessions could be
+    real_put(game_id, state)
+    client.get('/?from_redirect=1')
+    assert calls['put'] == 1 and real_get(game_id)['attempts_left'] == 6
+
+def test_flashed_messages_bypass_etag(client, game_store):
+    """Tests that a page with a flashed message is always rendered."""
+    start_game(client, game_store)
+    client.post('/api/guess', json={'guess': 'crane'}) # Won: the game is over
+    etag = client.get('/?from_redirect=1').headers['ETag']
+    page = client.post('/guess', data={'guess': 'slate'}, follow_redirects=True,
+                       headers={'If-None-Match': etag})
+    assert page.status_code == 200
+    assert 'The game is over' in page.get_data(as_text=True)
+
+def test_board_rows_are_cached_fragments(app, client, game_store):
+    """Tests that board rows are rendered once per (guess, feedback) and reused across pages."""
+    fragments = app.extensions['wordle']['fragments']
+    start_game(client, game_store)
+    client.post('/api/guess', json={'guess': 'slate'})
+    first = client.get('/?from_redirect=1').get_data(as_text=True)
+    assert ('fragments/board_row.html', ('SLATE', int(FeedbackPattern.from_symbols('__*_*')))) in fragments._cache
+    cached = len(fragments)
+    second = client.get('/?from_redirect=1').get_data(as_text=True)
+    assert second == first and len(fragments) == cached
+    assert first.count('tile correct-position') == 2
+    assert first.count('tile incorrect-letter') == 3
+
+def start_bot_games(client, game_store, targets):
+    """Starts one bot game per target through the API, then fixes their targets."""
+    game_ids = client.post('/api/bot/games', json={'count': len(targets)}).get_json()['game_ids']
+    for game_id, target in zip(game_ids, targets):
+        state = game_store.get(game_id)
+        state['target_word'] = target
+        game_store.put(game_id, state)
+    return game_ids
+
+def test_bot_guess_batch(client, game_store):
+    """Tests that a batch plays its moves in order across games, as single guesses would."""
+    first, second = start_bot_games(client, game_store, ['CRANE', 'SLATE'])
+    moves = [
+        {'game_id': first, 'guess': 'slate'},
+        {'game_id': second, 'guess': 'crane'},
+        {'game_id': first, 'guess': 'xxxxx'},
+        {'game_id': first, 'guess': 'crane'},
+        {'game_id': first, 'guess': 'slate'}, # Already won
+        {'game_id': 'no-such-game', 'guess': 'crane'},
+        'not a move',
+        {'game_id': [first], 'guess': 'crane'}, # Unhashable
+    ]
+    response = client.post('/api/bot/guesses', json={'moves': moves})
+    assert response.status_code == 200 and response.is_streamed
+    results = response.get_json()['results']
+    assert [result.get('feedback') for result in results[:2]] == ['__*_*', '__*_*']
+    assert results[2] == {'game_id': first, 'valid': False,
+                          'message': '"XXXXX" is not a valid word in the dictionary.'}
+    assert results[3]['win'] is True and results[3]['target_word'] == 'CRANE'
+    assert results[4]['error'] == "The game is over."
+    assert results[5]['error'] == results[6]['error'] == results[7]['error'] == "No such game."
+
+    state = game_store.get(first)
+    assert state['guesses'] == ['SLATE', 'CRANE'] and state['game_over']
+    assert game_store.get(second)['attempts_left'] == 5
+
+def test_bot_batch_limits(app, client):
+    """Tests that empty, malformed and oversized batches are turned away."""
+    app.config['WORDLE_BATCH_MAX_MOVES'] = 2
+    assert client.post('/api/bot/guesses', json={'moves': []}).status_code == 400
+    assert client.post('/api/bot/guesses', json={}).status_code == 400
+    assert client.post('/api/bot/guesses', json=[{'game_id': 'x', 'guess': 'crane'}]).status_code == 400
+    assert client.post('/api/bot/games', json="many").status_code == 400
+    assert client.post('/api/bot/games', json={'count': 'many'}).status_code == 400
+    assert client.post('/api/bot/games', json={'count': 3}).status_code == 413
+    moves = [{'game_id': 'x', 'guess': 'crane'}] * 3
+    assert client.post('/api/bot/guesses', json={'moves': moves}).status_code == 413
+
+def test_finished_games_are_recorded(client, game_store, app):
+    """Tests that games ended through the form and the JSON API count in the player's stats."""
+    assert client.get('/api/stats').get_json()['player'] is None
+    start_game(client, game_store)
+    client.post('/guess', data={'guess': 'crane'})
+    start_game(client, game_store, difficulty='hard')
+    for guess in ['slate', 'slate', 'slate', 'slate', 'slate', 'slate']:
+        client.post('/api/guess', json={'guess': guess})
+    body = client.get('/api/stats').get_json()
+    assert body['player']['played'] == 2 and body['player']['wins'] == 1
+    assert body['player']['distribution']['1'] == 1 and body['player']['current_streak'] == 0
+    assert body['difficulties']['hard']['win_rate'] == 0.0
+
+    entry, = client.get('/api/leaderboard').get_json()['leaderboard']
+    assert entry == {'rank': 1, 'you': True, 'played': 2, 'wins': 1, 'win_rate': 0.5, 'average_guesses': 1.0}
+    assert app.test_client().get('/api/leaderboard').get_json()['leaderboard'][0]['you'] is False
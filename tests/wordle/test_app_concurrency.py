@@ -0,0 +1,85 @@
+import multiprocessing
+import random
+import threading
+import pytest
+from src.wordle.app import create_app
+from src.wordle.compiled_words import CompiledWordList
+from src.wordle.evaluator import Evaluator
+from src.wordle.game_store import GameStore
+from src.wordle.state_codec import encode_state, decode_state
+
+THREADS = 16
+GAMES_PER_PLAYER = 15
+
+def play_games(app, words, games, seed):
+    """Plays whole games through the JSON API as one player; returns a list of problems found."""
+    rng = random.Random(seed)
+    evaluator = Evaluator()
+    client = app.test_client()
+    problems = []
+    for _ in range(games):
+        state = client.post('/api/game', json={'difficulty': 'medium'}).get_json()
+        played = []
+        while True:
+            guess = rng.choice(words).upper()
+            delta = client.post('/api/guess', json={'guess': guess}).get_json()
+            played.append((guess, delta['feedback']))
+            if delta['attempts_left'] != state['attempts_left'] - len(played):
+                problems.append(f"attempts_left {delta['attempts_left']} after {len(played)} guesses")
+            if delta['game_over']:
+                break
+        target = delta['target_word']
+        # Feedback computed against another player's target would not match
+        for guess, feedback in played:
+            if str(evaluator.evaluate_pattern(target, guess)) != feedback:
+                problems.append(f"{guess} -> {feedback} does not match target {target}")
+        if client.get('/api/game').get_json()['guesses'] != [guess for guess, _ in played]:
+            problems.append("stored guesses differ from the guesses played")
+    return problems
+
+def test_threaded_players_do_not_interfere(engine, stats_store, tmp_path):
+    """Tests many threads playing at once against one app, engine and write-behind store."""
+    store = GameStore(str(tmp_path / "games.sqlite3"), capacity=8, flush_interval=0.01,
+                      encode=encode_state, decode=decode_state) # Small LRU: evictions and flushes race with requests
+    app = create_app({'TESTING': True}, engine=engine, game_store=store, stats_store=stats_store)
+    words = list(engine.words)
+    results = [None] * THREADS
+
+    def player(i):
+        results[i] = play_games(app, words, GAMES_PER_PLAYER, seed=i)
+
+    threads = [threading.Thread(target=player, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.close()
+    assert results == [[]] * THREADS
+
+def _worker(app, words, seed, queue):
+    queue.put(play_games(app, words, GAMES_PER_PLAYER, seed))
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_preloaded_app_in_forked_workers(engine, tmp_path):
+    """Tests an app built before forking, served by several processes sharing one store."""
+    store = GameStore(str(tmp_path / "games.sqlite3"), encode=encode_state, decode=decode_state, shared=True)
+    app = create_app({'TESTING': True}, engine=engine, game_store=store)
+    words = list(engine.words)
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    workers = [context.Process(target=_worker, args=(app, words, seed, queue)) for seed in range(4)]
+    for worker in workers:
+        worker.start()
+    problems = [queue.get(timeout=60) for _ in workers]
+    for worker in workers:
+        worker.join()
+    store.close()
+    app.extensions['wordle']['stats'].close()
+    assert problems == [[]] * len(workers)
+
+def test_engine_is_not_mutated_by_games(engine, app):
+    """Tests that playing never changes the shared dictionary or bitsets."""
+    words, all_bits = engine.words, engine.candidate_index.all_bits
+    assert play_games(app, list(words), 3, seed=99) == []
+    assert engine.words is words and isinstance(words, (tuple, CompiledWordList))
+    assert engine.candidate_index.all_bits == all_bits
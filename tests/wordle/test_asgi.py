@@ -0,0 +1,189 @@
+import asyncio
+import json
+import threading
+from src.wordle import game_api
+from src.wordle.app import create_app
+from src.wordle.asgi import MAX_BODY_BYTES, create_asgi_app
+from src.wordle.game_store import GameStore
+from src.wordle.state_codec import encode_state, decode_state
+
+class Client:
+    """Calls an ASGI app directly, keeping the session cookie like a browser."""
+
+    def __init__(self, app):
+        self.app = app
+        self.cookie = None
+
+    def request(self, method, path, body=None, raw_body=None):
+        return asyncio.run(self._request(method, path, body, raw_body))
+
+    async def _request(self, method, path, body, raw_body):
+        data = raw_body if raw_body is not None else json.dumps(body).encode() if body is not None else b""
+        headers = [(b"content-type", b"application/json")]
+        if self.cookie:
+            headers.append((b"cookie", self.cookie.encode()))
+        scope = {'type': 'http', 'method': method, 'path': path, 'query_string': b"", 'headers': headers}
+        messages = [{'type': 'http.request', 'body': data, 'more_body': False}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+        async def send(message):
+            sent.append(message)
+
+        await self.app(scope, receive, send)
+        start, *bodies = sent
+        response_headers = dict(start['headers'])
+        if b"set-cookie" in response_headers:
+            self.cookie = response_headers[b"set-cookie"].decode().split(";")[0]
+        return start['status'], json.loads(b"".join(body['body'] for body in bodies))
+
+def set_target(game_store, cookie, app, target):
+    session = app.session_interface.get_signing_serializer(app).loads(cookie.split("=", 1)[1])
+    state = game_store.get(session['game_id'])
+    state['target_word'] = target
+    game_store.put(session['game_id'], state)
+
+def test_play_a_game(app, game_store):
+    """Tests starting a game and guessing through the ASGI handlers."""
+    client = Client(create_asgi_app(app))
+    status, state = client.request("POST", "/api/game", {'difficulty': 'pro'})
+    assert status == 200 and state['attempts_left'] == 5
+    set_target(game_store, client.cookie, app, 'CRANE')
+    status, delta = client.request("POST", "/api/guess", {'guess': 'slate'})
+    assert (status, delta['feedback'], delta['attempts_left']) == (200, '__*_*', 4)
+    status, delta = client.request("POST", "/api/guess", {'guess': 'crane'})
+    assert delta['win'] is True and delta['target_word'] == 'CRANE'
+    assert client.request("POST", "/api/guess", {'guess': 'crane'})[0] == 409
+
+def test_session_shared_with_flask(app, game_store):
+    """Tests that a game started on the WSGI app continues on the ASGI app and back."""
+    flask_client = app.test_client()
+    flask_client.post('/api/game', json={'difficulty': 'easy'})
+    client = Client(create_asgi_app(app))
+    client.cookie = f"session={flask_client.get_cookie('session').value}"
+    set_target(game_store, client.cookie, app, 'CRANE')
+    status, delta = client.request("POST", "/api/guess", {'guess': 'slate'})
+    assert status == 200 and delta['valid']
+    assert flask_client.get('/api/game').get_json()['guesses'] == ['SLATE']
+
+def test_errors(app):
+    """Tests unknown routes, wrong methods, bad bodies and moves without a game."""
+    client = Client(create_asgi_app(app))
+    assert client.request("GET", "/nope")[0] == 404
+    assert client.request("GET", "/api/guess")[0] == 405
+    assert client.request("POST", "/api/guess", raw_body=b"x" * (MAX_BODY_BYTES + 1))[0] == 413
+    assert client.request("POST", "/api/guess", raw_body=b"{not json")[0] == 404 # No game yet
+    assert client.request("POST", "/api/guess", ["x"]) == (400, {'error': "Expected a JSON object."})
+    client.cookie = "session=forged.value.here"
+    assert client.request("POST", "/api/hint")[0] == 404
+
+def test_lifespan_flushes_store(engine, tmp_path):
+    """Tests that server shutdown writes pending games."""
+    store = GameStore(str(tmp_path / "games.sqlite3"), flush_interval=0, encode=encode_state, decode=decode_state)
+    app = create_asgi_app(create_app({'TESTING': True}, engine=engine, game_store=store))
+    Client(app).request("POST", "/api/game")
+    events = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+    sent = []
+
+    async def receive():
+        return events.pop(0)
+
+    async def send(message):
+        sent.append(message['type'])
+
+    asyncio.run(app({'type': 'lifespan'}, receive, send))
+    assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+    reopened = GameStore(str(tmp_path / "games.sqlite3"), flush_interval=0)
+    assert reopened._db.execute("SELECT COUNT(*) FROM games").fetchone()[0] == 1
+    reopened.close()
+
+def test_game_actions_run_off_the_event_loop(app, game_store, monkeypatch):
+    """Tests that store calls, which may wait on SQLite, never run on the event loop's thread."""
+    loop_threads, store_threads = [], []
+    real_put = game_store.put
+
+    def put(game_id, state):
+        store_threads.append(threading.get_ident())
+        real_put(game_id, state)
+
+    monkeypatch.setattr(game_store, 'put', put)
+    asgi_app = create_asgi_app(app)
+
+    async def spy(scope, receive, send):
+        loop_threads.append(threading.get_ident())
+        await asgi_app(scope, receive, send)
+
+    client = Client(spy)
+    assert client.request("POST", "/api/game", {})[0] == 200
+    assert client.request("POST", "/api/guess", {'guess': 'slate'})[0] == 200
+    assert store_threads and loop_threads[0] not in store_threads
+
+def test_metrics_endpoint(app):
+    """Tests that the ASGI app serves /metrics and records its API requests per route."""
+    asgi_app = create_asgi_app(app)
+    client = Client(asgi_app)
+    client.request("POST", "/api/game", {})
+    client.request("GET", "/nowhere")
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b"", 'more_body': False}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'method': 'GET', 'path': '/metrics', 'query_string': b"", 'headers': []}
+    asyncio.run(asgi_app(scope, receive, send))
+    assert sent[0]['status'] == 200
+    assert dict(sent[0]['headers'])[b"content-type"].startswith(b"text/plain")
+    text = sent[1]['body'].decode()
+    assert 'wordle_http_request_duration_seconds_count{route="/api/game",method="POST",status="200"}' in text
+    assert 'route="unmatched",method="GET",status="404"' in text
+
+def test_bot_api(app, game_store):
+    """Tests that the bot API streams the same results as the Flask route."""
+    client = Client(create_asgi_app(app))
+    status, body = client.request('POST', '/api/bot/games', {'count': 2})
+    assert status == 200 and client.cookie is None
+    first, second = body['game_ids']
+    state = game_store.get(first)
+    state['target_word'] = 'CRANE'
+    game_store.put(first, state)
+    moves = [{'game_id': first, 'guess': 'slate'}, {'game_id': first, 'guess': 'crane'},
+             {'game_id': second, 'guess': 'abc'}]
+    status, body = client.request('POST', '/api/bot/guesses', {'moves': moves})
+    assert status == 200
+    assert [result.get('feedback') for result in body['results']] == ['__*_*', '*****', None]
+    assert body['results'][2]['message'] == "Guess must be exactly 5 letters long."
+
+def test_bot_batches_run_off_the_event_loop(app, monkeypatch):
+    """Tests that a batch is both played and serialized outside the event loop's thread."""
+    threads = {'batch': [], 'chunks': []}
+    real_guess_batch, real_stream_results = game_api.guess_batch, game_api._stream_results
+
+    def guess_batch(*args):
+        threads['batch'].append(threading.get_ident())
+        return real_guess_batch(*args)
+
+    def stream_results(results):
+        for chunk in real_stream_results(results):
+            threads['chunks'].append(threading.get_ident())
+            yield chunk
+
+    monkeypatch.setattr(game_api, 'guess_batch', guess_batch)
+    monkeypatch.setattr(game_api, '_stream_results', stream_results)
+    asgi_app = create_asgi_app(app)
+    loop_threads = []
+
+    async def spy(scope, receive, send):
+        loop_threads.append(threading.get_ident())
+        await asgi_app(scope, receive, send)
+
+    client = Client(spy)
+    game_id, = client.request('POST', '/api/bot/games', {'count': 1})[1]['game_ids']
+    status, body = client.request('POST', '/api/bot/guesses', {'moves': [{'game_id': game_id, 'guess': 'slate'}]})
+    assert status == 200 and body['results'][0]['valid']
+    assert threads['batch'] and threads['chunks']
+    assert loop_threads[-1] not in threads['batch'] + threads['chunks']
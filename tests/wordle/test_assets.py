@@ -0,0 +1,75 @@
+import gzip
+import os
+import pytest
+from src.wordle.assets import STATIC_DIR, build_assets, fingerprinted_name
+
+@pytest.fixture
+def dist_dir(tmp_path):
+    build_assets(STATIC_DIR, str(tmp_path))
+    return tmp_path
+
+def make_client(make_app, asset_dir):
+    return make_app(WORDLE_ASSET_DIR=str(asset_dir)).test_client()
+
+def test_build_fingerprints_and_compresses(dist_dir):
+    """Tests that each static file gets a content-hashed copy plus a smaller gzip copy."""
+    manifest = build_assets(STATIC_DIR, str(dist_dir)) # Rebuilding is stable
+    with open(os.path.join(STATIC_DIR, 'css', 'style.css'), 'rb') as f:
+        css = f.read()
+    assert manifest['css/style.css'] == fingerprinted_name('css/style.css', css)
+    assert manifest['css/style.css'].startswith('css/style.') and 'js/game.js' in manifest
+    assert not any(name.startswith('dist/') for name in manifest)
+    hashed = dist_dir / manifest['css/style.css']
+    assert hashed.read_bytes() == css
+    compressed = (dist_dir / (manifest['css/style.css'] + '.gz')).read_bytes()
+    assert len(compressed) < len(css) and gzip.decompress(compressed) == css
+    assert fingerprinted_name('css/style.css', css + b' ') != manifest['css/style.css']
+
+def test_page_links_fingerprinted_assets(make_app, dist_dir):
+    """Tests that pages link the hashed files, which are served precompressed and immutable."""
+    client = make_client(make_app, dist_dir)
+    page = client.get('/').get_data(as_text=True)
+    manifest = build_assets(STATIC_DIR, str(dist_dir))
+    css_url = f"/assets/{manifest['css/style.css']}"
+    assert css_url in page and f"/assets/{manifest['js/game.js']}" in page
+    assert '<style>' not in page # Moved into the cached stylesheet
+
+    plain = client.get(css_url)
+    assert plain.status_code == 200 and plain.mimetype == 'text/css'
+    assert 'Content-Encoding' not in plain.headers
+    assert 'immutable' in plain.headers['Cache-Control'] and 'max-age=31536000' in plain.headers['Cache-Control']
+    assert 'Accept-Encoding' in plain.headers['Vary']
+
+    compressed = client.get(css_url, headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert compressed.mimetype == 'text/css'
+    assert gzip.decompress(compressed.get_data()) == plain.get_data()
+    assert client.get('/assets/css/missing.0123456789.css').status_code == 404
+    assert client.get('/assets/../app.py').status_code == 404
+
+def test_unbuilt_assets_fall_back_to_static(make_app, tmp_path):
+    client = make_client(make_app, tmp_path / 'not-built')
+    page = client.get('/').get_data(as_text=True)
+    assert '/static/css/style.css' in page and '/static/js/game.js' in page
+
+def test_pages_are_compressed_when_accepted(make_app, dist_dir):
+    """Tests gzip on rendered pages, and that small responses are left alone."""
+    client = make_client(make_app, dist_dir)
+    plain = client.get('/')
+    assert 'Content-Encoding' not in plain.headers
+    page = client.get('/?from_redirect=1', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert page.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in page.headers['Vary']
+    html = gzip.decompress(page.get_data())
+    assert b'<title>Wordle</title>' in html
+    assert len(page.get_data()) < len(html) / 2
+    small = client.get('/api/game', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in small.headers
+    assert small.get_json()['guesses'] == []
+
+def test_brotli_preferred_when_installed(make_app, dist_dir):
+    brotli = pytest.importorskip('brotli')
+    client = make_client(make_app, dist_dir)
+    page = client.get('/', headers={'Accept-Encoding': 'gzip, br'})
+    assert page.headers['Content-Encoding'] == 'br'
+    assert b'<title>Wordle</title>' in brotli.decompress(page.get_data())
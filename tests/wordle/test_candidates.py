@@ -0,0 +1,84 @@
+import pytest
+from src.wordle.candidates import CandidateIndex, CandidateSet
+from src.wordle.evaluator import Evaluator
+
+WORDS = ["abbey", "apple", "array", "babel", "crane", "eerie", "level", "sassy", "teeth", "tests"]
+
+@pytest.fixture
+def index():
+    """Provides a CandidateIndex over a small dictionary with many repeated letters."""
+    return CandidateIndex(WORDS)
+
+def consistent_words(guesses, target):
+    """Brute force: the words that give the same feedback as `target` for every guess."""
+    evaluator = Evaluator()
+    return [
+        word for word in WORDS
+        if all(evaluator.evaluate_pattern(word, guess) == evaluator.evaluate_pattern(target, guess)
+               for guess in guesses)
+    ]
+
+def test_new_set_holds_every_word(index):
+    """Tests that a fresh CandidateSet contains the whole dictionary."""
+    candidates = CandidateSet(index)
+    assert candidates.count == len(WORDS)
+    assert candidates.words() == WORDS
+
+@pytest.mark.parametrize("target", WORDS)
+def test_single_guess_matches_brute_force(index, target):
+    """Tests every guess/target pair against a brute-force consistency scan."""
+    evaluator = Evaluator()
+    for guess in WORDS:
+        candidates = CandidateSet(index)
+        candidates.apply(guess, evaluator.evaluate_pattern(target, guess))
+        assert candidates.words() == consistent_words([guess], target), f"guess {guess}"
+        assert target in candidates.words()
+
+def test_incremental_narrowing(index):
+    """Tests that applying guesses one at a time keeps narrowing the set."""
+    evaluator = Evaluator()
+    candidates = CandidateSet(index)
+    counts = []
+    for guess in ["eerie", "level", "babel"]:
+        candidates.apply(guess, evaluator.evaluate_pattern("abbey", guess))
+        counts.append(candidates.count)
+    assert counts == sorted(counts, reverse=True)
+    assert candidates.words() == consistent_words(["eerie", "level", "babel"], "abbey")
+    assert WORDS.index("abbey") in candidates
+
+def test_from_history_accepts_session_feedback(index):
+    """Tests building from session-style uppercase guesses and stored feedback."""
+    evaluator = Evaluator()
+    feedback = [int(evaluator.evaluate_pattern("sassy", "tests")), evaluator.evaluate_guess("sassy", "array")]
+    candidates = CandidateSet.from_history(index, ["TESTS", "ARRAY"], feedback)
+    assert candidates.words() == consistent_words(["tests", "array"], "sassy")
+
+def test_copy_is_independent(index):
+    """Tests that narrowing a copy leaves the original untouched."""
+    candidates = CandidateSet(index)
+    narrowed = candidates.copy()
+    narrowed.apply("crane", ["*"] * 5)
+    assert narrowed.words() == ["crane"]
+    assert len(candidates) == len(WORDS)
+
+@pytest.mark.parametrize("words", [["pepper", "papers", "zipper", "appear", "puppet"],
+                                   ["sentence", "pretence", "absences", "balloons"]])
+def test_other_word_lengths(words):
+    """Tests that the index takes its length from the words, for symbol lists and codes alike."""
+    length = len(words[0])
+    index = CandidateIndex(words)
+    evaluator = Evaluator(word_length=length)
+    for target in words:
+        for guess in words:
+            expected = [word for word in words if
+                        evaluator.evaluate_pattern(word, guess) == evaluator.evaluate_pattern(target, guess)]
+            by_symbols = CandidateSet(index)
+            by_symbols.apply(guess, evaluator.evaluate_guess(target, guess))
+            by_code = CandidateSet(index)
+            by_code.apply(guess, evaluator.evaluate_pattern(target, guess))
+            assert by_symbols.words() == by_code.words() == expected
+
+def test_mixed_word_lengths_are_refused():
+    """Tests that a dictionary must hold words of one length."""
+    with pytest.raises(ValueError):
+        CandidateIndex(["crane", "planet"])
@@ -0,0 +1,56 @@
+import pytest
+import os
+import tempfile
+from src.wordle.compiled_words import (
+    CompiledWordList, build_compiled_words, compiled_path_for, load_compiled_words
+)
+
+WORDS = ["apple", "brick", "chair", "crane", "table"]
+
+@pytest.fixture
+def word_source():
+    """Provides a text word list and removes any compiled file built from it."""
+    with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix=".txt") as tmp_file:
+        tmp_file.write("\n".join(WORDS))
+        file_path = tmp_file.name
+    yield file_path
+    os.remove(file_path)
+    if os.path.exists(compiled_path_for(file_path)):
+        os.remove(compiled_path_for(file_path))
+
+def test_compiled_list_round_trip(word_source):
+    """Tests that the compiled list reproduces the words, order and ids."""
+    compiled = CompiledWordList(build_compiled_words(WORDS, word_source))
+    assert len(compiled) == 5
+    assert list(compiled) == WORDS
+    assert compiled[-1] == "table"
+    assert compiled[1:3] == ["brick", "chair"]
+    for i, word in enumerate(WORDS):
+        assert compiled.get(word) == i
+        assert word in compiled
+
+def test_compiled_list_misses(word_source):
+    """Tests lookups for words that are not in the compiled list."""
+    compiled = CompiledWordList(build_compiled_words(WORDS, word_source))
+    assert compiled.get("grape") is None
+    assert compiled.get("apples") is None # Wrong length
+    assert compiled.get("") is None
+    assert "ápple" not in compiled # Non-ASCII
+    with pytest.raises(IndexError):
+        compiled[5]
+
+def test_load_compiled_words_missing_or_stale(word_source):
+    """Tests that load_compiled_words only returns an up-to-date list."""
+    assert load_compiled_words(word_source) is None # Not built yet
+    build_compiled_words(WORDS, word_source)
+    assert load_compiled_words(word_source) is not None
+    with open(word_source, 'a') as f:
+        f.write("\nzebra")
+    assert load_compiled_words(word_source) is None
+
+def test_load_compiled_words_rejects_garbage(word_source, caplog):
+    """Tests that a corrupt compiled file is ignored (with a warning) rather than raising."""
+    with open(compiled_path_for(word_source), 'wb') as f:
+        f.write(b"not a word list")
+    assert load_compiled_words(word_source) is None
+    assert "Ignoring compiled word list" in caplog.text
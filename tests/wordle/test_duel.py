@@ -0,0 +1,125 @@
+import asyncio
+import json
+import pytest
+from src.wordle.asgi import create_asgi_app
+from src.wordle.duel import MAX_RESYNCS, OUTBOX_SIZE, DuelError, DuelHub
+
+@pytest.fixture
+def hub(engine):
+    return DuelHub(engine)
+
+def drain(player):
+    """The messages queued for a player, decoded."""
+    messages = []
+    while not player.outbox.empty():
+        text = player.outbox.get_nowait()
+        messages.append(json.loads(text) if text is not None else None)
+    return messages
+
+def start_race(hub, target='CRANE'):
+    alice = hub.join(None, 'alice')
+    bob = hub.join(alice.room.room_id, 'bob')
+    alice.room.target_word = target
+    return alice, bob
+
+def test_race(hub):
+    """Tests that opponents see feedback but never letters, and the first to solve wins."""
+    alice, bob = start_race(hub)
+    assert [m['type'] for m in drain(alice)] == ['room', 'joined', 'start']
+    assert [m['type'] for m in drain(bob)] == ['room', 'start']
+
+    hub.handle(alice, '{"type": "guess", "guess": "slate"}')
+    assert drain(alice) == [{'type': 'result', 'guess': 'SLATE', 'feedback': '__*_*', 'attempts_left': 5,
+                             'won': False}]
+    progress, = drain(bob)
+    assert progress == {'type': 'progress', 'player': alice.player_id, 'feedback': '__*_*',
+                        'attempts_left': 5, 'won': False}
+
+    hub.handle(bob, '{"type": "guess", "guess": "zzzzz"}')
+    assert drain(bob)[0]['type'] == 'rejected' and drain(alice) == []
+    hub.handle(bob, '{"type": "guess", "guess": "crane"}')
+    finished = drain(alice)[-1]
+    assert finished == {'type': 'finished', 'winner': bob.player_id, 'target_word': 'CRANE'}
+    hub.handle(alice, '{"type": "guess", "guess": "crane"}')
+    assert drain(alice) == [{'type': 'error', 'error': "The race is over."}]
+
+def test_joining(hub):
+    """Tests that rooms refuse players once started, and close when empty."""
+    alice, bob = start_race(hub)
+    with pytest.raises(DuelError):
+        hub.join(alice.room.room_id, 'carol')
+    with pytest.raises(DuelError):
+        hub.join('no-such-room', 'carol')
+    with pytest.raises(DuelError):
+        hub.join(None, 'carol', size=9)
+    carol = hub.join(None, 'carol', size=3)
+    dave = hub.join(carol.room.room_id, 'dave')
+    assert not carol.room.started
+    hub.join(carol.room.room_id, 'erin')
+    assert carol.room.started and drain(dave)[-1] == {'type': 'start'}
+    hub.handle(alice, 'not json')
+    assert drain(alice)[-1]['type'] == 'error'
+    alice.room.leave(alice)
+    assert drain(bob)[-1] == {'type': 'left', 'player': alice.player_id}
+    bob.room.leave(bob)
+    assert alice.room.room_id not in hub.rooms
+
+def test_slow_client_is_resynced_then_dropped(hub):
+    """Tests that a client that stops reading gets one snapshot instead of a growing backlog."""
+    alice, bob = start_race(hub)
+    drain(bob)
+    for _ in range(OUTBOX_SIZE + 1):
+        alice.room.broadcast({'type': 'noise'}, exclude=alice)
+    sync, = drain(bob)
+    assert sync['type'] == 'sync' and sync['started'] and len(sync['players']) == 2
+    assert 'target_word' not in sync
+    for _ in range(MAX_RESYNCS * OUTBOX_SIZE + 1): # The reader never catches up
+        alice.room.broadcast({'type': 'noise'}, exclude=alice)
+    assert bob.closed and drain(bob) == [None]
+    assert not alice.closed and list(alice.room.players) == [alice.player_id]
+    assert drain(alice)[-1] == {'type': 'left', 'player': bob.player_id}
+
+def test_websocket_duel(app):
+    """Tests two players racing over the ASGI WebSocket endpoint."""
+    asgi_app = create_asgi_app(app)
+
+    class Socket:
+        def __init__(self, query):
+            self.incoming = asyncio.Queue()
+            self.sent = asyncio.Queue()
+            scope = {'type': 'websocket', 'path': '/ws/duel', 'query_string': query.encode(), 'headers': []}
+            self.incoming.put_nowait({'type': 'websocket.connect'})
+            self.task = asyncio.create_task(asgi_app(scope, self.incoming.get, self.sent.put))
+
+        async def receive(self):
+            message = await asyncio.wait_for(self.sent.get(), 1)
+            return json.loads(message['text']) if message['type'] == 'websocket.send' else message
+
+        def send(self, message):
+            self.incoming.put_nowait({'type': 'websocket.receive', 'text': json.dumps(message)})
+
+    async def race():
+        alice = Socket("name=alice")
+        assert (await alice.receive())['type'] == 'websocket.accept'
+        room = await alice.receive()
+        asgi_app.duels.rooms[room['room']].target_word = 'CRANE'
+        bob = Socket(f"name=bob&room={room['room']}")
+        await bob.receive()
+        assert (await bob.receive())['players'][0]['name'] == 'alice'
+        assert (await alice.receive())['type'] == 'joined'
+        assert (await alice.receive())['type'] == (await bob.receive())['type'] == 'start'
+        alice.send({'type': 'guess', 'guess': 'crane'})
+        assert (await alice.receive())['won'] is True
+        assert (await bob.receive())['feedback'] == '*****'
+        assert (await bob.receive())['type'] == 'finished'
+        for socket in (alice, bob):
+            socket.incoming.put_nowait({'type': 'websocket.disconnect'})
+            await socket.task
+        assert asgi_app.duels.rooms == {}
+
+        lost = Socket("room=nope")
+        await lost.receive()
+        assert (await lost.receive())['error'] == "No such room."
+        assert (await lost.receive()) == {'type': 'websocket.close', 'code': 1008}
+
+    asyncio.run(race())
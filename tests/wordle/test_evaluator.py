@@ -1,5 +1,6 @@
 import pytest
 from src.wordle.evaluator import Evaluator
+from src.wordle.feedback import FeedbackPattern
 
 @pytest.fixture
 def evaluator():
@@ -50,6 +51,13 @@ def test_evaluate_guess(evaluator, target, guess, expected):
     result = evaluator.evaluate_guess(target, guess)
     assert result == expected, f"Failed for Target: {target}, Guess: {guess}. Expected {expected}, Got {result}"
 
+@pytest.mark.parametrize("target, guess, expected", evaluate_test_cases)
+def test_evaluate_pattern(evaluator, target, guess, expected):
+    """Tests that evaluate_pattern returns the pattern id of the expected feedback."""
+    result = evaluator.evaluate_pattern(target, guess)
+    assert isinstance(result, FeedbackPattern)
+    assert result == FeedbackPattern.from_symbols(expected)
+
 # Test invalid input handling
 def test_evaluate_guess_invalid_length(evaluator):
     """Tests that evaluate_guess raises ValueError for incorrect lengths."""
@@ -60,4 +68,43 @@ def test_evaluate_guess_invalid_length(evaluator):
     with pytest.raises(ValueError):
         evaluator.evaluate_guess("four", "five")    # Both wrong length
     with pytest.raises(ValueError):
-        evaluator.evaluate_guess("", "")           # Empty strings 
\ No newline at end of file
+        evaluator.evaluate_guess("", "")           # Empty strings 
+
+
+# --- Tests for the vectorized batch API ---
+
+def feedback_code(feedback):
+    """Packs a feedback symbol list into its base-3 batch code."""
+    return FeedbackPattern.from_symbols(feedback)
+
+def test_evaluate_batch_matches_evaluate_guess(evaluator):
+    """Tests evaluate_batch against evaluate_guess on every case above, in one call."""
+    np = pytest.importorskip("numpy")
+    targets = Evaluator.encode_words([target for target, _, _ in evaluate_test_cases])
+    guesses = Evaluator.encode_words([guess for _, guess, _ in evaluate_test_cases])
+    codes = evaluator.evaluate_batch(targets, guesses)
+    assert codes.dtype == np.uint8
+    assert codes.tolist() == [feedback_code(expected) for _, _, expected in evaluate_test_cases]
+
+def test_evaluate_batch_one_guess_many_targets(evaluator):
+    """Tests scoring a single guess against the whole dictionary."""
+    pytest.importorskip("numpy")
+    from src.wordle.word_manager import WordManager
+    words = list(WordManager(use_compiled=False).word_list)
+    for guess in ["eerie", "sassy", "crane"]:
+        codes = evaluator.evaluate_batch(Evaluator.encode_words(words), Evaluator.encode_words([guess])[0])
+        expected = [feedback_code(evaluator.evaluate_guess(target, guess)) for target in words]
+        assert codes.tolist() == expected
+
+def test_evaluate_batch_invalid_input(evaluator):
+    """Tests that evaluate_batch rejects badly shaped or out-of-range input."""
+    np = pytest.importorskip("numpy")
+    targets = Evaluator.encode_words(["apple", "crane"])
+    with pytest.raises(ValueError):
+        evaluator.evaluate_batch(targets, targets[:1]) # Shape mismatch
+    with pytest.raises(ValueError):
+        evaluator.evaluate_batch(targets[:, :4], targets[0, :4]) # Not 5 letters
+    with pytest.raises(ValueError):
+        evaluator.evaluate_batch(targets, np.full(5, 26)) # Not a letter
+    with pytest.raises(ValueError):
+        Evaluator.encode_words(["apples"])
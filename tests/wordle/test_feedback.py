@@ -0,0 +1,64 @@
+import pytest
+from src.wordle.feedback import FeedbackPattern, WIN_PATTERN, as_pattern
+
+# Format: (symbols, expected pattern id); position i has weight 3**i
+pattern_cases = [
+    ("_____", 0),
+    ("+____", 1),
+    ("*____", 2),
+    ("_+___", 3),
+    ("____*", 162),
+    ("*+__*", 2 + 3 + 162),
+    ("*****", 242),
+]
+
+@pytest.mark.parametrize("symbols, expected", pattern_cases)
+def test_pattern_round_trip(symbols, expected):
+    """Tests converting symbol lists to pattern ids and back."""
+    pattern = FeedbackPattern.from_symbols(list(symbols))
+    assert pattern == expected
+    assert pattern.to_symbols() == list(symbols)
+    assert str(pattern) == symbols
+
+def test_all_patterns_round_trip():
+    """Tests that every id 0..242 maps to a distinct symbol list and back."""
+    seen = set()
+    for code in range(243):
+        symbols = "".join(FeedbackPattern(code).to_symbols())
+        assert FeedbackPattern.from_symbols(symbols) == code
+        seen.add(symbols)
+    assert len(seen) == 243
+
+def test_pattern_behaves_like_int():
+    """Tests that patterns compare and hash as their integer id."""
+    pattern = FeedbackPattern.from_symbols("*+__*")
+    assert isinstance(pattern, int)
+    assert pattern == 167
+    assert {167: "found"}[pattern] == "found"
+    assert FeedbackPattern.of(167) is pattern # Shared instances
+
+def test_pattern_helpers():
+    """Tests win detection and correct-position extraction."""
+    assert WIN_PATTERN.is_win
+    assert FeedbackPattern.from_symbols("*****") is WIN_PATTERN
+    assert not FeedbackPattern.from_symbols("****+").is_win
+    assert FeedbackPattern.from_symbols("*+__*").correct_positions() == (0, 4)
+    assert FeedbackPattern(0).correct_positions() == ()
+
+def test_as_pattern_accepts_ids_and_legacy_lists():
+    """Tests normalizing stored feedback from new and old sessions."""
+    assert as_pattern(167) == 167
+    assert as_pattern(["*", "+", "_", "_", "*"]) == 167
+
+def test_invalid_patterns():
+    """Tests that out-of-range ids and malformed symbol lists are rejected."""
+    with pytest.raises(ValueError):
+        FeedbackPattern(243)
+    with pytest.raises(ValueError):
+        FeedbackPattern(-1)
+    with pytest.raises(ValueError):
+        as_pattern(-1)
+    with pytest.raises(ValueError):
+        FeedbackPattern.from_symbols("****") # Too short
+    with pytest.raises(ValueError):
+        FeedbackPattern.from_symbols("**x**") # Unknown symbol
@@ -0,0 +1,60 @@
+import pytest
+import os
+
+np = pytest.importorskip("numpy")
+
+from src.wordle.evaluator import Evaluator
+from src.wordle.feedback_matrix import (
+    FeedbackMatrix, build_feedback_matrix, load_feedback_matrix, word_list_digest
+)
+
+WORDS = ["abbey", "apple", "array", "crane", "eerie", "sassy", "teeth", "tests"]
+
+def cache_files(cache_dir):
+    return sorted(os.listdir(cache_dir))
+
+def test_matrix_matches_evaluate_pattern():
+    """Tests every matrix cell against the scalar evaluator."""
+    evaluator = Evaluator()
+    matrix = build_feedback_matrix(WORDS, processes=1)
+    for g, guess in enumerate(WORDS):
+        for t, target in enumerate(WORDS):
+            assert matrix[g, t] == evaluator.evaluate_pattern(target, guess)
+
+def test_parallel_build_matches_serial(monkeypatch):
+    """Tests that splitting rows across worker processes gives the same matrix."""
+    monkeypatch.setattr("src.wordle.feedback_matrix.ROWS_PER_TASK", 3)
+    serial = build_feedback_matrix(WORDS, processes=1)
+    parallel = build_feedback_matrix(WORDS, processes=2)
+    assert np.array_equal(serial, parallel)
+
+def test_load_caches_and_memory_maps(tmp_path):
+    """Tests that the matrix is written once, keyed by the word list, then mapped."""
+    first = load_feedback_matrix(WORDS, cache_dir=tmp_path, processes=1)
+    assert cache_files(tmp_path) == [f"feedback_matrix_{word_list_digest(WORDS)}.npy"]
+    second = load_feedback_matrix(WORDS, cache_dir=tmp_path, processes=1)
+    assert isinstance(second.matrix, np.memmap)
+    assert not second.matrix.flags.writeable
+    assert np.array_equal(first.matrix, second.matrix)
+
+def test_load_rebuilds_when_word_list_changes(tmp_path):
+    """Tests that a changed dictionary gets a fresh matrix and the old one is removed."""
+    load_feedback_matrix(WORDS, cache_dir=tmp_path, processes=1)
+    changed = WORDS + ["zebra"]
+    matrix = load_feedback_matrix(changed, cache_dir=tmp_path, processes=1)
+    assert matrix.matrix.shape == (9, 9)
+    assert cache_files(tmp_path) == [f"feedback_matrix_{word_list_digest(changed)}.npy"]
+
+def test_evaluator_uses_matrix(tmp_path):
+    """Tests matrix lookups in Evaluator, with fallback for unknown words."""
+    matrix = load_feedback_matrix(WORDS, cache_dir=tmp_path, processes=1)
+    plain, cached = Evaluator(), Evaluator(feedback_matrix=matrix)
+    assert cached.evaluate_pattern("SASSY", "abbey") == plain.evaluate_pattern("sassy", "abbey")
+    assert cached.evaluate_guess("apple", "zzzzz") == ["_"] * 5 # Not in the matrix
+    with pytest.raises(ValueError):
+        cached.evaluate_pattern("apple", "apples")
+
+def test_matrix_shape_must_match_words():
+    """Tests that a matrix for a different word list is rejected."""
+    with pytest.raises(ValueError):
+        FeedbackMatrix(WORDS, np.zeros((2, 2), dtype=np.uint8))
@@ -0,0 +1,123 @@
+import pytest
+import sqlite3
+import threading
+from src.wordle.game_store import GameStore
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "games.sqlite3")
+
+def stored_ids(db_path):
+    """Reads the game ids actually written to SQLite."""
+    with sqlite3.connect(db_path) as db:
+        return sorted(row[0] for row in db.execute("SELECT game_id FROM games"))
+
+def test_put_get_and_write_behind(db_path):
+    """Tests that puts are served from memory and only written on flush."""
+    store = GameStore(db_path, flush_interval=0)
+    store.put("a", {"guesses": ["CRANE"], "feedback": [80]})
+    assert store.get("a") == {"guesses": ["CRANE"], "feedback": [80]}
+    assert stored_ids(db_path) == [] # Not written yet
+    assert store.flush() == 1
+    assert stored_ids(db_path) == ["a"]
+    assert store.flush() == 0 # Nothing left to write
+    store.close()
+
+def test_games_survive_restart(db_path):
+    """Tests that flushed games load from SQLite in a new store."""
+    store = GameStore(db_path, flush_interval=0)
+    store.put("a", {"attempts_left": 5})
+    store.close() # Flushes
+    reopened = GameStore(db_path, flush_interval=0)
+    assert reopened.get("a") == {"attempts_left": 5}
+    assert reopened.get("missing") is None
+    reopened.close()
+
+def test_lru_eviction_keeps_unwritten_games(db_path):
+    """Tests that evicted games are still readable before and after they are written."""
+    store = GameStore(db_path, capacity=2, flush_interval=0)
+    for game_id in "abc":
+        store.put(game_id, {"id": game_id})
+    assert list(store._cache) == ["b", "c"]
+    assert store.get("a") == {"id": "a"} # From the dirty set
+    store.flush()
+    for game_id in "abcd":
+        store.get(game_id)
+    assert store.get("b") == {"id": "b"} # Reloaded from SQLite
+    assert len(store._cache) == 2
+    store.close()
+
+def test_delete(db_path):
+    """Tests that deleted games disappear from memory and disk."""
+    store = GameStore(db_path, flush_interval=0)
+    store.put("a", {"id": "a"})
+    store.flush()
+    store.delete("a")
+    assert store.get("a") is None
+    store.flush()
+    assert stored_ids(db_path) == []
+    store.close()
+
+def test_background_flush_and_batch_trigger(db_path):
+    """Tests that the background thread writes once a batch fills up."""
+    store = GameStore(db_path, flush_interval=60, flush_batch=3)
+    for i in range(3):
+        store.put(f"g{i}", {"i": i})
+    for _ in range(100):
+        if stored_ids(db_path) == ["g0", "g1", "g2"]:
+            break
+        threading.Event().wait(0.02)
+    assert stored_ids(db_path) == ["g0", "g1", "g2"]
+    store.close()
+
+def test_prune_old_games(db_path):
+    """Tests removing games that have not been updated recently."""
+    store = GameStore(db_path, flush_interval=0)
+    store.put("a", {"id": "a"})
+    store.flush()
+    assert store.prune(3600) == 0
+    assert store.prune(-1) == 1
+    store.close()
+
+def test_new_game_ids_are_unique():
+    """Tests that game ids are random and cookie-sized."""
+    ids = {GameStore.new_game_id() for _ in range(100)}
+    assert len(ids) == 100
+    assert all(len(game_id) == 22 for game_id in ids)
+
+def test_read_does_not_cache_over_a_newer_state(db_path):
+    """Tests that a row read from SQLite never replaces a state stored (and written) while it was read."""
+    store = GameStore(db_path, flush_interval=0)
+    store.put("a", {"version": 1})
+    store.flush()
+    store._cache.clear()
+    real_db, real_lock = store._db, store._lock
+    read_done = threading.Event()
+
+    class Connection: # Flags the SELECT of the stale row
+        def __getattr__(self, name):
+            return getattr(real_db, name)
+        def execute(self, sql, *args):
+            if sql.startswith("SELECT state"):
+                read_done.set()
+            return real_db.execute(sql, *args)
+        def __enter__(self):
+            return real_db.__enter__()
+        def __exit__(self, *exc):
+            return real_db.__exit__(*exc)
+
+    class Lock: # Another request's put and flush land between the read and the cache update
+        def __enter__(self):
+            if read_done.is_set():
+                read_done.clear()
+                store.put("a", {"version": 2})
+                store.flush()
+            return real_lock.__enter__()
+        def __exit__(self, *exc):
+            return real_lock.__exit__(*exc)
+
+    store._db, store._lock = Connection(), Lock()
+    assert store.get("a") == {"version": 2}
+    assert store.get("a") == {"version": 2} # Cached copy is the newer one
+    store._db, store._lock = real_db, real_lock
+    store.close()
@@ -0,0 +1,88 @@
+import io
+import json
+import logging
+import threading
+import time
+import pytest
+from src.wordle.log_pipeline import LogPipeline, parse_sample_rates
+
+class BlockingStream(io.StringIO):
+    """A stream whose writes wait until `release` is set."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, text):
+        self.release.wait()
+        return super().write(text)
+
+@pytest.fixture
+def logger():
+    logger = logging.getLogger("test.log_pipeline")
+    logger.propagate = False
+    yield logger
+    logger.handlers.clear()
+
+def records(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+def test_writes_json_records(logger):
+    """Tests that records are written as JSON lines with their extra fields, after stop()."""
+    stream = io.StringIO()
+    pipeline = LogPipeline(stream=stream).install(logger)
+    logger.info("Guess %s", "CRANE", extra={'event': 'guess', 'attempts_left': 5})
+    try:
+        raise KeyError("boom")
+    except KeyError:
+        logger.exception("Failed")
+    pipeline.stop()
+    guess, failure = records(stream)
+    assert guess['message'] == "Guess CRANE"
+    assert guess['level'] == "INFO" and guess['logger'] == "test.log_pipeline"
+    assert guess['event'] == "guess" and guess['attempts_left'] == 5
+    assert guess['time'].endswith("+00:00")
+    assert failure['level'] == "ERROR" and "KeyError: 'boom'" in failure['exc_info']
+
+def test_full_queue_drops_instead_of_blocking(logger):
+    """Tests that a full queue drops records, counts them and reports the loss later."""
+    stream = BlockingStream()
+    pipeline = LogPipeline(stream=stream, queue_size=2).install(logger)
+    for i in range(10):
+        logger.info("Record %d", i) # Must not block while the writer is stuck
+    assert 6 <= pipeline.handler.dropped <= 8 # The writer may have taken 0-2 records off the queue
+    dropped = pipeline.handler.dropped
+    stream.release.set()
+    while pipeline.handler.queue.qsize(): # Let the writer catch up
+        time.sleep(0.001)
+    logger.info("After")
+    pipeline.stop()
+    written = records(stream)
+    assert len(written) == 10 - dropped + 2 # Kept records, the drop report, "After"
+    report = next(r for r in written if r.get('event') == 'log_records_dropped')
+    assert report['level'] == "WARNING" and report['dropped'] == dropped
+    assert written[-1]['message'] == "After"
+
+def test_sampling_by_event(logger):
+    """Tests per-event sample rates; warnings and other events are always kept."""
+    stream = io.StringIO()
+    pipeline = LogPipeline(stream=stream, sample_rates={'guess': 0.0, 'hint': 1.0, 'view': 0.5}).install(logger)
+    for _ in range(200):
+        logger.info("g", extra={'event': 'guess'})
+        logger.info("v", extra={'event': 'view'})
+    logger.info("h", extra={'event': 'hint'})
+    logger.info("other")
+    logger.warning("bad guess", extra={'event': 'guess'})
+    pipeline.stop()
+    written = records(stream)
+    assert [r['message'] for r in written if r['message'] != "v"] == ["h", "other", "bad guess"]
+    views = [r for r in written if r['message'] == "v"]
+    assert 50 < len(views) < 150
+    assert all(r['sample_rate'] == 0.5 for r in views)
+    assert 'sample_rate' not in written[-1]
+
+def test_parse_sample_rates():
+    assert parse_sample_rates(None) == {}
+    assert parse_sample_rates("guess=0.1, hint=2,") == {'guess': 0.1, 'hint': 1.0}
+    with pytest.raises(ValueError):
+        parse_sample_rates("guess")
@@ -0,0 +1,105 @@
+import threading
+import pytest
+from src.wordle import metrics
+from src.wordle.metrics import Registry
+
+def sample(text, line_start):
+    """The value of the first exposition line starting with `line_start`."""
+    for line in text.splitlines():
+        if line.startswith(line_start):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+def test_counter_merges_thread_shards():
+    """Tests that increments from many threads are all counted at scrape time."""
+    registry = Registry()
+    calls = registry.counter('calls_total', "Calls.", ['kind'])
+    a, b = calls.labels('a'), calls.labels('b')
+
+    def work():
+        for _ in range(1000):
+            a.inc()
+        b.inc(5)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    text = registry.render()
+    assert '# TYPE calls_total counter' in text
+    assert sample(text, 'calls_total{kind="a"}') == 8000
+    assert sample(text, 'calls_total{kind="b"}') == 40
+    # Shards of the finished threads were retired, without losing their counts
+    assert registry._shards._live == []
+    a.inc()
+    assert sample(registry.render(), 'calls_total{kind="a"}') == 8001
+
+def test_histogram_buckets_are_cumulative():
+    """Tests bucket boundaries (upper bounds inclusive), +Inf, sum and count."""
+    registry = Registry()
+    sizes = registry.histogram('size_bytes', "Sizes.", buckets=(10, 100))
+    for value in (5, 10, 50, 1000):
+        sizes.observe(value)
+    text = registry.render()
+    assert sample(text, 'size_bytes_bucket{le="10.0"}') == 2
+    assert sample(text, 'size_bytes_bucket{le="100.0"}') == 3
+    assert sample(text, 'size_bytes_bucket{le="+Inf"}') == 4
+    assert sample(text, 'size_bytes_sum') == 1065
+    assert sample(text, 'size_bytes_count') == 4
+
+def test_registry_reuses_metrics_and_checks_labels():
+    """Tests that metrics are shared by name and that label counts are checked."""
+    registry = Registry()
+    assert registry.counter('x_total', "X.", ['a']) is registry.counter('x_total', "X.", ['a'])
+    with pytest.raises(ValueError):
+        registry.counter('x_total', "X.").labels('a', 'b')
+    registry.gauge('depth', "Depth.", lambda: 3)
+    assert sample(registry.render(), 'depth') == 3
+
+def test_render_while_labels_are_added():
+    """Tests that a scrape is safe while other threads create new label children."""
+    registry = Registry()
+    routes = registry.counter('routes_total', "Routes.", ['route'])
+    latency = registry.histogram('route_seconds', "Latency.", ['route'], buckets=(1,))
+
+    def add_children():
+        for i in range(20000):
+            routes.labels(f"/r{i}").inc()
+            latency.labels(f"/r{i}").observe(0.5)
+
+    thread = threading.Thread(target=add_children)
+    thread.start()
+    while thread.is_alive():
+        registry.render()
+    thread.join()
+    assert sample(registry.render(), 'routes_total{route="/r19999"}') == 1
+
+def test_label_values_are_escaped():
+    registry = Registry()
+    registry.counter('odd_total', "Odd.", ['v']).labels('say "hi"\n').inc()
+    assert 'odd_total{v="say \\"hi\\"\\n"} 1' in registry.render()
+
+def test_metrics_endpoint(client, game_store):
+    """Tests that /metrics reports request latency per route and the game counters."""
+    before = client.get('/metrics').get_data(as_text=True)
+    client.post('/api/game', json={})
+    client.post('/api/guess', json={'guess': 'slate'})
+    client.post('/api/guess', json={'guess': 'zzzzz'})
+    assert sample(client.get('/metrics').get_data(as_text=True), 'wordle_games_pending_writes') == 1
+    game_store.flush() # Active games are counted from the database
+    response = client.get('/metrics')
+    assert response.content_type == metrics.CONTENT_TYPE
+    text = response.get_data(as_text=True)
+
+    def delta(line_start):
+        return sample(text, line_start) - (sample(before, line_start) or 0)
+
+    assert delta('wordle_http_request_duration_seconds_count{route="/api/guess",method="POST",status="200"}') == 2
+    assert delta('wordle_guesses_total{result="valid"}') == 1
+    assert delta('wordle_guesses_total{result="not_a_word"}') == 1
+    assert delta('wordle_evaluation_seconds_count') == 1
+    assert sample(text, 'wordle_games_active') == 1
+    assert sample(text, 'wordle_games_cached') == 1
+    assert sample(text, 'wordle_games_pending_writes') == 0
+    assert sample(text, 'wordle_session_cookie_bytes_count') >= 1
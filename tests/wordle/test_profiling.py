@@ -0,0 +1,40 @@
+import os
+from src.wordle.profiling import FILE_HEADER, RequestProfiler, hot_spot_report, profile_files
+
+def make_client(make_app, tmp_path, **config):
+    return make_app(WORDLE_PROFILE_DIR=str(tmp_path), **config).test_client()
+
+def test_profiling_is_off_by_default(make_app, tmp_path):
+    client = make_client(make_app, tmp_path)
+    assert not isinstance(client.application.wsgi_app, RequestProfiler)
+    response = client.post('/api/game', json={}, headers={'X-Wordle-Profile': 'anything'})
+    assert FILE_HEADER not in response.headers
+    assert profile_files(str(tmp_path)) == []
+
+def test_header_with_token_profiles_request(make_app, tmp_path):
+    """Tests that only requests carrying the right token are profiled, and the file is named in the response."""
+    client = make_client(make_app, tmp_path, WORDLE_PROFILE_TOKEN='s3cret')
+    client.post('/api/game', json={})
+    assert FILE_HEADER not in client.post('/api/guess', json={'guess': 'slate'}).headers
+    assert FILE_HEADER not in client.post('/api/guess', json={'guess': 'slate'},
+                                          headers={'X-Wordle-Profile': 'wrong'}).headers
+
+    response = client.post('/api/guess', json={'guess': 'crane'}, headers={'X-Wordle-Profile': 's3cret'})
+    assert response.status_code == 200
+    assert response.get_json()['guess'] == 'CRANE' # The body is passed through unchanged
+    name = response.headers[FILE_HEADER]
+    assert name.endswith("ms.prof") and "-POST-api.guess-" in name
+    assert [os.path.basename(path) for path in profile_files(str(tmp_path))] == [name]
+
+    report = hot_spot_report(profile_files(str(tmp_path)), limit=500)
+    assert "1 profiled requests" in report
+    assert "POST /api/guess" in report
+    assert "apply_guess" in report
+
+def test_sampling_and_rotation(make_app, tmp_path):
+    """Tests that sample_rate=1 profiles every request and only the newest `keep` files remain."""
+    client = make_client(make_app, tmp_path, WORDLE_PROFILE_SAMPLE_RATE=1.0, WORDLE_PROFILE_KEEP=3)
+    names = [client.get('/api/game').headers[FILE_HEADER] for _ in range(5)]
+    kept = [os.path.basename(path) for path in profile_files(str(tmp_path))]
+    assert len(kept) == 3
+    assert set(kept) <= set(names)
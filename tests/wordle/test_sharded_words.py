@@ -0,0 +1,65 @@
+import pytest
+import itertools
+from src.wordle.evaluator import Evaluator
+from src.wordle.sharded_words import ShardedWordIndex
+
+COMBINED = ["four", "five", "tree", "apple", "crane", "banana", "cheese", "letters", "balloon", "sentence"]
+
+@pytest.fixture
+def index(tmp_path):
+    """Provides a ShardedWordIndex over a combined 4-8 letter dictionary."""
+    path = tmp_path / "combined.txt"
+    path.write_text("\n".join(COMBINED + ["ab", "extravagant"]))
+    return ShardedWordIndex(str(path))
+
+def test_shards_load_lazily(index):
+    """Tests that only requested lengths are loaded, each only once."""
+    assert index.loaded_lengths() == []
+    six = index.shard(6)
+    assert six.word_list == ["banana", "cheese"]
+    assert index.loaded_lengths() == [6]
+    assert index.shard(6) is six
+    assert index.shard(4).word_list == ["five", "four", "tree"]
+    assert index.loaded_lengths() == [4, 6]
+
+def test_validation_across_lengths(index):
+    """Tests validating words of every length against their own shard."""
+    assert index.is_valid_word("TREE") == True
+    assert index.is_valid_word("balloon") == True
+    assert index.is_valid_word("sentences") == False # Unsupported length
+    assert index.is_valid_word("ab") == False
+    assert index.is_valid_word("bananas") == False
+    assert index.loaded_lengths() == [4, 7]
+
+def test_unsupported_or_empty_lengths(index, tmp_path):
+    """Tests errors for lengths outside the range or without words."""
+    with pytest.raises(ValueError):
+        index.shard(11)
+    sparse = ShardedWordIndex(str(tmp_path / "combined.txt"), lengths=[4, 9])
+    with pytest.raises(ValueError):
+        sparse.shard(9)
+    with pytest.raises(ValueError):
+        sparse.shard(9) # Still an error, without re-reading the file
+
+def test_evaluator_per_length(index):
+    """Tests the length-generic evaluator on a 4-letter and an 8-letter pair."""
+    assert index.evaluator(4) is index.evaluator(4)
+    assert index.evaluator(4).evaluate_guess("four", "five") == ["*", "_", "_", "_"]
+    assert index.evaluator(8).evaluate_guess("sentence", "balloons") == ["_", "_", "_", "_", "_", "_", "+", "+"]
+    with pytest.raises(ValueError):
+        index.evaluator(4).evaluate_guess("apple", "crane")
+
+@pytest.mark.parametrize("length", [4, 6, 7, 8])
+def test_batch_matches_scalar_for_other_lengths(length):
+    """Tests evaluate_batch against evaluate_pattern for non-5-letter words."""
+    np = pytest.importorskip("numpy")
+    evaluator = Evaluator(word_length=length)
+    words = ["".join(letters) for letters in itertools.islice(
+        itertools.product("aabe", repeat=length), 0, None, 4 ** length // 60)]
+    encoded = Evaluator.encode_words(words, word_length=length)
+    for guess_id in range(0, len(words), 5):
+        codes = evaluator.evaluate_batch(encoded, encoded[guess_id])
+        assert codes.tolist() == [evaluator.evaluate_pattern(target, words[guess_id]) for target in words]
+    pairs = evaluator.evaluate_batch(encoded, encoded[::-1])
+    assert pairs.tolist() == [evaluator.evaluate_pattern(t, g) for t, g in zip(words, words[::-1])]
+    assert pairs.dtype == (np.uint8 if length <= 5 else np.uint16)
@@ -0,0 +1,70 @@
+import pytest
+import math
+from collections import Counter
+
+np = pytest.importorskip("numpy")
+
+from src.wordle.evaluator import Evaluator
+from src.wordle.feedback_matrix import load_feedback_matrix
+from src.wordle.solver import Solver
+from src.wordle.word_manager import WordManager
+
+WORDS = ["abbey", "apple", "array", "babel", "crane", "eerie", "level", "sassy", "teeth", "tests"]
+
+@pytest.fixture
+def manager():
+    """Provides a WordManager over a small in-memory dictionary."""
+    manager = WordManager.__new__(WordManager)
+    manager.word_list = WORDS
+    return manager
+
+def brute_force_entropy(guess, candidates):
+    """Entropy (bits) of the feedback distribution for a guess, computed directly."""
+    evaluator = Evaluator()
+    counts = Counter(evaluator.evaluate_pattern(target, guess) for target in candidates)
+    total = len(candidates)
+    return -sum(c / total * math.log2(c / total) for c in counts.values())
+
+def test_opening_ranking_matches_brute_force(manager):
+    """Tests entropy scores and ordering against a direct computation."""
+    ranking = Solver(manager, processes=1).rank_guesses(top=len(WORDS))
+    assert sorted(word for word, _ in ranking) == sorted(WORDS)
+    for word, score in ranking:
+        assert score == pytest.approx(brute_force_entropy(word, WORDS))
+    scores = [score for _, score in ranking]
+    assert scores == sorted(scores, reverse=True)
+
+def test_expected_remaining_metric(manager):
+    """Tests that expected_remaining ranks lowest first and averages bucket sizes."""
+    ranking = Solver(manager, processes=1).rank_guesses(metric="expected_remaining", top=len(WORDS))
+    scores = [score for _, score in ranking]
+    assert scores == sorted(scores)
+    evaluator = Evaluator()
+    word, score = ranking[0]
+    counts = Counter(evaluator.evaluate_pattern(target, word) for target in WORDS)
+    assert score == pytest.approx(sum(c * c for c in counts.values()) / len(WORDS))
+
+def test_solver_follows_history(manager):
+    """Tests that the solver names the answer once only one candidate remains."""
+    evaluator = Evaluator()
+    solver = Solver(manager, processes=1)
+    guesses = ["eerie", "level"]
+    feedback = [evaluator.evaluate_pattern("teeth", guess) for guess in guesses]
+    assert solver.best_guess(guesses, feedback) == "teeth"
+    assert solver.best_guess(["crane"], [["*"] * 4 + ["_"]]) is None # Nothing fits
+
+def test_parallel_and_matrix_match_serial(manager, monkeypatch, tmp_path):
+    """Tests that the process pool and the feedback matrix give the same ranking."""
+    serial = Solver(manager, processes=1).rank_guesses(top=len(WORDS))
+    monkeypatch.setattr("src.wordle.solver.PARALLEL_THRESHOLD", 0)
+    monkeypatch.setattr("src.wordle.solver.GUESSES_PER_TASK", 3)
+    with Solver(manager, processes=2) as solver:
+        assert solver.rank_guesses(top=len(WORDS)) == serial
+    matrix = load_feedback_matrix(WORDS, cache_dir=tmp_path, processes=1)
+    with Solver(manager, feedback_matrix=matrix, processes=2) as solver:
+        assert solver.rank_guesses(top=len(WORDS)) == serial
+
+def test_unknown_metric(manager):
+    """Tests that an unknown metric is rejected."""
+    with pytest.raises(ValueError):
+        Solver(manager, processes=1).rank_guesses(metric="luck")
@@ -0,0 +1,109 @@
+import json
+import pytest
+from src.wordle.state_codec import (
+    HEADER, decode_state, describe_message, encode_state, pack_word, unpack_word,
+)
+from src.wordle.game_store import GameStore
+
+def make_state(**overrides):
+    state = {
+        'target_word': 'CRANE',
+        'guesses': ['SLATE', 'CRONY'],
+        'feedback': [180, 62],
+        'attempts_left': 4,
+        'message': 'next_guess',
+        'game_over': False,
+        'win': False,
+        'difficulty': 'easy',
+        'allowed_hints': 2,
+        'hints_used': 1,
+    }
+    state.update(overrides)
+    return state
+
+def test_pack_word_round_trip():
+    """Tests that words pack into 25 bits and unpack uppercase."""
+    for word in ["AAAAA", "ZZZZZ", "crane", "Wordy"]:
+        packed = pack_word(word)
+        assert packed < 1 << 25
+        assert unpack_word(packed) == word.upper()
+    with pytest.raises(ValueError):
+        pack_word("CRANES")
+    with pytest.raises(ValueError):
+        pack_word("CR4NE")
+
+def test_round_trip():
+    """Tests that every field survives encoding."""
+    state = make_state()
+    assert decode_state(encode_state(state)) == state
+
+@pytest.mark.parametrize("message, argument", [("not_a_word", "QWXYZ"), ("hint", 3), ("win", None)])
+def test_message_arguments_round_trip(message, argument):
+    """Tests that message keys keep their argument."""
+    state = make_state(message=message)
+    if argument is not None:
+        state['message_arg'] = argument
+    assert decode_state(encode_state(state)) == state
+
+def test_stale_message_argument_dropped():
+    """Tests that an argument left from an earlier message does not break encoding."""
+    state = make_state(message='bad_length', message_arg='QWXYZ')
+    assert 'message_arg' not in decode_state(encode_state(state))
+
+def test_much_smaller_than_json():
+    """Tests the encoded size: a 14-byte header plus 5 bytes per guess."""
+    state = make_state()
+    encoded = encode_state(state)
+    assert len(encoded) == HEADER.size + 5 * len(state['guesses'])
+    assert len(encoded) * 5 < len(json.dumps(state, separators=(",", ":")))
+
+def test_describe_message():
+    """Tests that display text is derived from the stored key and state."""
+    assert describe_message(make_state(message='first_guess')) == "Enter your first guess!"
+    assert describe_message(make_state(message='win')) == \
+        "Congratulations! You guessed the word 'CRANE' in 2 tries!"
+    assert describe_message(make_state(message='hint', message_arg=0)) == \
+        "Hint: Letter at position 1 is 'C'."
+    assert describe_message(make_state(message='not_a_word', message_arg='QWXYZ')) == \
+        '"QWXYZ" is not a valid word in the dictionary.'
+    assert describe_message(make_state(message='Some legacy text')) == "Some legacy text"
+
+def test_legacy_dict_state_encodes():
+    """Tests that an old-style state (symbol feedback, message text, missing fields) still encodes."""
+    legacy = {
+        'target_word': 'CRANE',
+        'guesses': ['SLATE'],
+        'feedback': [['_', '_', '*', '_', '*']],
+        'attempts_left': 5,
+        'message': "Enter your next guess.",
+        'game_over': False,
+        'win': False,
+    }
+    state = decode_state(encode_state(legacy))
+    assert state['feedback'] == [180]
+    assert state['message'] == 'next_guess'
+    assert state['difficulty'] == 'medium'
+    assert state['hints_used'] == 0
+
+def test_json_rows_still_decode():
+    """Tests that states stored as JSON before the codec still load."""
+    state = make_state()
+    assert decode_state(json.dumps(state)) == state
+    assert decode_state(json.dumps(state).encode()) == state
+
+def test_corrupt_data_rejected():
+    """Tests that truncated, mismatched or unknown-version data raises ValueError."""
+    encoded = encode_state(make_state())
+    for bad in [b"", encoded[:10], encoded[:-1], encoded + b"x", b"\x09" + encoded[1:]]:
+        with pytest.raises(ValueError):
+            decode_state(bad)
+
+def test_game_store_with_codec(tmp_path):
+    """Tests that the store writes codec bytes and reads them back after a restart."""
+    path = str(tmp_path / "games.sqlite3")
+    store = GameStore(path, flush_interval=0, encode=encode_state, decode=decode_state)
+    store.put("a", make_state())
+    store.close()
+    reopened = GameStore(path, flush_interval=0, encode=encode_state, decode=decode_state)
+    assert reopened.get("a") == make_state()
+    reopened.close()
@@ -0,0 +1,67 @@
+import pytest
+from src.wordle.stats_store import StatsStore
+
+GAMES = [
+    ('ann', 'medium', True, 3), ('ann', 'medium', True, 4), ('ann', 'medium', False, 6),
+    ('ann', 'medium', True, 2), ('bob', 'hard', True, 2), ('cat', 'easy', True, 5),
+    ('cat', 'easy', True, 5), ('dan', 'easy', False, 8),
+]
+
+@pytest.fixture(params=[False, True], ids=['cached', 'shared'])
+def stats(request, tmp_path):
+    store = StatsStore(str(tmp_path / "stats.sqlite3"), flush_interval=0, leaderboard_size=2, shared=request.param)
+    for game in GAMES:
+        store.record(*game)
+    if store.shared:
+        assert store.pending_count() == len(GAMES) # Queued, not written on the caller's thread
+        store.flush() # Reads only see written games
+    yield store
+    store.close()
+
+def test_player_stats(stats):
+    """Tests the incrementally kept games, wins, streaks and distribution of one player."""
+    ann = stats.player_stats('ann')
+    assert (ann['played'], ann['wins'], ann['win_rate']) == (4, 3, 0.75)
+    assert (ann['current_streak'], ann['max_streak']) == (1, 2)
+    assert ann['distribution'] == {1: 0, 2: 1, 3: 1, 4: 1, 5: 0, 6: 0, 7: 0, 8: 0}
+    assert stats.player_stats('nobody')['played'] == 0
+
+def test_difficulty_stats(stats):
+    """Tests the per-difficulty win rates and guess distributions over every player."""
+    by_difficulty = stats.difficulty_stats()
+    assert by_difficulty['medium']['win_rate'] == 0.75
+    assert by_difficulty['easy']['played'] == 3 and by_difficulty['easy']['distribution'][5] == 2
+    assert by_difficulty['hard']['wins'] == 1
+
+def test_leaderboard(stats):
+    """Tests that the board ranks by wins, then fewest guesses, and keeps only the top players."""
+    board = stats.leaderboard(10)
+    assert [(entry['rank'], entry['player'], entry['wins']) for entry in board] == [(1, 'ann', 3), (2, 'cat', 2)]
+    assert board[0]['average_guesses'] == 3.0 and board[1]['win_rate'] == 1.0
+    for _ in range(4):
+        stats.record('bob', 'hard', True, 1)
+    stats.flush()
+    assert [entry['player'] for entry in stats.leaderboard()] == ['bob', 'ann']
+    assert stats.leaderboard(1)[0]['wins'] == 5
+
+def test_reopen(tmp_path):
+    """Tests that written aggregates are read back, and unwritten games count before a flush."""
+    path = str(tmp_path / "stats.sqlite3")
+    store = StatsStore(path, flush_interval=0, capacity=1)
+    for game in GAMES:
+        store.record(*game)
+    assert store.pending_count() == len(GAMES)
+    assert store.player_stats('ann')['wins'] == 3 # Evicted from the cache, rebuilt from pending games
+    store.close()
+    reopened = StatsStore(path, flush_interval=0)
+    assert reopened.player_stats('ann')['max_streak'] == 2
+    assert reopened.difficulty_stats()['easy']['played'] == 3
+    assert reopened.leaderboard(1)[0]['player'] == 'ann'
+    assert reopened._db.execute("SELECT COUNT(*) FROM finished_games").fetchone()[0] == len(GAMES)
+    reopened.close()
+
+def test_rejects_impossible_outcomes(tmp_path):
+    store = StatsStore(str(tmp_path / "stats.sqlite3"), flush_interval=0)
+    with pytest.raises(ValueError):
+        store.record('ann', 'easy', True, 9)
+    store.close()
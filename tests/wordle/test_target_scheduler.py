@@ -0,0 +1,63 @@
+import pytest
+from src.wordle.target_scheduler import TargetScheduler
+from src.wordle.word_manager import WordManager
+
+@pytest.mark.parametrize("word_count", [1, 2, 3, 7, 64, 100, 5757])
+def test_no_repeats_until_exhausted(word_count):
+    """Tests that each shuffle deals every id exactly once."""
+    scheduler = TargetScheduler(word_count, seed=1234)
+    first = [scheduler.next_id() for _ in range(word_count)]
+    second = [scheduler.next_id() for _ in range(word_count)]
+    assert sorted(first) == list(range(word_count))
+    assert sorted(second) == list(range(word_count))
+
+def test_new_shuffle_after_exhaustion():
+    """Tests that the next round uses a different order."""
+    scheduler = TargetScheduler(100, seed=7)
+    first = [scheduler.next_id() for _ in range(100)]
+    second = [scheduler.next_id() for _ in range(100)]
+    assert first != second
+
+def test_seeds_give_different_orders():
+    """Tests that players with different seeds see different sequences."""
+    orders = {tuple(TargetScheduler(50, seed=seed).next_id() for _ in range(10)) for seed in range(5)}
+    assert len(orders) == 5
+
+def test_token_round_trip():
+    """Tests that a restored scheduler continues exactly where it left off."""
+    scheduler = TargetScheduler(5757)
+    drawn = [scheduler.next_id() for _ in range(10)]
+    token = scheduler.to_token()
+    assert len(token) <= 24
+    restored = TargetScheduler.from_token(token, 5757)
+    assert [restored.next_id() for _ in range(20)] == [scheduler.next_id() for _ in range(20)]
+    assert not set(drawn) & {TargetScheduler.from_token(token, 5757).next_id()}
+
+@pytest.mark.parametrize("token", [None, "", "not a token!", "AAAA", "AQAAAAAAAAAAAAAAAAAAAAAA"])
+def test_bad_tokens_start_fresh(token):
+    """Tests that missing or malformed tokens give a working new schedule."""
+    scheduler = TargetScheduler.from_token(token, 10)
+    assert sorted(scheduler.next_id() for _ in range(10)) == list(range(10))
+
+def test_token_for_other_dictionary_size_is_ignored():
+    """Tests that a schedule is restarted when the dictionary size changes."""
+    scheduler = TargetScheduler(10, seed=3)
+    for _ in range(5):
+        scheduler.next_id()
+    restored = TargetScheduler.from_token(scheduler.to_token(), 11)
+    assert restored.word_count == 11
+    assert restored.cursor == 0
+
+def test_empty_dictionary_rejected():
+    """Tests that scheduling from an empty word list is an error."""
+    with pytest.raises(ValueError):
+        TargetScheduler(0)
+
+def test_word_manager_draw_leaves_shared_target():
+    """Tests that drawing a target does not change WordManager.target_word."""
+    manager = WordManager.__new__(WordManager)
+    manager.word_list = ["apple", "brick", "chair"]
+    manager.target_word = "apple"
+    scheduler = TargetScheduler(3, seed=9)
+    assert sorted(manager.draw_target_word(scheduler) for _ in range(3)) == ["apple", "brick", "chair"]
+    assert manager.target_word == "apple"
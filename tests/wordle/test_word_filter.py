@@ -0,0 +1,52 @@
+import pytest
+from src.wordle.word_filter import WordFilter, measure_false_positive_rate, word_hashes
+
+def test_no_false_negatives(engine):
+    word_filter = WordFilter.from_words(engine.words, 0.01)
+    assert all(word_filter.might_contain(word) for word in engine.words)
+    assert all(word_filter.might_contain(word.upper()) for word in engine.words[:100])
+    assert not word_filter.might_contain("toolong") and not word_filter.might_contain("abc")
+
+@pytest.mark.parametrize("rate", [0.05, 0.01])
+def test_false_positive_rate_near_target(engine, rate):
+    word_filter = WordFilter.from_words(engine.words, rate)
+    assert word_filter.expected_false_positive_rate == pytest.approx(rate, rel=0.1)
+    assert measure_false_positive_rate(word_filter, engine.words, samples=20_000) < rate * 1.5
+
+def test_hashes_are_stable():
+    """Pins the hash values: static/js/game.js computes the same ones."""
+    assert word_hashes("crane") == word_hashes("CRANE") == (160903525, 2622457495)
+
+def test_serialization_round_trip(engine):
+    word_filter = WordFilter.from_words(engine.words)
+    data = word_filter.to_bytes()
+    copy = WordFilter.from_bytes(data)
+    assert (copy.bit_count, copy.hash_count, copy.word_length, copy.word_count) == \
+        (word_filter.bit_count, word_filter.hash_count, 5, len(engine.words))
+    assert copy.bits == word_filter.bits
+    with pytest.raises(ValueError):
+        WordFilter.from_bytes(data[:-1])
+    with pytest.raises(ValueError):
+        WordFilter.from_bytes(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        WordFilter.from_bytes(b"WBF")
+    with pytest.raises(ValueError):
+        WordFilter.from_words(engine.words, 0)
+
+def test_word_filter_endpoint(client):
+    """Tests that the page links the current filter version, which is cacheable forever."""
+    page = client.get('/').get_data(as_text=True)
+    response = client.get('/api/word-filter')
+    version = response.headers['X-Word-Filter-Version']
+    assert f'data-word-filter="/api/word-filter?v={version}"' in page
+    assert 'is not a valid word in the dictionary.' in page
+    assert response.mimetype == 'application/octet-stream'
+    assert 'no-cache' in response.headers['Cache-Control']
+    word_filter = WordFilter.from_bytes(response.get_data())
+    assert word_filter.might_contain('crane')
+
+    versioned = client.get(f'/api/word-filter?v={version}')
+    assert 'immutable' in versioned.headers['Cache-Control']
+    assert versioned.get_data() == response.get_data()
+    unchanged = client.get('/api/word-filter', headers={'If-None-Match': response.headers['ETag']})
+    assert unchanged.status_code == 304
@@ -0,0 +1,56 @@
+import pytest
+import gzip
+from src.wordle.word_loader import WordLoader
+from src.wordle.word_manager import WordManager
+
+@pytest.fixture
+def sources(tmp_path):
+    """Provides a plain and a gzip word file with overlapping, messy entries."""
+    plain = tmp_path / "words.txt"
+    plain.write_text("Apple\n  crane \ntable\nbanana\n12345\ncrane\n", encoding="utf-8")
+    packed = tmp_path / "more.txt.gz"
+    with gzip.open(packed, "wt", encoding="utf-8") as f:
+        f.write("zebra\nAPPLE\ncafé!\nchair\n")
+    return [str(plain), str(packed)]
+
+def test_load_merges_and_deduplicates(sources):
+    """Tests merging plain and gzip sources into one sorted, normalized list."""
+    loader = WordLoader()
+    words = loader.load(sources)
+    assert words == ["apple", "chair", "crane", "table", "zebra"]
+    assert loader.lines_read == 10
+    assert loader.duplicates == 2 # crane twice in the first file, apple in both
+    assert loader.errors == []
+
+def test_load_streams_in_chunks_with_progress(sources):
+    """Tests that small chunks still load everything and report progress."""
+    reports = []
+    loader = WordLoader(chunk_size=8, progress=lambda *report: reports.append(report))
+    assert loader.load(sources) == ["apple", "chair", "crane", "table", "zebra"]
+    assert len(reports) > 2
+    assert reports[-1][0] == sources[1]
+    assert reports[-1][1] == reports[-1][2] # Read the whole file
+    assert reports[-1][3] == 5
+
+def test_load_skips_bad_sources(sources, tmp_path):
+    """Tests that unreadable sources are recorded, or raised in strict mode."""
+    truncated = tmp_path / "truncated.gz"
+    truncated.write_bytes(gzip.compress(b"zebra\n" * 100)[:20])
+    missing = str(tmp_path / "missing.txt")
+    loader = WordLoader()
+    words = loader.load([missing, sources[0], str(truncated)])
+    assert words == ["apple", "crane", "table"]
+    assert [path for path, _ in loader.errors] == [missing, str(truncated)]
+    with pytest.raises(FileNotFoundError):
+        WordLoader(strict=True).load(missing)
+
+def test_other_word_lengths(sources):
+    """Tests loading words of another length."""
+    assert WordLoader(word_length=6).load(sources) == ["banana"]
+
+def test_word_manager_loads_multiple_sources(sources):
+    """Tests WordManager building its index straight from several sources."""
+    manager = WordManager(sources)
+    assert manager.word_list == ["apple", "chair", "crane", "table", "zebra"]
+    assert manager.is_valid_word("ZEBRA") == True
+    assert manager.word_id("chair") == 1
@@ -2,6 +2,7 @@ import pytest
 import os
 import tempfile
 from src.wordle.word_manager import WordManager
+from src.wordle.compiled_words import CompiledWordList, build_compiled_words
 
 # Helper to create a temporary word file
 @pytest.fixture
@@ -79,13 +80,12 @@ def test_word_manager_filters_words(temp_word_file_mixed):
     assert "tst" not in loaded_words    # 3 letters
     assert "12345" not in loaded_words  # Non-alpha
 
-def test_word_manager_handles_file_not_found():
+def test_word_manager_handles_file_not_found(caplog):
     """Tests WordManager handling when the word file does not exist."""
     manager = WordManager.__new__(WordManager)
-    # Capture print output or check for specific return value/exception
     loaded_words = manager._load_words("non_existent_file.txt")
     assert loaded_words == []
-    # We might want to check stderr/stdout for the error message too
+    assert "Word file not found at non_existent_file.txt" in caplog.text
 
 def test_word_manager_handles_empty_file(empty_temp_file):
     """Tests WordManager handling for an empty word file."""
@@ -137,4 +137,55 @@ def test_is_valid_word_negative(manager_with_temp_list):
     assert manager_with_temp_list.is_valid_word("grape") == False
     assert manager_with_temp_list.is_valid_word("apples") == False # Wrong length
     assert manager_with_temp_list.is_valid_word("") == False
-    assert manager_with_temp_list.is_valid_word("12345") == False 
\ No newline at end of file
+    assert manager_with_temp_list.is_valid_word("12345") == False
+
+# Test the hashed index kept alongside the ordered word list
+def test_word_list_setter_rebuilds_index(manager_with_temp_list):
+    """Tests that assigning word_list keeps validation and word ids in sync."""
+    manager_with_temp_list.word_list = ["zebra", "apple"]
+    assert manager_with_temp_list.is_valid_word("zebra") == True
+    assert manager_with_temp_list.is_valid_word("table") == False # Dropped from the list
+    assert manager_with_temp_list.word_id("ZEBRA") == 0
+    assert manager_with_temp_list.word_id("apple") == 1
+    assert manager_with_temp_list.word_id("grape") is None
+
+def test_loaded_words_are_sorted(temp_word_file):
+    """Tests that _load_words returns a stable, sorted word order."""
+    manager = WordManager.__new__(WordManager)
+    loaded_words = manager._load_words(temp_word_file)
+    assert loaded_words == sorted(loaded_words)
+
+# Test loading through the compiled (memory-mapped) word list
+def test_word_manager_uses_fresh_compiled_list(temp_word_file):
+    """Tests that WordManager maps the compiled list when it is up to date."""
+    words = WordManager(temp_word_file, use_compiled=False).word_list
+    compiled_path = build_compiled_words(words, temp_word_file)
+    try:
+        manager = WordManager(temp_word_file)
+        assert isinstance(manager.word_list, CompiledWordList)
+        assert list(manager.word_list) == words
+        assert manager.is_valid_word("CRANE") == True
+        assert manager.word_id("table") == words.index("table")
+        assert manager.target_word in words
+    finally:
+        os.remove(compiled_path)
+
+def test_word_manager_ignores_stale_compiled_list(temp_word_file):
+    """Tests that WordManager falls back to the text file after it changes."""
+    words = WordManager(temp_word_file, use_compiled=False).word_list
+    compiled_path = build_compiled_words(words, temp_word_file)
+    try:
+        with open(temp_word_file, 'a') as f:
+            f.write("\nzebra")
+        manager = WordManager(temp_word_file)
+        assert isinstance(manager.word_list, list)
+        assert manager.is_valid_word("zebra") == True
+    finally:
+        os.remove(compiled_path)
+
+def test_candidate_index_is_shared_and_reset(manager_with_temp_list):
+    """Tests that the candidate index is built once and rebuilt when the words change."""
+    index = manager_with_temp_list.get_candidate_index()
+    assert manager_with_temp_list.get_candidate_index() is index
+    manager_with_temp_list.word_list = ["zebra"]
+    assert manager_with_temp_list.get_candidate_index().words == ["zebra"]